@@ -1,78 +1,322 @@
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse
-import pandas as pd
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, Query, HTTPException, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from collections import Counter
+import hashlib
+import json
+import numpy as np
+from datetime import date
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Literal
 from src.skills.analyzer import aggregate_descriptions, top_n
-from src.scrapers.indeed import IndeedScraper
-from src.scrapers.linkedin_stub import LinkedInScraper
-from src.scrapers.glassdoor_stub import GlassdoorScraper
-from src.scrapers.remotive import RemotiveScraper
-from src.scrapers.getonboard import GetOnBoardScraper
+from src.skills.aggregates import AGGREGATES_PATH
+from src.skills.matcher import default_matcher
+from src.scrapers.models import JobBatch
+from src.scrapers.registry import ScraperUnavailable, default_registry
+from src.scrapers.runner import iter_sources, search_with_timeout
+from src.storage import JobStorage, JobStore, JobSnapshot, open_storage
+from src.dedup import Deduplicator, MergePolicy, dedup_jobs, open_dedup
+from src.scheduler import Scheduler, create_scheduler
+from src.cache import ResultCache
+from src import metrics
+from src.metrics import MetricsMiddleware, count_error
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-import os
 
-app = FastAPI(title="Radar de Vagas API", version="0.1.0")
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Instâncias dos scrapers
-SCRAPERS = {
-    "indeed": IndeedScraper(),
-    "linkedin": LinkedInScraper(),
-    "glassdoor": GlassdoorScraper(),
-    "remotive": RemotiveScraper(),
-    "getonboard": GetOnBoardScraper(),
-}
+# Armazenamento, store e agendador são abertos na subida do worker (`init_state`
+# no lifespan): importar o módulo não cria data/*.db nem importa o CSV legado
+STORAGE: Optional[JobStorage] = None
+# Vagas em memória, compartilhadas por todas as requisições do processo; cada
+# escrita regrava data/aggregates.json, lido pelo dashboard
+STORE: Optional[JobStore] = None
+# Fila de coletas em segundo plano (data/scheduler.db) + agendamentos cron
+SCHEDULER: Optional[Scheduler] = None
+# Respostas de /skills por (filtros normalizados, versão dos dados)
+SKILLS_CACHE = ResultCache(maxsize=512, ttl=600)
 
-def load_jobs(path: str = "data/jobs.csv") -> pd.DataFrame:
+# Scrapers por nome: cada fonte (e suas dependências, ex.: Playwright) só é
+# importada e instanciada na primeira coleta que a usa
+SCRAPERS = default_registry()
+
+def init_state() -> None:
+    """Abre armazenamento, índice de dedup e fila (uma vez por processo)."""
+    global STORAGE, STORE, SCHEDULER
+    if STORE is not None:
+        return
+    STORAGE = open_storage()
+    STORE = JobStore(STORAGE, dedup=open_dedup(STORAGE), artifact=AGGREGATES_PATH)
+    SCHEDULER = create_scheduler(STORE, SCRAPERS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_state()
+    STORE.snapshot()  # carrega uma vez na subida do worker
+    await SCHEDULER.start()
     try:
-        df = pd.read_csv(path)
-    except Exception:
-        df = pd.DataFrame(columns=["title","company","location","desc","source","url"]) 
-    return df.fillna("")
+        yield
+    finally:
+        await SCHEDULER.stop()
+
+app = FastAPI(title="Radar de Vagas API", version="0.1.0", lifespan=lifespan)
+# Duração de toda requisição por rota/método/status (exposta em /metrics)
+app.add_middleware(MetricsMiddleware)
+
+def load_jobs() -> "pd.DataFrame":
+    return STORE.snapshot().jobs()
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Métricas de coleta, análise, persistência e requisições (formato Prometheus)"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join(value.lower().split()) if value else ""
+
+def compute_skills(snap: JobSnapshot, q: str, location: str, source: str, top: int, partial: bool):
+    df = snap.df
+    if df.empty:
+        return {"dev": [], "cloud": [], "soft": []}
+
+    # Sem filtros de texto: agregados incrementais do store (global ou por fonte)
+    if not (q or location):
+        return STORE.aggregates().top(top, source=source or None)
+
+    # Filtros via índices invertidos do snapshot (sem varrer a tabela)
+    mask = np.ones(len(df), dtype=bool)
+    if q:
+        mask &= snap.text_index.mask(q, partial)
+    if location:
+        mask &= snap.location_index.mask(location, partial)
+    if source:
+        mask &= (df["source_l"] == source).to_numpy()
+
+    # Contagens por vaga já calculadas na carga: só soma as linhas filtradas
+    return snap.skills.top(mask, top)
+
 @app.get("/skills")
 def get_skills(
     q: Optional[str] = Query(None, description="Texto para filtrar por título/descrição"),
     location: Optional[str] = Query(None, description="Filtro por localização"),
     source: Optional[str] = Query(None, description="Fonte: linkedin, remotive, etc."),
     top: int = Query(10, ge=1, le=50, description="Quantidade de itens por categoria"),
+    partial: bool = Query(False, description="Casar q/location como trechos de palavra (ex.: 'reac')"),
+    if_none_match: Optional[str] = Header(None),
 ):
-    df = load_jobs()
-    if df.empty:
-        return JSONResponse({"dev": [], "cloud": [], "soft": []})
+    snap = STORE.snapshot()
+    key = (_norm(q), _norm(location), _norm(source), top, partial, snap.version)
+    # ETag pela revisão do armazenamento: igual entre workers para os mesmos dados
+    etag = 'W/"%s"' % hashlib.sha1(repr((key[:-1], snap.signature)).encode()).hexdigest()[:20]
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
 
-    # Filtros simples
-    mask = pd.Series([True] * len(df))
-    if q:
-        ql = q.lower()
-        mask &= df["title"].str.lower().str.contains(ql) | df["desc"].str.lower().str.contains(ql)
-    if location:
-        ll = location.lower()
-        mask &= df["location"].str.lower().str.contains(ll)
-    if source:
-        sl = source.lower()
-        mask &= df["source"].str.lower() == sl
-
-    descs: List[str] = df.loc[mask, "desc"].dropna().astype(str).tolist()
-    agg = aggregate_descriptions(descs)
-    tops = top_n(agg, top)
-    return tops
-
-def run_scraper_sync(scraper_name: str, query: str, location: str, limit: int):
-    """Executa scraper de forma síncrona"""
-    scraper = SCRAPERS.get(scraper_name)
-    if not scraper:
-        raise HTTPException(status_code=400, detail=f"Scraper '{scraper_name}' não encontrado")
+    tops = SKILLS_CACHE.get(key)
+    if tops is None:
+        tops = compute_skills(snap, *key[:5])
+        SKILLS_CACHE.set(key, tops)
+    return JSONResponse(tops, headers=headers)
+
+@app.get("/skills/summary")
+def get_skills_summary(
+    source: Optional[str] = Query(None, description="Fonte exata"),
+    location: Optional[str] = Query(None, description="Localização exata (como gravada na vaga)"),
+    top: int = Query(10, ge=1, le=50, description="Quantidade de itens por categoria"),
+):
+    """Top skills por faceta exata (fonte/localização), direto dos agregados incrementais"""
+    agg = STORE.aggregates()
+    return {
+        "source": source,
+        "location": location,
+        "skills": agg.top(top, source=source, location=location),
+        "sources": [k[1] for k in agg.facets("source")],
+    }
+
+@app.get("/skills/trends")
+def get_skill_trends(
+    skill: str = Query(..., description="Skill ou alias do léxico (ex.: react, k8s)"),
+    granularity: Literal["day", "week", "month"] = Query("week", description="Período de cada ponto"),
+    category: Optional[str] = Query(None, description="Categoria (dev, cloud, soft), se a skill estiver em mais de uma"),
+    source: Optional[str] = Query(None, description="Fonte exata"),
+    since: Optional[date] = Query(None, description="Primeiro dia (AAAA-MM-DD), alinhado ao início do período"),
+    until: Optional[date] = Query(None, description="Último dia (AAAA-MM-DD), inclusivo"),
+):
+    """Série de uma skill por dia/semana/mês, lida das agregações diárias mantidas na ingestão"""
+    matcher = default_matcher()
+    sids = [sid for sid in matcher.resolve(skill) if category is None or matcher.skills[sid][0] == category]
+    if not sids:
+        raise HTTPException(status_code=404, detail=f"Skill '{skill}' não encontrada no léxico")
+    category, name = matcher.skills[sids[0]]
+    try:
+        points = STORAGE.skill_trend(
+            sids[0], granularity, source=_norm(source) or None,
+            since=since.isoformat() if since else None, until=until.isoformat() if until else None,
+        )
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {
+        "skill": name,
+        "category": category,
+        "granularity": granularity,
+        "source": source,
+        "points": [
+            {"start": p.start, "mentions": p.mentions, "jobs": p.jobs, "total_jobs": p.total_jobs,
+             "share": round(p.share, 4)}
+            for p in points
+        ],
+    }
+
+@app.get("/skills/cache")
+def get_skills_cache():
+    """Contadores do cache de /skills"""
+    return {"data_version": STORE.snapshot().version, **SKILLS_CACHE.stats()}
+
+@app.post("/scrape/multiple")
+async def scrape_multiple_sources(
+    query: str = Query(..., description="Termo de busca"),
+    location: str = Query("Brasil", description="Localização"),
+    limit: int = Query(20, ge=1, le=100, description="Limite de vagas por fonte"),
+    sources: List[str] = Query(["remotive", "getonboard"], description="Lista de fontes"),
+    save_to_csv: bool = Query(True, description="Salvar resultados no armazenamento (data/jobs.db)"),
+    stream: bool = Query(False, description="Resposta em NDJSON, emitindo as vagas de cada fonte assim que ela termina"),
+    description_chars: Optional[int] = Query(None, ge=0, description="Trunca a descrição (0 = omite)")
+):
+    """
+    Executa scraping de múltiplas fontes em paralelo
+    
+    Fontes disponíveis: indeed, linkedin, glassdoor, remotive, getonboard
+    """
+    available_sources = list(SCRAPERS.keys())
+    invalid_sources = [s for s in sources if s not in available_sources]
+    if invalid_sources:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Fontes inválidas: {invalid_sources}. Disponíveis: {available_sources}"
+        )
+    
+    if stream:
+        return StreamingResponse(
+            stream_multiple_sources(query, location, limit, sources, save_to_csv, description_chars),
+            media_type="application/x-ndjson",
+        )
+
+    all_jobs = JobBatch()
+    results_by_source = {}
     
     try:
-        jobs = list(scraper.search(query=query, location=location, limit=limit))
-        return jobs
+        # Executa scrapers em paralelo; cada fonte tem seu próprio timeout e
+        # é consumida assim que termina, sem esperar a mais lenta
+        scrapers = SCRAPERS.subset(sources)
+        async for source, jobs, error in iter_sources(scrapers, query, location, limit):
+            all_jobs.extend(jobs)
+            results_by_source[source] = {
+                "jobs_found": len(jobs),
+                "success": error is None,
+                "error": str(error) if error else None
+            }
+        
+        # Remover duplicatas entre fontes (mesma vaga exata ou quase igual)
+        unique_jobs = JobBatch.from_jobs(dedup_jobs(all_jobs.normalize()))
+        
+        # Analisar skills
+        skills_agg = aggregate_descriptions(unique_jobs.texts())
+        skills_top = top_n(skills_agg, 15)
+        
+        # Linhas de resposta direto das colunas do lote
+        jobs_data = unique_jobs.rows(description_chars)
+        
+        # Persistir se solicitado (upsert por URL no armazenamento)
+        if save_to_csv and unique_jobs:
+            await asyncio.to_thread(STORE.upsert, unique_jobs)
+        
+        return {
+            "query": query,
+            "location": location,
+            "sources_requested": sources,
+            "results_by_source": results_by_source,
+            "total_jobs_found": len(unique_jobs),
+            "jobs": jobs_data,
+            "skills": skills_top,
+            "saved_to_csv": save_to_csv and len(unique_jobs) > 0
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro no scraping múltiplo: {str(e)}")
+
+async def stream_multiple_sources(
+    query: str,
+    location: str,
+    limit: int,
+    sources: List[str],
+    save_to_csv: bool,
+    description_chars: Optional[int],
+):
+    """Gera NDJSON: um registro "source" e as vagas de cada fonte, e por fim o "summary".
+
+    Falhas ao processar ou gravar uma fonte viram um registro "error" e as demais
+    fontes seguem; o "summary" é sempre o último registro.
+    """
+    def line(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def error_line(source: Optional[str], e: Exception) -> bytes:
+        return line({"type": "error", "source": source, "detail": f"{type(e).__name__}: {e}"})
+
+    # Vagas já emitidas não podem ser trocadas: a primeira versão vista fica
+    dedup = Deduplicator(policy=MergePolicy(keep_first=True))
+    results_by_source = {}
+    agg = {"dev": Counter(), "cloud": Counter(), "soft": Counter()}
+    total = 0
+    saved = False
+    scrapers = SCRAPERS.subset(sources)
+    try:
+        async for source, jobs, error in iter_sources(scrapers, query, location, limit):
+            results_by_source[source] = {
+                "jobs_found": len(jobs),
+                "success": error is None,
+                "error": str(error) if error else None
+            }
+            try:
+                # Dedup entre fontes, como no modo não-stream
+                unique_jobs = JobBatch.from_jobs(dedup.resolve(jobs.normalize()).unique)
+                # Só os contadores ficam em memória, não as descrições
+                part = aggregate_descriptions(unique_jobs.texts())
+                rows = unique_jobs.rows(description_chars)
+            except Exception as e:
+                results_by_source[source].update(success=False, error=str(e))
+                yield line({"type": "source", "source": source, **results_by_source[source]})
+                yield error_line(source, e)
+                continue
+            yield line({"type": "source", "source": source, **results_by_source[source]})
+            for k in agg:
+                agg[k].update(part[k])
+            for row in rows:
+                yield line({"type": "job", **row})
+            total += len(unique_jobs)
+            if save_to_csv and unique_jobs:
+                try:
+                    await asyncio.to_thread(STORE.upsert, unique_jobs)
+                    saved = True
+                except Exception as e:
+                    yield error_line(source, e)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro no scraping {scraper_name}: {str(e)}")
+        # Falha fora de uma fonte (ex.: no próprio agendamento das buscas)
+        yield error_line(None, e)
+
+    yield line({
+        "type": "summary",
+        "query": query,
+        "location": location,
+        "sources_requested": sources,
+        "results_by_source": results_by_source,
+        "total_jobs_found": total,
+        "skills": top_n(agg, 15),
+        "saved_to_csv": saved
+    })
 
 @app.post("/scrape/{source}")
 async def scrape_source(
@@ -80,7 +324,8 @@ async def scrape_source(
     query: str = Query(..., description="Termo de busca"),
     location: str = Query("Brasil", description="Localização"),
     limit: int = Query(20, ge=1, le=100, description="Limite de vagas"),
-    save_to_csv: bool = Query(True, description="Salvar resultados em CSV")
+    save_to_csv: bool = Query(True, description="Salvar resultados no armazenamento (data/jobs.db)"),
+    debug: Optional[bool] = Query(None, description="Grava HTML/screenshots de depuração (fontes com navegador)")
 ):
     """
     Executa scraping de uma fonte específica
@@ -92,11 +337,19 @@ async def scrape_source(
         raise HTTPException(status_code=400, detail=f"Fonte '{source}' não disponível. Fontes: {available}")
     
     try:
-        # Executa scraping em thread separada para não bloquear
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_scraper_sync, source, query, location, limit)
-            jobs = future.result(timeout=300)  # 5 minutos timeout
-        
+        scraper = SCRAPERS[source]
+    except ScraperUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        # Scrapers assíncronos rodam no event loop; os síncronos no executor compartilhado
+        jobs = await search_with_timeout(scraper, query, location, limit, debug=debug)
+    except asyncio.TimeoutError as e:
+        count_error(source, e)
+        raise HTTPException(status_code=504, detail=f"Timeout no scraping {source} ({scraper.timeout:.0f}s)")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro no scraping {source}: {str(e)}")
+
+    try:
         if not jobs:
             return {
                 "source": source,
@@ -108,32 +361,15 @@ async def scrape_source(
             }
         
         # Analizar skills das vagas encontradas
-        descriptions = [job.desc for job in jobs if job.desc]
-        skills_agg = aggregate_descriptions(descriptions) if descriptions else {"dev": [], "cloud": [], "soft": []}
+        skills_agg = aggregate_descriptions(jobs.texts())
         skills_top = top_n(skills_agg, 10)
         
-        # Converter jobs para dict
-        jobs_data = [
-            {
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.desc,
-                "source": job.source,
-                "url": job.url
-            }
-            for job in jobs
-        ]
+        # Linhas de resposta direto das colunas do lote
+        jobs_data = jobs.rows()
         
-        # Salvar em CSV se solicitado
+        # Persistir se solicitado (upsert por URL no armazenamento)
         if save_to_csv:
-            df_existing = load_jobs()
-            df_new = pd.DataFrame(jobs_data)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-            
-            # Remover duplicatas por URL
-            df_combined = df_combined.drop_duplicates(subset=['url'], keep='last')
-            df_combined.to_csv("data/jobs.csv", index=False)
+            await asyncio.to_thread(STORE.upsert, jobs)
         
         return {
             "source": source,
@@ -148,117 +384,41 @@ async def scrape_source(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro no scraping: {str(e)}")
 
-@app.post("/scrape/multiple")
-async def scrape_multiple_sources(
+@app.post("/jobs/scrape", status_code=202)
+async def enqueue_scrape(
     query: str = Query(..., description="Termo de busca"),
     location: str = Query("Brasil", description="Localização"),
-    limit: int = Query(20, ge=1, le=100, description="Limite de vagas por fonte"),
+    limit: int = Query(20, ge=1, le=500, description="Limite de vagas por fonte"),
     sources: List[str] = Query(["remotive", "getonboard"], description="Lista de fontes"),
-    save_to_csv: bool = Query(True, description="Salvar resultados em CSV")
 ):
     """
-    Executa scraping de múltiplas fontes em paralelo
-    
-    Fontes disponíveis: indeed, linkedin, glassdoor, remotive, getonboard
+    Enfileira uma coleta em segundo plano e retorna o id para acompanhar em /jobs/{id}
+
+    As vagas vão direto para o armazenamento; a coleta continua mesmo se o cliente desconectar.
     """
-    available_sources = list(SCRAPERS.keys())
-    invalid_sources = [s for s in sources if s not in available_sources]
+    invalid_sources = [s for s in sources if s not in SCRAPERS]
     if invalid_sources:
         raise HTTPException(
-            status_code=400, 
-            detail=f"Fontes inválidas: {invalid_sources}. Disponíveis: {available_sources}"
+            status_code=400,
+            detail=f"Fontes inválidas: {invalid_sources}. Disponíveis: {list(SCRAPERS.keys())}"
         )
-    
-    all_jobs = []
-    results_by_source = {}
-    
-    try:
-        # Executa scrapers em paralelo
-        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
-            future_to_source = {
-                executor.submit(run_scraper_sync, source, query, location, limit): source 
-                for source in sources
-            }
-            
-            for future in future_to_source:
-                source = future_to_source[future]
-                try:
-                    jobs = future.result(timeout=300)
-                    all_jobs.extend(jobs)
-                    results_by_source[source] = {
-                        "jobs_found": len(jobs),
-                        "success": True,
-                        "error": None
-                    }
-                except Exception as e:
-                    results_by_source[source] = {
-                        "jobs_found": 0,
-                        "success": False,
-                        "error": str(e)
-                    }
-        
-        # Remover duplicatas por URL
-        seen_urls = set()
-        unique_jobs = []
-        for job in all_jobs:
-            if job.url and job.url not in seen_urls:
-                seen_urls.add(job.url)
-                unique_jobs.append(job)
-            elif not job.url:  # Jobs sem URL, usar outros critérios
-                unique_jobs.append(job)
-        
-        # Analisar skills
-        descriptions = [job.desc for job in unique_jobs if job.desc]
-        skills_agg = aggregate_descriptions(descriptions) if descriptions else {"dev": [], "cloud": [], "soft": []}
-        skills_top = top_n(skills_agg, 15)
-        
-        # Converter para dict
-        jobs_data = [
-            {
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.desc,
-                "source": job.source,
-                "url": job.url
-            }
-            for job in unique_jobs
-        ]
-        
-        # Salvar em CSV se solicitado
-        if save_to_csv and unique_jobs:
-            df_existing = load_jobs()
-            df_new = pd.DataFrame(jobs_data)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-            
-            # Remover duplicatas por URL
-            df_combined = df_combined.drop_duplicates(subset=['url'], keep='last')
-            df_combined.to_csv("data/jobs.csv", index=False)
-        
-        return {
-            "query": query,
-            "location": location,
-            "sources_requested": sources,
-            "results_by_source": results_by_source,
-            "total_jobs_found": len(unique_jobs),
-            "jobs": jobs_data,
-            "skills": skills_top,
-            "saved_to_csv": save_to_csv and len(unique_jobs) > 0
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro no scraping múltiplo: {str(e)}")
+    job_id = await SCHEDULER.submit(query, location, limit, sources)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+@app.get("/jobs/{job_id}")
+async def get_scrape_job(job_id: str):
+    """Situação de uma coleta enfileirada: geral e por fonte"""
+    status = await asyncio.to_thread(SCHEDULER.queue.status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Coleta '{job_id}' não encontrada")
+    return status
 
 @app.get("/sources")
 def get_available_sources():
-    """Lista todas as fontes de scraping disponíveis"""
+    """Lista todas as fontes de scraping disponíveis (só metadados: nenhum scraper é importado)"""
+    infos = SCRAPERS.infos()
     return {
-        "available_sources": list(SCRAPERS.keys()),
-        "descriptions": {
-            "indeed": "Indeed.com - Portal de empregos",
-            "linkedin": "LinkedIn Jobs - Rede profissional",
-            "glassdoor": "Glassdoor - Avaliações e vagas",
-            "remotive": "Remotive.io - Vagas remotas",
-            "getonboard": "GetOnBoard - Vagas tech"
-        }
+        "available_sources": list(infos),
+        "descriptions": {name: info.description for name, info in infos.items()},
+        "requires_browser": [name for name, info in infos.items() if info.requires_browser],
     }
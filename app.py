@@ -1,29 +1,90 @@
+from typing import Dict, List, Tuple
+import numpy as np
 import streamlit as st
 import pandas as pd
-from src.skills.analyzer import aggregate_descriptions, top_n
+from src.skills.aggregates import AGGREGATES_PATH, SkillAggregates, load_aggregates, save_aggregates
+from src.skills.matrix import top_from_totals
+from src.storage import JobStore, open_storage
+from src.storage.index import TextIndex
+
+TOP = 15
 
 st.set_page_config(page_title="Radar de Vagas", layout="wide")
 st.title("Radar de Vagas – Front-end JR (Brasil)")
 
-@st.cache_data
-def load_data(path: str = "data/jobs.csv"):
-    try:
-        return pd.read_csv(path)
-    except Exception:
-        return pd.DataFrame(columns=["title","company","location","desc","source","url"]) 
+@st.cache_resource
+def get_store() -> JobStore:
+    # Snapshot completo só é carregado quando há busca por texto (ou a lista de vagas)
+    return JobStore(open_storage())
+
+@st.cache_resource(max_entries=2)
+def get_aggregates(revision) -> SkillAggregates:
+    """Artefato gravado na coleta; se faltar ou estiver atrasado, recalcula uma vez e regrava."""
+    agg = load_aggregates(AGGREGATES_PATH)
+    if agg is None or agg.revision != revision:
+        agg = get_store().aggregates()
+        try:
+            save_aggregates(agg, AGGREGATES_PATH)
+        except OSError:
+            pass
+    return agg
+
+@st.cache_resource(max_entries=8)
+def location_index(revision, source: str) -> Tuple[List[tuple], TextIndex]:
+    """Índice das localizações distintas (facetas) da fonte escolhida, ou de todas."""
+    agg = get_aggregates(revision)
+    if source:
+        keys = [k for k in agg.facets("source_location") if k[1] == source]
+        names = [k[2] for k in keys]
+    else:
+        keys = agg.facets("location")
+        names = [k[1] for k in keys]
+    return keys, TextIndex.build(names)
+
+@st.cache_data(max_entries=256)
+def skills_for(revision, q: str, location: str, source: str) -> Tuple[Dict[str, list], int]:
+    """Top skills e total de vagas por filtro (cache por filtro + revisão dos dados)."""
+    if not q:
+        agg = get_aggregates(revision)
+        if not location:
+            return agg.top(TOP, source=source or None), agg.jobs(source=source or None)
+        # Cada vaga tem uma só localização: somar as facetas que casam é exato
+        keys, index = location_index(revision, source)
+        ids = index.search(location)
+        totals, jobs = agg.combine(keys[i] for i in (ids if ids is not None else range(len(keys))))
+        return top_from_totals(totals, agg.matcher, TOP), jobs
+    mask = filter_mask(q, location, source)
+    return get_store().snapshot().skills.top(mask, TOP), int(mask.sum())
+
+def filter_mask(q: str, location: str, source: str) -> np.ndarray:
+    # Mesmos índices invertidos que a API usa em /skills
+    snap = get_store().snapshot()
+    mask = snap.text_index.mask(q)
+    if location:
+        mask &= snap.location_index.mask(location)
+    if source:
+        mask &= (snap.df["source_l"] == source).to_numpy()
+    return mask
+
+def norm(value: str) -> str:
+    return " ".join(value.lower().split())
 
-query = st.text_input("Busca", value="front end junior")
-location = st.text_input("Local", value="Brasil")
+revision = get_store().storage.revision()
+agg = get_aggregates(revision)
+sources = [k[1] for k in agg.facets("source")]
 
-st.caption("Use o script de coleta para atualizar o arquivo data/jobs.csv")
+col_q, col_loc, col_src = st.columns([2, 2, 1])
+query = norm(col_q.text_input("Busca (título/descrição)", value=""))
+location = norm(col_loc.text_input("Local", value=""))
+source = col_src.selectbox("Fonte", ["(todas)"] + sources)
+source = "" if source == "(todas)" else source
 
-df = load_data()
-st.write(f"Vagas carregadas: {len(df)}")
+st.caption("Use o script de coleta para atualizar o armazenamento em data/jobs.db")
 
-if len(df):
-    agg = aggregate_descriptions(df["desc"].dropna().tolist())
-    top = top_n(agg, 15)
+top, n_jobs = skills_for(revision, query, location, source)
+st.write(f"Vagas: {n_jobs} de {agg.jobs()}")
 
+if n_jobs:
     col1, col2, col3 = st.columns(3)
     with col1:
         st.subheader("Stacks Dev")
@@ -38,7 +99,11 @@ if len(df):
         df_soft = pd.DataFrame(top["soft"], columns=["skill","freq"]).sort_values("freq", ascending=False)
         st.bar_chart(df_soft.set_index("skill"))
 
-    with st.expander("Vagas (amostra)"):
-        st.dataframe(df[["title","company","location","source","url"]].head(50))
+    # A lista precisa das vagas em si (snapshot completo), então é opcional
+    if st.checkbox("Mostrar vagas (amostra)"):
+        df = get_store().snapshot().jobs()
+        st.dataframe(df[filter_mask(query, location, source)][["title","company","location","source","url"]].head(50))
+elif agg.jobs():
+    st.info("Nenhuma vaga para esses filtros.")
 else:
     st.info("Nenhum dado encontrado. Rode: python collect_and_analyze.py 'front end junior' --sources indeed --limit 50")
@@ -0,0 +1,91 @@
+"""Executor dos benchmarks.
+
+    python -m benchmarks                          # analyzer, skills_api e persistence em 1k e 100k
+    python -m benchmarks --sizes 1k,100k,1m --cases analyzer
+    python -m benchmarks --save                   # grava/atualiza a linha de base
+    python -m benchmarks --tolerance 0.15         # falha (código 1) se regredir mais que 15%
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict
+from typing import List
+from .cases import CASES
+from .corpus import parse_size
+from .harness import Result, compare, delta, load_baseline, peak_rss_mb, save_baseline
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_isolated(case: str, size: int, seed: int) -> List[Result]:
+    """Roda um caso num subprocesso (pico de RSS isolado) e lê o JSON da saída."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks", "--worker", case, "--sizes", str(size), "--seed", str(seed)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{case}@{size} falhou:\n{proc.stderr}")
+    return [Result(**r) for r in json.loads(proc.stdout.strip().splitlines()[-1])]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks do Radar de Vagas")
+    parser.add_argument("--sizes", default="1k,100k", help="Tamanhos do corpus (1k, 10k, 100k, 1m ou inteiro)")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Casos: {', '.join(CASES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON da linha de base")
+    parser.add_argument("--save", action="store_true", help="Grava os resultados como nova linha de base")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Regressão tolerada (fração, padrão 0.2)")
+    parser.add_argument("--json", help="Grava os resultados desta execução neste arquivo")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s]
+    if args.worker:
+        results = CASES[args.worker](sizes[0], args.seed)
+        rss = peak_rss_mb()
+        for r in results:
+            r.peak_rss_mb = rss
+        print(json.dumps([asdict(r) for r in results]))
+        return 0
+
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(sorted(unknown))}")
+
+    baseline = load_baseline(args.baseline)
+    results: List[Result] = []
+    regressions = []
+    print(f"{'caso':<36} {'vagas':>9} {'vazão':>16} {'p50 ms':>9} {'p99 ms':>9} {'RSS MiB':>8} {'x base':>8}")
+    for case in cases:
+        for size in sizes:
+            for r in run_isolated(case, size, args.seed):
+                results.append(r)
+                base = baseline.get(r.key)
+                print(f"{r.name:<36} {r.size:>9,} {r.throughput:>10,.1f} {r.unit:<5} {r.p50_ms:>9.3f} "
+                      f"{r.p99_ms:>9.3f} {r.peak_rss_mb:>8.0f} {delta(r, base):>8}", flush=True)
+                regressions += [f"{r.key}: {p}" for p in compare(r, base, args.tolerance)]
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2, ensure_ascii=False)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"\nSem linha de base em {args.baseline} (use --save para criar)")
+    elif regressions:
+        print(f"\nRegressões (tolerância {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
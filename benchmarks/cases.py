@@ -0,0 +1,148 @@
+"""Casos de benchmark: analisador, `GET /skills`, persistência e importação.
+
+Cada caso recebe o tamanho do corpus e a semente e devolve uma lista de
+`Result`. O executor (`python -m benchmarks`) roda cada caso num processo
+próprio, para o pico de RSS ser só dele.
+"""
+import contextlib
+import os
+import tempfile
+from typing import Callable, Dict, Iterator, List
+import numpy as np
+from .corpus import generate
+from .harness import Result, measure, measure_each
+from .importtime import TARGETS, profile_import
+
+# Quantidade de descrições medidas uma a uma (p50/p99 de classify_tokens)
+CLASSIFY_SAMPLE = 10_000
+# Requisições por combinação de filtros em /skills
+REQUESTS = 200
+# Vagas por chamada de upsert (ordem de grandeza de uma coleta por fonte)
+UPSERT_BATCH = 100
+# Importações medidas por módulo (cada uma num processo novo)
+IMPORT_RUNS = 5
+
+# Combinações de filtros de /skills (q/location variam entre requisições)
+SKILLS_FILTERS: Dict[str, Callable[[int], dict]] = {
+    "none": lambda i: {},
+    "source": lambda i: {"source": ("remotive", "getonboard", "indeed")[i % 3]},
+    "q": lambda i: {"q": ("react", "python", "docker", "kubernetes", "aws")[i % 5]},
+    "location": lambda i: {"location": ("são paulo", "remote", "chile")[i % 3]},
+    "q+location": lambda i: {"q": ("react", "python", "aws")[i % 3], "location": ("remote", "brasil")[i % 2]},
+    "q+location+source": lambda i: {
+        "q": ("react", "python", "aws")[i % 3], "location": "remote", "source": ("remotive", "linkedin")[i % 2],
+    },
+    "partial": lambda i: {"q": ("reac", "pyth", "kube")[i % 3], "partial": True},
+}
+
+
+def _repeat(size: int, budget: int = 100_000, cap: int = 5) -> int:
+    # Corpus pequeno: mais repetições; 1M: uma só
+    return max(1, min(cap, budget // max(size, 1)))
+
+
+@contextlib.contextmanager
+def _workdir() -> Iterator[str]:
+    """Diretório temporário como cwd: `data/*.db` da API e do armazenamento caem nele."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
+
+
+def analyzer(size: int, seed: int) -> List[Result]:
+    from src.skills.analyzer import aggregate_descriptions, aggregate_series, classify_tokens
+
+    texts = generate(size, seed).texts()
+    repeat = _repeat(size)
+    warmup = 1 if size <= 100_000 else 0
+    return [
+        measure_each("analyzer.classify_tokens", size, classify_tokens, texts[:CLASSIFY_SAMPLE], unit="desc/s"),
+        measure("analyzer.aggregate_descriptions", size, lambda: aggregate_descriptions(texts), repeat,
+                unit="desc/s", per_call=len(texts), warmup=warmup),
+        measure("analyzer.aggregate_series", size, lambda: aggregate_series(texts), repeat,
+                unit="desc/s", per_call=len(texts), warmup=warmup),
+    ]
+
+
+def skills_api(size: int, seed: int) -> List[Result]:
+    from fastapi.testclient import TestClient
+
+    jobs = generate(size, seed)
+    with _workdir():
+        import api
+
+        api.init_state()
+        for start in range(0, len(jobs), 10_000):
+            api.STORAGE.upsert(jobs[start:start + 10_000])
+        del jobs
+        results = []
+        with TestClient(api.app) as client:
+            api.STORE.aggregates()
+
+            def run(params: Callable[[int], dict], cold: bool) -> Callable[[int], None]:
+                def call(i: int) -> None:
+                    if cold:
+                        api.SKILLS_CACHE.clear()
+                    r = client.get("/skills", params=params(i))
+                    r.raise_for_status()
+                return call
+
+            for name, params in SKILLS_FILTERS.items():
+                run(params, True)(0)
+                results.append(measure_each(f"api.skills[{name}]", size, run(params, True), range(REQUESTS), unit="req/s"))
+            # Cache quente: mesma consulta repetida (custo do ETag + serialização)
+            params = SKILLS_FILTERS["q+location"]
+            results.append(measure_each("api.skills[cached]", size, run(params, False), range(REQUESTS), unit="req/s"))
+    return results
+
+
+def persistence(size: int, seed: int) -> List[Result]:
+    from src.dedup import Deduplicator
+    from src.storage import JobStore, SQLiteJobStorage
+
+    jobs = generate(size, seed)
+    batches = [jobs[i:i + UPSERT_BATCH] for i in range(0, len(jobs), UPSERT_BATCH)]
+    with _workdir() as tmp:
+        storage = SQLiteJobStorage(os.path.join(tmp, "jobs.db"))
+        results = [
+            measure_each("storage.upsert[insert]", size, storage.upsert, batches, unit="vagas/s", per_item=UPSERT_BATCH),
+            # Mesmas vagas de novo: caminho de merge (busca pela chave + UPDATE)
+            measure_each("storage.upsert[update]", size, storage.upsert, batches, unit="vagas/s", per_item=UPSERT_BATCH),
+        ]
+        store = JobStore(storage)
+        results.append(measure("store.snapshot", size, lambda: (store.invalidate(), store.snapshot()), 1,
+                               unit="vagas/s", per_call=size, warmup=0))
+        # Caminho completo da API: deduplicação + upsert + delta dos agregados
+        fresh = JobStore(SQLiteJobStorage(os.path.join(tmp, "store.db")), dedup=Deduplicator())
+        fresh.aggregates()
+        results.append(measure_each("store.upsert", size, fresh.upsert, batches, unit="vagas/s", per_item=UPSERT_BATCH))
+    return results
+
+
+def startup(size: int, seed: int) -> List[Result]:
+    """`import api`/`import collect_and_analyze` via -X importtime (não depende do corpus)."""
+    results = []
+    for module in TARGETS:
+        times = np.array([profile_import(module).total_us / 1e6 for _ in range(IMPORT_RUNS)])
+        results.append(Result(
+            name=f"startup.import[{module}]",
+            size=size,
+            ops=IMPORT_RUNS,
+            throughput=IMPORT_RUNS / float(times.sum()),
+            unit="imp/s",
+            p50_ms=float(np.percentile(times, 50) * 1000),
+            p99_ms=float(np.percentile(times, 99) * 1000),
+        ))
+    return results
+
+
+CASES: Dict[str, Callable[[int, int], List[Result]]] = {
+    "analyzer": analyzer,
+    "skills_api": skills_api,
+    "persistence": persistence,
+    "startup": startup,
+}
@@ -0,0 +1,105 @@
+"""Corpus sintético e determinístico de vagas para os benchmarks.
+
+As descrições são HTML no formato das fontes reais (parágrafos, listas,
+negrito) com termos sorteados de `src/skills/lexicon.py`, inclusive aliases
+("ReactJS", "k8s"). Os termos seguem uma distribuição de Zipf, como nas vagas
+reais: poucos muito frequentes e uma cauda longa.
+"""
+import random
+from typing import Iterator, List, Sequence
+from src.scrapers.models import Job, JobBatch
+from src.skills.lexicon import ALIASES, CLOUD, DEV_STACK, SOFT_SKILLS
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+SOURCES = ("remotive", "getonboard", "indeed", "linkedin", "glassdoor")
+LOCATIONS = (
+    "Brasil", "São Paulo, SP", "Rio de Janeiro, RJ", "Belo Horizonte, MG", "Curitiba, PR",
+    "Porto Alegre, RS", "Remote", "Remote - Worldwide", "Remote - LATAM", "Lisboa, Portugal",
+    "Santiago, Chile", "Buenos Aires, Argentina", "Bogotá, Colombia", "Ciudad de México",
+)
+LEVELS = ("Junior", "Pleno", "Senior", "Estágio", "Tech Lead", "Staff")
+ROLES = (
+    "Desenvolvedor Front End", "Desenvolvedor Back End", "Desenvolvedor Full Stack",
+    "Frontend Engineer", "Backend Engineer", "Software Engineer", "Engenheiro DevOps",
+    "Mobile Developer", "Data Engineer", "SRE",
+)
+COMPANIES = tuple(f"{a} {b}" for a in ("Acme", "Nimbus", "Orbita", "Vertex", "Pampa", "Lumen", "Quanta", "Caju")
+                  for b in ("Tech", "Labs", "Digital", "Software", "S.A."))
+
+INTRO = (
+    "Estamos buscando uma pessoa {role} para fazer parte do nosso time.",
+    "We are looking for a {role} to join our growing product team.",
+    "Venha construir produtos usados por milhões de pessoas como {role}.",
+)
+REQUIRED = (
+    "Experiência com {a} e {b}.",
+    "Conhecimento sólido em {a}.",
+    "Vivência com {a}, {b} e {c}.",
+    "Strong experience with {a} and {b}.",
+    "Hands-on knowledge of {a}.",
+)
+SOFT = (
+    "Valorizamos {a} e {b}.",
+    "Buscamos alguém com {a}.",
+    "We value {a} and {b}.",
+)
+BENEFITS = (
+    "Vale refeição", "Plano de saúde", "Home office", "Horário flexível",
+    "Auxílio educação", "Stock options", "Gympass", "Day off no aniversário",
+)
+
+
+def parse_size(value: str) -> int:
+    """`"100k"` -> 100000; aceita também inteiros ("2500")."""
+    value = value.strip().lower()
+    return SIZES[value] if value in SIZES else int(value.replace("_", ""))
+
+
+def _zipf(rng: random.Random, items: Sequence[str], k: int, cum: List[float]) -> List[str]:
+    return rng.choices(items, cum_weights=cum, k=k)
+
+
+def _cum_weights(n: int) -> List[float]:
+    total, cum = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank
+        cum.append(total)
+    return cum
+
+
+def iter_jobs(n: int, seed: int = 0) -> Iterator[Job]:
+    """`n` vagas sintéticas; a mesma semente gera sempre o mesmo corpus."""
+    rng = random.Random(seed)
+    # Aliases entram como grafias alternativas dos termos técnicos
+    tech = list(DEV_STACK) + list(CLOUD) + list(ALIASES)
+    soft = list(SOFT_SKILLS)
+    tech_cum, soft_cum = _cum_weights(len(tech)), _cum_weights(len(soft))
+    for i in range(n):
+        role = rng.choice(ROLES)
+        level = rng.choice(LEVELS)
+        terms = _zipf(rng, tech, rng.randint(4, 12), tech_cum)
+        parts = [f"<p>{rng.choice(INTRO).format(role=role)}</p>", "<h3>Requisitos</h3><ul>"]
+        for j in range(0, len(terms), 3):
+            a, b, c = (terms[j:j + 3] + terms[:3])[:3]
+            parts.append(f"<li>{rng.choice(REQUIRED).format(a=a, b=f'<strong>{b}</strong>', c=c)}</li>")
+        parts.append("</ul>")
+        a, b = _zipf(rng, soft, 2, soft_cum)
+        parts.append(f"<p>{rng.choice(SOFT).format(a=a, b=b)}</p>")
+        parts.append("<h3>Benefícios</h3><ul>")
+        parts.extend(f"<li>{b}</li>" for b in rng.sample(BENEFITS, 3))
+        parts.append("</ul>")
+        source = rng.choice(SOURCES)
+        yield Job(
+            title=f"{role} {level}",
+            company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            desc="".join(parts),
+            source=source,
+            url=f"https://jobs.example.com/{source}/{seed}-{i}",
+        )
+
+
+def generate(n: int, seed: int = 0) -> JobBatch:
+    """Corpus em colunas (`JobBatch`), pronto para `normalize()`/`texts()`/`to_frame()`."""
+    return JobBatch.from_jobs(iter_jobs(n, seed))
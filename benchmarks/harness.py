@@ -0,0 +1,127 @@
+"""Medição (vazão, p50/p99, pico de RSS) e comparação com a linha de base."""
+import json
+import os
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    # Operações medidas (chamadas, requisições ou vagas, conforme `unit`)
+    ops: int
+    throughput: float
+    unit: str
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo (ru_maxrss: KiB no Linux, bytes no macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(
+    name: str,
+    size: int,
+    fn: Callable[[], object],
+    repeat: int,
+    unit: str = "op/s",
+    per_call: int = 1,
+    warmup: int = 1,
+) -> Result:
+    """Chama `fn` `repeat` vezes; `per_call` é quantas unidades cada chamada processa."""
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeat)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - t0
+    total = float(times.sum())
+    return Result(
+        name=name,
+        size=size,
+        ops=repeat * per_call,
+        throughput=repeat * per_call / total if total else float("inf"),
+        unit=unit,
+        p50_ms=float(np.percentile(times, 50) * 1000),
+        p99_ms=float(np.percentile(times, 99) * 1000),
+    )
+
+
+def measure_each(
+    name: str,
+    size: int,
+    fn: Callable[[object], object],
+    items: Iterable,
+    unit: str = "op/s",
+    per_item: int = 1,
+) -> Result:
+    """Uma medição por item (ex.: uma descrição, um lote de upsert); latências são por item."""
+    items = list(items)
+    times = np.empty(len(items))
+    for i, item in enumerate(items):
+        t0 = time.perf_counter()
+        fn(item)
+        times[i] = time.perf_counter() - t0
+    total = float(times.sum())
+    return Result(
+        name=name,
+        size=size,
+        ops=len(items) * per_item,
+        throughput=len(items) * per_item / total if total else float("inf"),
+        unit=unit,
+        p50_ms=float(np.percentile(times, 50) * 1000),
+        p99_ms=float(np.percentile(times, 99) * 1000),
+    )
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {f"{r['name']}@{r['size']}": r for r in json.load(f)["results"]}
+
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    # Mantém as medições de outros tamanhos/casos que não rodaram agora
+    merged = load_baseline(path)
+    merged.update({r.key: asdict(r) for r in results})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"python": sys.version.split()[0], "results": sorted(merged.values(), key=lambda r: (r["name"], r["size"]))},
+                  f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def compare(result: Result, base: Optional[dict], tolerance: float) -> List[str]:
+    """Regressões de `result` em relação à linha de base (vazão menor, p99 ou RSS maiores)."""
+    if not base:
+        return []
+    problems = []
+    if result.throughput < base["throughput"] * (1 - tolerance):
+        problems.append(f"vazão {result.throughput:,.1f} < {base['throughput']:,.1f} {result.unit}")
+    if result.p99_ms > base["p99_ms"] * (1 + tolerance):
+        problems.append(f"p99 {result.p99_ms:.2f} > {base['p99_ms']:.2f} ms")
+    if base.get("peak_rss_mb") and result.peak_rss_mb > base["peak_rss_mb"] * (1 + tolerance):
+        problems.append(f"RSS {result.peak_rss_mb:.0f} > {base['peak_rss_mb']:.0f} MiB")
+    return problems
+
+
+def delta(result: Result, base: Optional[dict]) -> str:
+    if not base or not base["throughput"]:
+        return "—"
+    return f"{(result.throughput / base['throughput'] - 1) * 100:+.1f}%"
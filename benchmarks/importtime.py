@@ -0,0 +1,99 @@
+"""Custo de importação da API e do CLI via `python -X importtime`.
+
+    python -m benchmarks.importtime              # api e collect_and_analyze
+    python -m benchmarks.importtime --top 15 api
+
+Falha (código 1) se um módulo de `FORBIDDEN` for importado na subida ou se a
+importação criar arquivos no diretório atual: as dependências dos scrapers com
+navegador só carregam quando a fonte é usada (ver `src/scrapers/registry.py`),
+o pandas só na primeira análise/snapshot, e os bancos em `data/` só abrem no
+lifespan da API. `tests/test_startup.py` roda a mesma verificação.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = ("api", "collect_and_analyze")
+# Só carregam quando uma fonte que os usa é pedida
+FORBIDDEN = (
+    "playwright", "bs4", "pandas", "src.scrapers.indeed", "src.scrapers.remotive", "src.scrapers.getonboard",
+)
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    # Microssegundos: importação inteira (cumulativo do módulo raiz)
+    total_us: int
+    # módulo -> (próprio, cumulativo) em µs
+    modules: Dict[str, Tuple[int, int]]
+    # Arquivos/diretórios que a importação criou no cwd (deveria ser nenhum)
+    created: List[str] = field(default_factory=list)
+
+    def loaded(self, name: str) -> bool:
+        return any(m == name or m.startswith(name + ".") for m in self.modules)
+
+    def heaviest(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Pacotes de topo com maior tempo cumulativo."""
+        tops: Dict[str, int] = {}
+        for mod, (_, cumulative) in self.modules.items():
+            top = mod.split(".")[0]
+            tops[top] = max(tops.get(top, 0), cumulative)
+        tops.pop(self.module, None)
+        return sorted(tops.items(), key=lambda kv: -kv[1])[:n]
+
+    def problems(self) -> List[str]:
+        """Violações da subida preguiçosa: módulos de `FORBIDDEN` carregados e arquivos criados."""
+        out = [f"importado na subida: {name}" for name in FORBIDDEN if self.loaded(name)]
+        out += [f"criado na importação: {path}" for path in self.created]
+        return out
+
+
+def profile_import(module: str) -> ImportProfile:
+    """Importa `module` num processo novo (cwd temporário, sem tocar `data/`) e lê o -X importtime."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory(prefix="importtime-") as tmp:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=tmp, env=env, capture_output=True, text=True,
+        )
+        created = sorted(
+            os.path.relpath(os.path.join(root, name), tmp)
+            for root, dirs, files in os.walk(tmp) for name in dirs + files
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} falhou:\n{proc.stderr[-2000:]}")
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+    return ImportProfile(module, modules.get(module, (0, 0))[1], modules, created)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime")
+    parser.add_argument("modules", nargs="*", default=list(TARGETS))
+    parser.add_argument("--top", type=int, default=10, help="Pacotes mais caros a listar")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        prof = profile_import(module)
+        print(f"import {module}: {prof.total_us / 1000:.1f} ms")
+        for name, us in prof.heaviest(args.top):
+            print(f"  {name:<28} {us / 1000:8.1f} ms")
+        for problem in prof.problems():
+            failed = True
+            print(f"  ERRO: {problem}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
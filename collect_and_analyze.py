@@ -1,30 +1,25 @@
-from src.scrapers.indeed import IndeedScraper
-from src.scrapers.linkedin_stub import LinkedInScraper
-from src.scrapers.glassdoor_stub import GlassdoorScraper
-from src.scrapers.remotive import RemotiveScraper
-from src.scrapers.getonboard import GetOnBoardScraper
-from src.skills.analyzer import aggregate_descriptions, top_n
-import pandas as pd
+from src.scrapers.registry import default_registry
+from src.skills.analyzer import top_n
+from src.skills.aggregates import AGGREGATES_PATH
+from src.skills.batch import aggregate_batch
+from src.scrapers.models import JobBatch
+from src.storage import JobStore, open_storage
+from src.dedup import dedup_jobs, open_dedup
 from typing import List
 
-SOURCES = {
-    "indeed": IndeedScraper(),
-    "linkedin": LinkedInScraper(),
-    "glassdoor": GlassdoorScraper(),
-    "remotive": RemotiveScraper(),
-    "getonboard": GetOnBoardScraper(),
-}
+# Só as fontes pedidas em --sources são importadas/instanciadas
+SOURCES = default_registry()
 
 def collect_jobs(query: str, location: str = "Brasil", limit: int = 50, sources: List[str] = None):
     if sources is None:
         sources = list(SOURCES.keys())
-    jobs = []
+    jobs = JobBatch()
     for name in sources:
-        scraper = SOURCES.get(name)
-        if not scraper:
+        if name not in SOURCES:
             continue
         try:
-            jobs.extend(list(scraper.search(query=query, location=location, limit=limit)))
+            scraper = SOURCES[name]
+            jobs.extend(scraper.search(query=query, location=location, limit=limit))
         except Exception as e:
             print(f"[WARN] Falha na fonte {name}: {e}")
     return jobs
@@ -39,25 +34,19 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     jobs = collect_jobs(args.query, args.location, args.limit, args.sources)
-    # Dedup: prioriza URL; fallback para (title, company, location)
-    seen_keys = set()
-    unique_jobs = []
-    for j in jobs:
-        key = j.url or (j.title, j.company, j.location)
-        if key in seen_keys:
-            continue
-        seen_keys.add(key)
-        unique_jobs.append(j)
-    jobs = unique_jobs
+    # Dedup entre fontes: mesma vaga (exata ou quase) publicada em vários lugares
+    jobs = JobBatch.from_jobs(dedup_jobs(jobs.normalize()))
     print(f"Coletadas {len(jobs)} vagas (dedup) de {args.sources}.")
 
-    descs = [j.desc for j in jobs if j.desc]
-    agg = aggregate_descriptions(descs)
+    agg = aggregate_batch(jobs.texts())
     top = top_n(agg, 15)
 
-    # Export simples
-    df = pd.DataFrame([j.__dict__ for j in jobs])
-    df.to_csv("data/jobs.csv", index=False)
+    # Persistência incremental (upsert por URL em data/jobs.db), descartando
+    # duplicatas de vagas já gravadas; os agregados do dashboard são regravados
+    storage = open_storage()
+    store = JobStore(storage, dedup=open_dedup(storage), artifact=AGGREGATES_PATH)
+    res = store.upsert(jobs)
+    print(f"{res.inserted} vagas novas, {res.updated} atualizadas, {res.duplicates} duplicatas em data/jobs.db.")
 
     for k, items in top.items():
         print("\nTop", k)
@@ -1,7 +1,5 @@
 import os
-import csv
 import logging
-import re
 from typing import List
 from datetime import datetime
 from linkedin_jobs_scraper import LinkedinScraper
@@ -10,6 +8,10 @@ from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
 from linkedin_jobs_scraper.filters import RelevanceFilters, TimeFilters, TypeFilters, ExperienceLevelFilters, OnSiteOrRemoteFilters
 from src.scrapers.models import Job
 from src.skills.analyzer import classify_tokens
+from src.skills.text import html_to_text
+from src.skills.aggregates import AGGREGATES_PATH
+from src.storage import JobStore, open_storage
+from src.dedup import open_dedup
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -22,8 +24,8 @@ def extract_relevant_skills(desc: str) -> str:
     if not desc:
         return "N/A"
     
-    # Remove HTML tags se existirem
-    desc = re.sub(r'<[^>]+>', '', desc)
+    # Remove HTML (mesma normalização usada na ingestão)
+    desc = html_to_text(desc)
     
     # Usar o analisador para classificar tokens
     skills_found = classify_tokens(desc)
@@ -137,66 +139,14 @@ def on_end():
             else:
                 print("   Nenhuma soft skill identificada")
         
-        # Salvar jobs encontrados em CSV
-        csv_file = 'data/jobs.csv'
+        # Salvar jobs encontrados no armazenamento (upsert por URL), descartando
+        # duplicatas de outras fontes e regravando os agregados do dashboard
+        storage = open_storage()
+        store = JobStore(storage, dedup=open_dedup(storage), artifact=AGGREGATES_PATH)
+        res = store.upsert(jobs_found)
         
-        # Verificar se já existe arquivo e carregar dados existentes
-        existing_jobs = []
-        if os.path.exists(csv_file):
-            try:
-                with open(csv_file, 'r', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    existing_jobs = list(reader)
-            except Exception as e:
-                print(f"⚠️  Aviso: Erro ao ler arquivo existente: {e}")
-        
-        # Combinar jobs existentes com novos
-        all_jobs = existing_jobs.copy()
-        existing_urls = {job.get('url') for job in existing_jobs if job.get('url')}
-        
-        # Adicionar apenas jobs novos (não duplicados)
-        new_jobs_added = 0
-        for job in jobs_found:
-            if job.url not in existing_urls:
-                all_jobs.append({
-                    'title': job.title,
-                    'company': job.company,
-                    'location': job.location,
-                    'desc': job.desc,
-                    'source': job.source,
-                    'url': job.url
-                })
-                new_jobs_added += 1
-        
-        # Salvar arquivo consolidado
-        with open(csv_file, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            # Cabeçalho
-            writer.writerow(['title', 'company', 'location', 'desc', 'source', 'url'])
-            
-            # Dados
-            for job in all_jobs:
-                if isinstance(job, dict):
-                    writer.writerow([
-                        job['title'],
-                        job['company'],
-                        job['location'],
-                        job['desc'],
-                        job['source'],
-                        job['url']
-                    ])
-                else:
-                    writer.writerow([
-                        job.title,
-                        job.company,
-                        job.location,
-                        job.desc,
-                        job.source,
-                        job.url
-                    ])
-        
-        print(f"\n✅ {new_jobs_added} vagas novas adicionadas ao {csv_file}")
-        print(f"📊 Total de vagas no arquivo: {len(all_jobs)}")
+        print(f"\n✅ {res.inserted} vagas novas adicionadas ao data/jobs.db ({res.updated} atualizadas, {res.duplicates} duplicatas)")
+        print(f"📊 Total de vagas no armazenamento: {storage.count()}")
     else:
         print("❌ Nenhuma vaga encontrada para salvar")
     
@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from src.metrics import timed
+from src.scrapers.models import Job
+from src.skills.text import normalize_job
+from src.storage.base import JobStorage, job_key
+from .fingerprint import fingerprint, hamming, location_similarity, same_company, simhash, title_similarity
+from .index import Entry, MemoryDedupIndex, SQLiteDedupIndex, StagedDedupIndex
+from .policy import MergePolicy
+
+DedupIndex = Union[MemoryDedupIndex, SQLiteDedupIndex, StagedDedupIndex]
+
+
+@dataclass
+class Duplicate:
+    job: Job
+    key: str
+    # Chave da vaga canônica que "venceu"
+    canonical: str
+    # "exact" (mesma impressão digital) ou "near" (SimHash próximo)
+    kind: str
+
+
+@dataclass
+class DedupResult:
+    unique: List[Job] = field(default_factory=list)
+    # Canônicas antigas substituídas por versões melhores deste lote (remover do armazenamento)
+    replaced: List[str] = field(default_factory=list)
+    duplicates: List[Duplicate] = field(default_factory=list)
+    # Com `resolve(..., stage=True)`: alterações do índice à espera de `Deduplicator.commit`
+    staged: Optional[StagedDedupIndex] = None
+
+
+class Deduplicator:
+    """Deduplicação entre fontes: exata por impressão digital e aproximada por SimHash.
+
+    Quase-duplicatas exigem no máximo `max_distance` bits de diferença no
+    SimHash da descrição, títulos parecidos (`min_title_similarity`) e locais
+    parecidos (`min_location_similarity`), para não juntar vagas diferentes que
+    compartilham o texto padrão da empresa. Nos dois casos a empresa precisa
+    bater (`same_company`): a mesma vaga em outra empresa ou outro local não é
+    duplicata.
+    """
+
+    def __init__(
+        self,
+        index: Optional[DedupIndex] = None,
+        policy: Optional[MergePolicy] = None,
+        max_distance: int = 3,
+        min_title_similarity: float = 0.5,
+        min_location_similarity: float = 0.5,
+    ):
+        self.index = index if index is not None else MemoryDedupIndex()
+        self.policy = policy or MergePolicy()
+        self.max_distance = max_distance
+        self.min_title_similarity = min_title_similarity
+        self.min_location_similarity = min_location_similarity
+
+    @staticmethod
+    def entry(job: Job) -> Entry:
+        normalize_job(job)
+        return Entry(
+            key=job_key(job),
+            fingerprint=fingerprint(job),
+            simhash=simhash(job.desc_text),
+            title=job.title or "",
+            source=job.source or "",
+            url=job.url,
+            desc_len=len(job.desc_text),
+            company=job.company or "",
+            location=job.location or "",
+        )
+
+    def match(self, entry: Entry, index: Optional[DedupIndex] = None) -> Optional[Tuple[Entry, str]]:
+        """Canônica já indexada de que `entry` é duplicata (a própria chave não conta)."""
+        index = index if index is not None else self.index
+        for found in index.by_fingerprint(entry.fingerprint):
+            if found.key != entry.key and same_company(found.company, found.url, entry.company, entry.url):
+                return found, "exact"
+        if not entry.simhash:
+            return None
+        best = None
+        for cand in index.candidates(entry.simhash):
+            if cand.key == entry.key:
+                continue
+            dist = hamming(cand.simhash, entry.simhash)
+            if dist > self.max_distance:
+                continue
+            if title_similarity(cand.title, entry.title) < self.min_title_similarity:
+                continue
+            if location_similarity(cand.location, entry.location) < self.min_location_similarity:
+                continue
+            if not same_company(cand.company, cand.url, entry.company, entry.url):
+                continue
+            if best is None or dist < best[0]:
+                best = (dist, cand)
+        return (best[1], "near") if best else None
+
+    @timed("dedup")
+    def resolve(self, jobs: Iterable[Job], stage: bool = False) -> DedupResult:
+        """Separa as vagas novas/canônicas das duplicatas e atualiza o índice.
+
+        Com `stage=True` o índice não é tocado: as alterações ficam em
+        `result.staged` até `commit(result)`, chamado depois que as vagas forem
+        gravadas (se a gravação falhar, basta descartar o resultado).
+        """
+        result = DedupResult(staged=StagedDedupIndex(self.index) if stage else None)
+        index = result.staged if stage else self.index
+        pending: Dict[str, int] = {}
+        for job in jobs:
+            entry = self.entry(job)
+            hit = self.match(entry, index)
+            if hit is None:
+                index.add(entry)
+                pending[entry.key] = len(result.unique)
+                result.unique.append(job)
+                continue
+            canonical, kind = hit
+            if not self.policy.prefer_new(canonical, job):
+                result.duplicates.append(Duplicate(job, entry.key, canonical.key, kind))
+                continue
+            # A versão nova vira a canônica
+            index.remove([canonical.key])
+            index.add(entry)
+            if canonical.key in pending:
+                # A canônica antiga era deste mesmo lote: troca no lugar
+                pos = pending.pop(canonical.key)
+                old = result.unique[pos]
+                result.unique[pos] = job
+                pending[entry.key] = pos
+                result.duplicates.append(Duplicate(old, canonical.key, entry.key, kind))
+            else:
+                pending[entry.key] = len(result.unique)
+                result.unique.append(job)
+                result.replaced.append(canonical.key)
+        return result
+
+    def commit(self, result: DedupResult) -> None:
+        """Grava no índice as alterações de um `resolve(..., stage=True)`."""
+        if result.staged is not None:
+            result.staged.commit()
+            result.staged = None
+
+    def forget(self, keys: Iterable[str]) -> None:
+        """Tira vagas removidas do armazenamento do índice."""
+        self.index.remove(keys)
+
+    def rebuild(self, storage: JobStorage) -> List[str]:
+        """Indexa tudo o que está gravado; devolve as chaves que são duplicatas de outras."""
+        df = storage.load_frame()
+        self.index.clear()
+        jobs = [
+            Job(r.title, r.company, r.location, r.desc, r.source, r.url or None, r.desc_text, r.desc_hash,
+                r.collected_at, r.posted_at)
+            for r in df.itertuples(index=False)
+        ]
+        # A ordem de gravação decide empates: a mais antiga fica
+        policy, self.policy = self.policy, MergePolicy(keep_first=True)
+        try:
+            result = self.resolve(jobs)
+        finally:
+            self.policy = policy
+        return [d.key for d in result.duplicates]
+
+
+def dedup_jobs(jobs: Iterable[Job], policy: Optional[MergePolicy] = None) -> List[Job]:
+    """Deduplica um lote em memória (exata + quase-duplicatas), sem índice em disco."""
+    return Deduplicator(MemoryDedupIndex(), policy).resolve(jobs).unique
+
+
+def open_dedup(storage: JobStorage, path: str = "data/dedup.db") -> Deduplicator:
+    """Índice persistente; na primeira abertura indexa o que já está gravado."""
+    dedup = Deduplicator(SQLiteDedupIndex(path))
+    if dedup.index.count() == 0 and storage.count():
+        dedup.rebuild(storage)
+    return dedup
+
+
+__all__ = [
+    "DedupResult",
+    "Deduplicator",
+    "Duplicate",
+    "Entry",
+    "MemoryDedupIndex",
+    "MergePolicy",
+    "SQLiteDedupIndex",
+    "StagedDedupIndex",
+    "dedup_jobs",
+    "open_dedup",
+]
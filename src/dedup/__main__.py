@@ -0,0 +1,20 @@
+import argparse
+from src.storage import JobStore, SQLiteJobStorage
+from . import Deduplicator, SQLiteDedupIndex
+
+parser = argparse.ArgumentParser(description="Reindexa as vagas gravadas e lista/remove duplicatas")
+parser.add_argument("--db", default="data/jobs.db", help="Banco SQLite de vagas")
+parser.add_argument("--index", default="data/dedup.db", help="Índice de deduplicação")
+parser.add_argument("--apply", action="store_true", help="Remove as duplicatas do armazenamento")
+args = parser.parse_args()
+
+storage = SQLiteJobStorage(args.db)
+dedup = Deduplicator(SQLiteDedupIndex(args.index))
+keys = dedup.rebuild(storage)
+print(f"{dedup.index.count()} vagas canônicas, {len(keys)} duplicatas em {args.db}")
+if args.apply and keys:
+    res = JobStore(storage).remove(keys)
+    print(f"{res.removed} duplicatas removidas")
+elif keys:
+    for key in keys[:20]:
+        print(" ", key)
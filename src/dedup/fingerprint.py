@@ -0,0 +1,112 @@
+import hashlib
+import re
+import unicodedata
+from typing import List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+import numpy as np
+from src.scrapers.models import Job
+from src.skills.text import normalize_job
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+BITS = 64
+# 4 faixas de 16 bits: pelo princípio da casa dos pombos, dois hashes a até 3
+# bits de distância coincidem em pelo menos uma faixa inteira
+BANDS = 4
+BAND_BITS = BITS // BANDS
+SHINGLE = 3
+# Descrições mais curtas que isso não têm SimHash confiável
+MIN_WORDS = 20
+# Sufixos societários ignorados ao comparar empresas
+_LEGAL = frozenset(("inc", "ltd", "ltda", "llc", "corp", "co", "sa", "s", "a", "me", "eireli", "gmbh", "plc", "the"))
+
+
+def words(text: str) -> List[str]:
+    """Palavras minúsculas sem acentos (ex.: "Programação" -> "programacao")."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD.findall(text)
+
+
+def fingerprint(job: Job) -> str:
+    """Impressão digital exata: título + local + descrição normalizados.
+
+    A empresa e a fonte ficam de fora de propósito: agregadores escrevem o nome
+    da empresa de jeitos diferentes ("Acme Inc." x "ACME"), então a empresa é
+    conferida à parte, de forma tolerante (`same_company`).
+    """
+    normalize_job(job)
+    body = words(job.desc_text)
+    if not body:
+        # Sem descrição, só título/empresa/local identificam a vaga
+        body = words(job.company or "")
+    payload = "\x1f".join((" ".join(words(job.title)), " ".join(words(job.location or "")), " ".join(body)))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def simhash(text: str) -> int:
+    """SimHash de 64 bits sobre shingles de 3 palavras (0 se o texto for curto)."""
+    ws = words(text)
+    if len(ws) < MIN_WORDS:
+        return 0
+    digests = b"".join(
+        hashlib.blake2b(" ".join(ws[i:i + SHINGLE]).encode("utf-8"), digest_size=8).digest()
+        for i in range(len(ws) - SHINGLE + 1)
+    )
+    # Bits de cada shingle (bit 0 = menos significativo); soma de ±1 por coluna
+    bits = np.unpackbits(np.frombuffer(digests, dtype=">u8").astype("<u8").view(np.uint8), bitorder="little")
+    votes = bits.reshape(-1, BITS).sum(axis=0, dtype=np.int64) * 2 - len(digests) // 8
+    return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+
+def bands(h: int) -> List[Tuple[int, int]]:
+    """(faixa, valor) de cada faixa de 16 bits do hash."""
+    mask = (1 << BAND_BITS) - 1
+    return [(i, (h >> (i * BAND_BITS)) & mask) for i in range(BANDS)]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _jaccard(a: str, b: str) -> float:
+    wa, wb = set(words(a)), set(words(b))
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / len(wa | wb)
+
+
+def title_similarity(a: str, b: str) -> float:
+    """Jaccard das palavras do título (evita juntar vagas diferentes com o mesmo texto padrão)."""
+    return _jaccard(a, b)
+
+
+def location_similarity(a: str, b: str) -> float:
+    """Jaccard das palavras do local; 1.0 se um dos lados não informa o local."""
+    if not words(a) or not words(b):
+        return 1.0
+    return _jaccard(a, b)
+
+
+def company_tokens(company: str) -> Set[str]:
+    """Palavras do nome da empresa sem sufixos societários ("Acme Ltda." -> {"acme"})."""
+    return set(words(company)) - _LEGAL
+
+
+def same_company(company_a: str, url_a: Optional[str], company_b: str, url_b: Optional[str]) -> bool:
+    """Comparação tolerante: alguma palavra do nome em comum, ou o nome no domínio da URL do outro lado.
+
+    Sem empresa nos dois lados não há como distinguir, e a vaga pode casar.
+    """
+    ta, tb = company_tokens(company_a), company_tokens(company_b)
+    if ta and tb:
+        return bool(ta & tb)
+    if not ta and not tb:
+        return True
+    known, url = (ta, url_b) if ta else (tb, url_a)
+    return bool(known & _host_labels(url))
+
+
+def _host_labels(url: Optional[str]) -> Set[str]:
+    host = urlsplit(url or "").hostname or ""
+    return set(words(host.replace(".", " ")))
@@ -0,0 +1,251 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .fingerprint import bands
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    simhash INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    url TEXT,
+    desc_len INTEGER NOT NULL DEFAULT 0,
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_entries_fp ON entries(fingerprint);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bands ON bands(band, value);
+CREATE INDEX IF NOT EXISTS idx_bands_key ON bands(key);
+"""
+# Mudanças na impressão digital ou nas colunas (2: local na impressão, empresa e
+# local nas entradas) descartam o índice; `open_dedup` o refaz a partir das vagas
+FORMAT = 2
+
+
+@dataclass(frozen=True)
+class Entry:
+    """Vaga canônica já indexada (o bastante para a política de merge decidir)."""
+    key: str
+    fingerprint: str
+    simhash: int
+    title: str = ""
+    source: str = ""
+    url: Optional[str] = None
+    desc_len: int = 0
+    company: str = ""
+    location: str = ""
+
+
+def _signed(h: int) -> int:
+    # SQLite guarda INTEGER com sinal (64 bits)
+    return h - (1 << 64) if h >= 1 << 63 else h
+
+
+def _unsigned(h: int) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+class MemoryDedupIndex:
+    """Índice em memória, para deduplicar um lote sem tocar o disco."""
+
+    def __init__(self):
+        self._entries: Dict[str, Entry] = {}
+        self._by_fp: Dict[str, Dict[str, None]] = {}
+        self._bands: Dict[Tuple[int, int], Set[str]] = {}
+
+    def by_fingerprint(self, fp: str) -> List[Entry]:
+        return [self._entries[k] for k in self._by_fp.get(fp, ())]
+
+    def candidates(self, simhash: int) -> List[Entry]:
+        keys: Set[str] = set()
+        for band in bands(simhash):
+            keys |= self._bands.get(band, set())
+        return [self._entries[k] for k in keys]
+
+    def add(self, entry: Entry) -> None:
+        self.remove([entry.key])
+        self._entries[entry.key] = entry
+        # Dict como conjunto ordenado: a mais antiga vem primeiro
+        self._by_fp.setdefault(entry.fingerprint, {})[entry.key] = None
+        if entry.simhash:
+            for band in bands(entry.simhash):
+                self._bands.setdefault(band, set()).add(entry.key)
+
+    def remove(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                continue
+            same = self._by_fp.get(entry.fingerprint, {})
+            same.pop(key, None)
+            if not same:
+                self._by_fp.pop(entry.fingerprint, None)
+            if entry.simhash:
+                for band in bands(entry.simhash):
+                    self._bands.get(band, set()).discard(key)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> List[Entry]:
+        return list(self._entries.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+class SQLiteDedupIndex:
+    """Índice persistente em SQLite (`data/dedup.db`).
+
+    Busca exata pela impressão digital e, para quase-duplicatas, pelas faixas
+    de 16 bits do SimHash: só as vagas que dividem uma faixa são comparadas.
+    """
+
+    def __init__(self, path: str = "data/dedup.db"):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connect()
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != FORMAT:
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute("DROP TABLE IF EXISTS bands")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {FORMAT}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _entry(row) -> Entry:
+        return Entry(row[0], row[1], _unsigned(row[2]), *row[3:])
+
+    _COLS = "key, fingerprint, simhash, title, source, url, desc_len, company, location"
+
+    def by_fingerprint(self, fp: str) -> List[Entry]:
+        rows = self._connect().execute(
+            f"SELECT {self._COLS} FROM entries WHERE fingerprint = ? ORDER BY rowid", (fp,)
+        ).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def candidates(self, simhash: int) -> List[Entry]:
+        where = " OR ".join("(b.band = ? AND b.value = ?)" for _ in range(len(bands(simhash))))
+        params = [v for band in bands(simhash) for v in band]
+        rows = self._connect().execute(
+            f"SELECT DISTINCT {', '.join('e.' + c for c in self._COLS.split(', '))} "
+            f"FROM bands b JOIN entries e ON e.key = b.key WHERE {where}",
+            params,
+        ).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def add(self, entry: Entry) -> None:
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[Entry]) -> None:
+        entries = list(entries)
+        if not entries:
+            return
+        conn = self._connect()
+        with conn:
+            self._remove(conn, [e.key for e in entries])
+            conn.executemany(
+                f"INSERT INTO entries({self._COLS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (e.key, e.fingerprint, _signed(e.simhash), e.title, e.source, e.url, e.desc_len, e.company,
+                     e.location)
+                    for e in entries
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO bands(band, value, key) VALUES (?, ?, ?)",
+                [(b, v, e.key) for e in entries if e.simhash for b, v in bands(e.simhash)],
+            )
+
+    @staticmethod
+    def _remove(conn: sqlite3.Connection, keys: List[str]) -> None:
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+        conn.executemany("DELETE FROM bands WHERE key = ?", [(k,) for k in keys])
+
+    def remove(self, keys: Iterable[str]) -> None:
+        conn = self._connect()
+        with conn:
+            self._remove(conn, list(keys))
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM bands")
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class StagedDedupIndex:
+    """Alterações pendentes sobre outro índice, gravadas só em `commit()`.
+
+    Consultas enxergam o índice de baixo mais as alterações do lote. Assim a
+    deduplicação decide antes da escrita no armazenamento e o índice persistente
+    só muda depois que as vagas foram de fato gravadas.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.added = MemoryDedupIndex()
+        self.removed: Set[str] = set()
+
+    def _visible(self, entry: Optional[Entry]) -> Optional[Entry]:
+        if entry is None or entry.key in self.removed or entry.key in self.added:
+            return None
+        return entry
+
+    def by_fingerprint(self, fp: str) -> List[Entry]:
+        base = [e for e in self.base.by_fingerprint(fp) if self._visible(e) is not None]
+        return base + self.added.by_fingerprint(fp)
+
+    def candidates(self, simhash: int) -> List[Entry]:
+        base = [e for e in self.base.candidates(simhash) if self._visible(e) is not None]
+        return self.added.candidates(simhash) + base
+
+    def add(self, entry: Entry) -> None:
+        self.added.add(entry)
+
+    def remove(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.added.remove(keys)
+        self.removed.update(keys)
+
+    def commit(self) -> None:
+        """Aplica remoções e inclusões no índice de baixo (em lote no SQLite)."""
+        if self.removed:
+            self.base.remove(self.removed)
+        entries = self.added.entries()
+        add_many = getattr(self.base, "add_many", None)
+        if add_many is not None:
+            add_many(entries)
+        else:
+            for entry in entries:
+                self.base.add(entry)
+        self.added.clear()
+        self.removed.clear()
+
+    def count(self) -> int:
+        return self.base.count() - len(self.removed) + self.added.count()
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from src.scrapers.models import Job
+from .index import Entry
+
+# Fontes mais próximas do anúncio original primeiro (agregadores por último)
+SOURCE_PRIORITY: Tuple[str, ...] = ("getonboard", "linkedin", "indeed", "glassdoor", "remotive")
+
+
+@dataclass(frozen=True)
+class MergePolicy:
+    """Escolhe a versão canônica entre duplicatas.
+
+    Ordem: tem URL, descrição mais longa (mais texto para a análise de skills),
+    fonte melhor em `source_priority`. Empate mantém a que já estava gravada.
+    Com `keep_first=True` a primeira vista sempre vence (útil em respostas em
+    streaming, onde a versão já emitida não pode ser trocada).
+    """
+    source_priority: Tuple[str, ...] = SOURCE_PRIORITY
+    keep_first: bool = False
+
+    def _rank(self, source: str) -> int:
+        try:
+            # Fontes gravadas como escritas pelo scraper ("LinkedIn")
+            return -self.source_priority.index((source or "").lower())
+        except ValueError:
+            return -len(self.source_priority)
+
+    def score(self, source: str, url: Optional[str], desc_len: int) -> tuple:
+        return (bool(url), desc_len, self._rank(source))
+
+    def prefer_new(self, existing: Entry, job: Job) -> bool:
+        if self.keep_first:
+            return False
+        new = self.score(job.source or "", job.url, len(job.desc_text))
+        return new > self.score(existing.source, existing.url, existing.desc_len)
@@ -0,0 +1,315 @@
+"""Métricas do pipeline (coleta, análise, persistência) em formato Prometheus.
+
+Sem dependências: contadores e histogramas com rótulos, guardados em memória
+no processo e expostos como texto em `GET /metrics`. Com vários workers do
+uvicorn, cada processo tem os seus (o Prometheus soma pelo rótulo `instance`).
+
+    with timed("parse", source="indeed"):
+        ...
+
+    @timed("analyze")
+    def aggregate_descriptions(...): ...
+"""
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Segundos: de 5 ms (agregados em memória) a 5 min (timeout de um scraper)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+JOB_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 200, 500, 1000)
+BYTE_BUCKETS = (1_000, 10_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: rótulos esperados {self.label_names}, recebidos {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_items(items))
+        return lines
+
+    def _render_items(self, items) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_items(self, items):
+        for key, v in items:
+            yield f"{self.name}{_labels(self.label_names, key)} {_number(v)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [contagem por faixa..., soma, total]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-1] if state else 0
+
+    def _render_items(self, items):
+        for key, state in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, state):
+                cumulative += n
+                le = 'le="%s"' % _number(bound)
+                yield f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_labels(self.label_names, key, le)} {state[-1]}"
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {_number(state[-2])}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {state[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for m in metrics:
+            m.clear()
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "radar_stage_duration_seconds", "Duração de cada etapa do pipeline", ("stage", "source"),
+)
+SCRAPE_JOBS = REGISTRY.histogram(
+    "radar_scrape_jobs", "Vagas retornadas por busca", ("source",), buckets=JOB_BUCKETS,
+)
+SCRAPE_ERRORS = REGISTRY.counter(
+    "radar_scrape_errors_total", "Falhas na coleta (busca inteira ou requisição de uma página)", ("source", "error"),
+)
+DOWNLOAD_BYTES = REGISTRY.histogram(
+    "radar_download_bytes", "Bytes baixados por resposta (rede ou navegador)", ("source", "origin"),
+    buckets=BYTE_BUCKETS,
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "radar_http_request_duration_seconds", "Duração das requisições da API (até o último byte)",
+    ("method", "route", "status"),
+)
+
+
+def count_error(source: str, error: BaseException) -> None:
+    SCRAPE_ERRORS.inc(source=source or "", error=type(error).__name__)
+
+
+class timed:
+    """Mede uma etapa em `radar_stage_duration_seconds` (contexto ou decorador, síncrono ou async)."""
+
+    def __init__(self, stage: str, source: str = ""):
+        self.stage = stage
+        self.source = source
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        STAGE_SECONDS.observe(time.perf_counter() - self._start, stage=self.stage, source=self.source)
+
+    def __call__(self, fn: Callable) -> Callable:
+        stage, source = self.stage, self.source
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage, source):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage, source):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def _record_search(source: str, start: float, result: Any) -> None:
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage="search", source=source)
+    try:
+        SCRAPE_JOBS.observe(len(result), source=source)
+    except TypeError:
+        pass
+
+
+def scrape(source: str) -> Callable[[Callable], Callable]:
+    """Decorador de `search`/`asearch`: latência, vagas retornadas e erros por fonte."""
+
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    count_error(source, e)
+                    raise
+                _record_search(source, start, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                count_error(source, e)
+                raise
+            _record_search(source, start, result)
+            return result
+        return wrapper
+
+    return decorate
+
+
+def _route_of(scope: Dict[str, Any]) -> str:
+    # Modelo da rota ("/scrape/{source}"), não o caminho: evita um rótulo por URL
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<sem rota>"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede cada requisição HTTP até o fim do corpo (inclui NDJSON em streaming)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=_route_of(scope),
+                status=str(status["code"]),
+            )
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "DOWNLOAD_BYTES",
+    "Histogram",
+    "MetricsMiddleware",
+    "REGISTRY",
+    "REQUEST_SECONDS",
+    "Registry",
+    "SCRAPE_ERRORS",
+    "SCRAPE_JOBS",
+    "STAGE_SECONDS",
+    "count_error",
+    "render",
+    "scrape",
+    "timed",
+]
@@ -0,0 +1,29 @@
+import os
+from typing import Mapping, Optional
+from src.scrapers.base import BaseScraper
+from src.storage import JobStore
+from .cron import CronSchedule, ScheduleEntry, SchedulerConfig
+from .queue import ScrapeQueue, ScrapeTask
+from .worker import Scheduler
+
+DEFAULT_CONFIG = "config/scheduler.json"
+
+
+def create_scheduler(
+    store: JobStore, scrapers: Mapping[str, BaseScraper], config_path: Optional[str] = None
+) -> Scheduler:
+    """Agendador com a fila padrão (`data/scheduler.db`) e o JSON de `SCHEDULER_CONFIG`, se existir."""
+    path = config_path or os.getenv("SCHEDULER_CONFIG", DEFAULT_CONFIG)
+    config = SchedulerConfig.load(path) if os.path.exists(path) else SchedulerConfig()
+    return Scheduler(ScrapeQueue(os.getenv("SCHEDULER_DB", "data/scheduler.db")), store, scrapers, config)
+
+
+__all__ = [
+    "CronSchedule",
+    "ScheduleEntry",
+    "Scheduler",
+    "SchedulerConfig",
+    "ScrapeQueue",
+    "ScrapeTask",
+    "create_scheduler",
+]
@@ -0,0 +1,102 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Tuple
+
+# (mínimo, máximo) de cada campo: minuto, hora, dia do mês, mês, dia da semana
+_FIELDS: Tuple[Tuple[int, int], ...] = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> FrozenSet[int]:
+    values = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        step_n = int(step) if step else 1
+        if rng == "*":
+            start, end = lo, hi
+        elif "-" in rng:
+            a, b = rng.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(rng)
+            end = hi if step else start
+        if start < lo or end > hi or start > end or step_n < 1:
+            raise ValueError(f"Campo cron inválido: {part!r}")
+        values.update(range(start, end + 1, step_n))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """Expressão cron de 5 campos (`*`, listas, faixas e passos; domingo = 0).
+
+    Como no cron tradicional, se o dia do mês e o dia da semana forem ambos
+    restritos (nenhum começa com `*`), basta um dos dois casar: `0 9 1 * 1`
+    dispara no dia 1 e em toda segunda-feira.
+    """
+    expr: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    any_day: bool = True
+    any_weekday: bool = True
+
+    @classmethod
+    def parse(cls, expr: str) -> "CronSchedule":
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expressão cron precisa de 5 campos: {expr!r}")
+        fields = [_parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, _FIELDS)]
+        # 7 também é domingo, como no cron tradicional
+        fields[4] = frozenset(d % 7 for d in fields[4])
+        return cls(expr, *fields, any_day=parts[2].startswith("*"), any_weekday=parts[4].startswith("*"))
+
+    def matches(self, when: datetime) -> bool:
+        if when.minute not in self.minutes or when.hour not in self.hours or when.month not in self.months:
+            return False
+        day = when.day in self.days
+        weekday = (when.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+
+@dataclass(frozen=True)
+class ScheduleEntry:
+    name: str
+    cron: CronSchedule
+    query: str
+    sources: Tuple[str, ...]
+    location: str = "Brasil"
+    limit: int = 50
+
+
+@dataclass
+class SchedulerConfig:
+    """Conteúdo do arquivo JSON do agendador (ver `doc/agendador.md`)."""
+    schedules: List[ScheduleEntry] = field(default_factory=list)
+    limits: Dict[str, int] = field(default_factory=dict)
+    default_limit: int = 1
+
+    @classmethod
+    def load(cls, path: str) -> "SchedulerConfig":
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        schedules = [
+            ScheduleEntry(
+                name=item["name"],
+                cron=CronSchedule.parse(item["cron"]),
+                query=item["query"],
+                sources=tuple(item.get("sources", ["remotive", "getonboard"])),
+                location=item.get("location", "Brasil"),
+                limit=int(item.get("limit", 50)),
+            )
+            for item in raw.get("schedules", [])
+        ]
+        return cls(
+            schedules=schedules,
+            limits={k: int(v) for k, v in raw.get("limits", {}).items()},
+            default_limit=int(raw.get("default_limit", 1)),
+        )
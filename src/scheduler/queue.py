@@ -0,0 +1,218 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_tasks (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    location TEXT NOT NULL DEFAULT '',
+    lim INTEGER NOT NULL,
+    origin TEXT NOT NULL DEFAULT 'api',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner INTEGER,
+    jobs_found INTEGER,
+    inserted INTEGER,
+    updated INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_job ON scrape_tasks(job_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON scrape_tasks(status, source);
+CREATE TABLE IF NOT EXISTS schedule_runs (
+    name TEXT PRIMARY KEY,
+    last_run REAL NOT NULL
+);
+"""
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class ScrapeTask:
+    id: int
+    job_id: str
+    source: str
+    query: str
+    location: str
+    limit: int
+    attempts: int
+
+
+class ScrapeQueue:
+    """Fila de coletas em SQLite: cada pedido (`job_id`) vira uma tarefa por fonte.
+
+    A fila sobrevive a reinícios: tarefas que estavam rodando quando o processo
+    caiu voltam para `queued` em `recover()`. A retirada (`claim`) é atômica,
+    então vários workers/processos podem drenar a mesma fila.
+    """
+
+    def __init__(self, path: str = "data/scheduler.db"):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def enqueue(
+        self, query: str, location: str, limit: int, sources: Iterable[str], origin: str = "api"
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO scrape_tasks(job_id, source, query, location, lim, origin, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(job_id, s, query, location, limit, origin, now) for s in dict.fromkeys(sources)],
+            )
+        return job_id
+
+    def claim(self, source: str) -> Optional[ScrapeTask]:
+        """Retira a tarefa mais antiga da fonte (ou None se não houver)."""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM scrape_tasks WHERE status = ? AND source = ? ORDER BY id LIMIT 1",
+                (QUEUED, source),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE scrape_tasks SET status = ?, started_at = ?, owner = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (RUNNING, time.time(), os.getpid(), row["id"]),
+            )
+        return ScrapeTask(
+            row["id"], row["job_id"], row["source"], row["query"], row["location"], row["lim"], row["attempts"] + 1
+        )
+
+    def pending_sources(self) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT DISTINCT source FROM scrape_tasks WHERE status = ?", (QUEUED,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def finish(
+        self, task_id: int, jobs_found: int = 0, inserted: int = 0, updated: int = 0, error: Optional[str] = None
+    ) -> None:
+        self._connect().execute(
+            "UPDATE scrape_tasks SET status = ?, jobs_found = ?, inserted = ?, updated = ?, error = ?, "
+            "finished_at = ? WHERE id = ?",
+            (FAILED if error else DONE, jobs_found, inserted, updated, error, time.time(), task_id),
+        )
+
+    def recover(self, max_attempts: int = 3) -> int:
+        """Devolve à fila as tarefas interrompidas (dono morto ou este mesmo processo).
+
+        Tarefas de outros processos vivos ficam como estão; as que já caíram
+        `max_attempts` vezes são marcadas como falhas.
+        """
+        conn = self._connect()
+        requeued = 0
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, owner, attempts FROM scrape_tasks WHERE status = ?", (RUNNING,)
+            ).fetchall()
+            for row in rows:
+                if row["owner"] != os.getpid() and _alive(row["owner"]):
+                    continue
+                if row["attempts"] >= max_attempts:
+                    conn.execute(
+                        "UPDATE scrape_tasks SET status = ?, error = 'interrompida', finished_at = ? WHERE id = ?",
+                        (FAILED, time.time(), row["id"]),
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE scrape_tasks SET status = ?, started_at = NULL, owner = NULL WHERE id = ?",
+                    (QUEUED, row["id"]),
+                )
+                requeued += 1
+        return requeued
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT * FROM scrape_tasks WHERE job_id = ? ORDER BY id", (job_id,)
+        ).fetchall()
+        if not rows:
+            return None
+        states = [r["status"] for r in rows]
+        finished = sum(s in (DONE, FAILED) for s in states)
+        if finished == len(rows):
+            status = FAILED if all(s == FAILED for s in states) else DONE
+        elif RUNNING in states or finished:
+            status = RUNNING
+        else:
+            status = QUEUED
+        return {
+            "job_id": job_id,
+            "status": status,
+            "query": rows[0]["query"],
+            "location": rows[0]["location"],
+            "limit": rows[0]["lim"],
+            "origin": rows[0]["origin"],
+            "progress": {"done": finished, "total": len(rows)},
+            "sources": {
+                r["source"]: {
+                    "status": r["status"],
+                    "jobs_found": r["jobs_found"],
+                    "inserted": r["inserted"],
+                    "updated": r["updated"],
+                    "error": r["error"],
+                    "attempts": r["attempts"],
+                }
+                for r in rows
+            },
+            "created_at": rows[0]["created_at"],
+            "finished_at": max(r["finished_at"] for r in rows) if finished == len(rows) else None,
+        }
+
+    def mark_schedule(self, name: str, slot: float) -> bool:
+        """Registra a execução de um agendamento no minuto `slot`; False se já registrada.
+
+        Garante um único disparo por minuto mesmo com vários processos da API.
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT last_run FROM schedule_runs WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] >= slot:
+                return False
+            conn.execute(
+                "INSERT INTO schedule_runs(name, last_run) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_run = excluded.last_run",
+                (name, slot),
+            )
+        return True
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, List, Mapping, Optional, Set
+from src.scrapers.base import BaseScraper
+from src.scrapers.registry import ScraperUnavailable
+from src.scrapers.runner import search_with_timeout
+from src.storage import JobStore
+from .cron import SchedulerConfig
+from .queue import ScrapeQueue, ScrapeTask
+
+log = logging.getLogger(__name__)
+
+# Tentativas por tarefa (contando reinícios no meio da execução)
+MAX_ATTEMPTS = 3
+
+
+class Scheduler:
+    """Drena a `ScrapeQueue` no event loop da API, fora do ciclo das requisições.
+
+    Cada fonte tem seu limite de coletas simultâneas (`config.limits`, senão
+    `config.default_limit`). Os agendamentos cron do arquivo de configuração
+    viram pedidos comuns na fila, com `origin = "cron:<nome>"`.
+    """
+
+    def __init__(
+        self,
+        queue: ScrapeQueue,
+        store: JobStore,
+        scrapers: Mapping[str, BaseScraper],
+        config: Optional[SchedulerConfig] = None,
+        poll_interval: float = 5.0,
+    ):
+        self.queue = queue
+        self.store = store
+        self.scrapers = scrapers
+        self.config = config or SchedulerConfig()
+        self.poll_interval = poll_interval
+        self._running: Counter = Counter()
+        self._tasks: Set[asyncio.Task] = set()
+        self._loops: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    def limit(self, source: str) -> int:
+        return self.config.limits.get(source, self.config.default_limit)
+
+    # -- ciclo de vida -----------------------------------------------------
+    async def start(self) -> None:
+        self._wake = asyncio.Event()
+        recovered = await asyncio.to_thread(self.queue.recover, MAX_ATTEMPTS)
+        if recovered:
+            log.info("%d tarefas interrompidas voltaram para a fila", recovered)
+        self._loops = [asyncio.create_task(self._dispatch_loop())]
+        if self.config.schedules:
+            self._loops.append(asyncio.create_task(self._cron_loop()))
+
+    async def stop(self) -> None:
+        for task in self._loops + list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._loops, *self._tasks, return_exceptions=True)
+        self._loops = []
+        # Tarefas canceladas no meio ficam `running` e são retomadas no próximo start
+
+    # -- fila --------------------------------------------------------------
+    async def submit(self, query: str, location: str, limit: int, sources: Iterable[str], origin: str = "api") -> str:
+        job_id = await asyncio.to_thread(self.queue.enqueue, query, location, limit, list(sources), origin)
+        if self._wake is not None:
+            self._wake.set()
+        return job_id
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self._dispatch()
+            except Exception:
+                log.exception("Falha ao despachar tarefas da fila")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _dispatch(self) -> None:
+        for source in await asyncio.to_thread(self.queue.pending_sources):
+            while self._running[source] < self.limit(source):
+                task = await asyncio.to_thread(self.queue.claim, source)
+                if task is None:
+                    break
+                self._running[source] += 1
+                t = asyncio.create_task(self._run(task))
+                self._tasks.add(t)
+                t.add_done_callback(self._tasks.discard)
+
+    async def _run(self, task: ScrapeTask) -> None:
+        try:
+            try:
+                scraper = self.scrapers.get(task.source)
+            except ScraperUnavailable as e:
+                await asyncio.to_thread(self.queue.finish, task.id, error=str(e))
+                return
+            if scraper is None:
+                await asyncio.to_thread(self.queue.finish, task.id, error=f"Fonte '{task.source}' não disponível")
+                return
+            try:
+                jobs = await search_with_timeout(scraper, task.query, task.location, task.limit)
+                result = await asyncio.to_thread(self.store.upsert, jobs) if jobs else None
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(
+                    self.queue.finish, task.id, error=f"Timeout ({scraper.timeout:.0f}s)"
+                )
+                return
+            except Exception as e:
+                log.warning("Coleta %s/%s falhou: %s", task.source, task.query, e)
+                await asyncio.to_thread(self.queue.finish, task.id, error=str(e) or type(e).__name__)
+                return
+            await asyncio.to_thread(
+                self.queue.finish,
+                task.id,
+                len(jobs),
+                result.inserted if result else 0,
+                result.updated if result else 0,
+            )
+        finally:
+            self._running[task.source] -= 1
+            # Vaga liberada: outra tarefa da mesma fonte pode começar
+            self._wake.set()
+
+    # -- cron --------------------------------------------------------------
+    async def _cron_loop(self) -> None:
+        while True:
+            now = datetime.now().replace(second=0, microsecond=0)
+            for entry in self.config.schedules:
+                if not entry.cron.matches(now):
+                    continue
+                fire = await asyncio.to_thread(self.queue.mark_schedule, entry.name, now.timestamp())
+                if fire:
+                    job_id = await self.submit(
+                        entry.query, entry.location, entry.limit, entry.sources, origin=f"cron:{entry.name}"
+                    )
+                    log.info("Agendamento %s enfileirado como %s", entry.name, job_id)
+            # Acorda logo após a virada do próximo minuto
+            await asyncio.sleep(60 - time.time() % 60 + 0.5)
@@ -1,8 +1,24 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Iterable, List
 from .models import Job
 
 class BaseScraper(ABC):
+    # Tempo máximo (s) de uma busca quando executada pela API
+    timeout: float = 300
+    # Aceita `debug=` em search/asearch (captura de HTML/screenshots)
+    supports_debug: bool = False
+
     @abstractmethod
     def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
         raise NotImplementedError
+
+class AsyncBaseScraper(BaseScraper):
+    """Scraper com I/O nativamente assíncrono; `search` continua disponível para o CLI."""
+
+    @abstractmethod
+    async def asearch(self, query: str, location: str = "Brasil", limit: int = 50) -> List[Job]:
+        raise NotImplementedError
+
+    def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
+        return asyncio.run(self.asearch(query=query, location=location, limit=limit))
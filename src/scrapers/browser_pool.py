@@ -0,0 +1,193 @@
+import asyncio
+import atexit
+import itertools
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Dict, FrozenSet, List, Optional, Tuple
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+
+
+@dataclass(frozen=True)
+class ContextSpec:
+    """Configuração de um contexto; contextos com o mesmo spec são reaproveitados."""
+    locale: str = "pt-BR"
+    user_agent: Optional[str] = None
+    timezone_id: Optional[str] = None
+    extra_headers: Tuple[Tuple[str, str], ...] = ()
+    blocked_resources: FrozenSet[str] = field(default_factory=frozenset)
+
+
+class _PooledContext:
+    def __init__(self, browser: Browser, context: BrowserContext):
+        self.browser = browser
+        self.context = context
+        self.pages_served = 0
+        self.in_use = 0
+
+
+class BrowserPool:
+    """Pool de navegadores Chromium aquecidos (Playwright async).
+
+    Roda num event loop próprio, numa thread dedicada, para poder ser usado tanto
+    pelo CLI síncrono (`run`) quanto pela API (`arun`). Mantém até `size`
+    navegadores, contextos por `ContextSpec` reciclados após `pages_per_context`
+    páginas e no máximo `max_pages` páginas abertas ao mesmo tempo.
+    """
+
+    def __init__(self, size: int = 2, pages_per_context: int = 20, max_pages: int = 4, headless: bool = True):
+        self.size = size
+        self.pages_per_context = pages_per_context
+        self.max_pages = max_pages
+        self.headless = headless
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browsers: List[Browser] = []
+        self._contexts: Dict[Tuple[int, ContextSpec], _PooledContext] = {}
+        self._rr = itertools.count()
+        # Primitivas asyncio só se ligam ao loop no primeiro uso (loop do pool)
+        self._sem = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+
+    # -- loop dedicado ---------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+                self._loop = loop
+                atexit.register(self.shutdown)
+        return self._loop
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Executa `coro` no loop do pool e bloqueia até o resultado (uso síncrono)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    async def arun(self, coro: Awaitable[Any]) -> Any:
+        """Executa `coro` no loop do pool sem bloquear o loop chamador."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()))
+
+    # -- navegadores e contextos (sempre no loop do pool) -----------------
+    async def _browser(self) -> Tuple[int, Browser]:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        slot = next(self._rr) % self.size
+        while len(self._browsers) <= slot:
+            self._browsers.append(await self._playwright.chromium.launch(headless=self.headless))
+        browser = self._browsers[slot]
+        # Health check: navegador caiu -> descarta contextos e relança
+        if not browser.is_connected():
+            for key in [k for k in self._contexts if k[0] == slot]:
+                self._contexts.pop(key, None)
+            browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._browsers[slot] = browser
+        return slot, browser
+
+    async def _new_context(self, browser: Browser, spec: ContextSpec) -> BrowserContext:
+        kwargs: Dict[str, Any] = {"locale": spec.locale}
+        if spec.user_agent:
+            kwargs["user_agent"] = spec.user_agent
+        if spec.timezone_id:
+            kwargs["timezone_id"] = spec.timezone_id
+        context = await browser.new_context(**kwargs)
+        if spec.extra_headers:
+            await context.set_extra_http_headers(dict(spec.extra_headers))
+        if spec.blocked_resources:
+            blocked = spec.blocked_resources
+
+            async def route_handler(route):
+                if route.request.resource_type in blocked:
+                    return await route.abort()
+                return await route.continue_()
+
+            await context.route("**/*", route_handler)
+        return context
+
+    async def _acquire_context(self, spec: ContextSpec) -> _PooledContext:
+        async with self._lock:
+            slot, browser = await self._browser()
+            key = (slot, spec)
+            pooled = self._contexts.get(key)
+            if pooled is not None and pooled.pages_served >= self.pages_per_context and not pooled.in_use:
+                # Reciclagem: contexto velho acumula cookies/memória
+                self._contexts.pop(key, None)
+                await pooled.context.close()
+                pooled = None
+            if pooled is None:
+                pooled = _PooledContext(browser, await self._new_context(browser, spec))
+                self._contexts[key] = pooled
+            pooled.in_use += 1
+            pooled.pages_served += 1
+            return pooled
+
+    @asynccontextmanager
+    async def page(self, spec: ContextSpec) -> AsyncIterator[Page]:
+        """Página nova num contexto aquecido; deve ser usada dentro do loop do pool."""
+        pooled = await self._acquire_context(spec)
+        try:
+            async with self._sem:
+                page = await pooled.context.new_page()
+                try:
+                    yield page
+                finally:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+        finally:
+            pooled.in_use -= 1
+
+    async def _close(self) -> None:
+        for pooled in list(self._contexts.values()):
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def shutdown(self) -> None:
+        """Fecha navegadores, para e fecha o loop do pool e espera a thread (um novo uso recomeça tudo)."""
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), loop).result(30)
+            except Exception:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
+                loop.close()
+            atexit.unregister(self.shutdown)
+            self._loop = None
+            self._thread = None
+            self._playwright = None
+            self._browsers.clear()
+            self._contexts.clear()
+            self._sem = asyncio.Semaphore(self.max_pages)
+            self._lock = asyncio.Lock()
+
+
+_DEFAULT: Optional[BrowserPool] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_pool() -> BrowserPool:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = BrowserPool()
+        return _DEFAULT
@@ -0,0 +1,101 @@
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from typing import Optional, Union
+
+ENV_VAR = "SCRAPER_DEBUG"
+DEBUG_DIR = os.getenv("SCRAPER_DEBUG_DIR", "data/debug")
+# Retenção: no máximo N execuções e X bytes por fonte
+MAX_RUNS = int(os.getenv("SCRAPER_DEBUG_MAX_RUNS", "20"))
+MAX_BYTES = int(os.getenv("SCRAPER_DEBUG_MAX_MB", "200")) * 1024 * 1024
+
+
+def debug_enabled(flag: Optional[bool] = None) -> bool:
+    """Flag explícita da requisição vence; senão vale a variável SCRAPER_DEBUG."""
+    if flag is not None:
+        return flag
+    return os.getenv(ENV_VAR, "").lower() in {"1", "true", "yes", "on"}
+
+
+class _Writer:
+    """Thread única que grava os artefatos e aplica a retenção fora do caminho quente."""
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, data: Union[str, bytes]) -> None:
+        self._ensure_started()
+        self._queue.put((path, data))
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="debug-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            path, data = self._queue.get()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                mode = "wb" if isinstance(data, bytes) else "w"
+                with open(path, mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+                    f.write(data)
+                _prune(os.path.dirname(os.path.dirname(path)))
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        self._queue.join()
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _prune(source_dir: str) -> None:
+    runs = sorted(
+        os.path.join(source_dir, d) for d in os.listdir(source_dir)
+        if os.path.isdir(os.path.join(source_dir, d))
+    )
+    while len(runs) > MAX_RUNS:
+        shutil.rmtree(runs.pop(0), ignore_errors=True)
+    sizes = [_dir_size(r) for r in runs]
+    # Nunca apaga a execução mais recente (ainda pode estar sendo escrita)
+    while len(runs) > 1 and sum(sizes) > MAX_BYTES:
+        shutil.rmtree(runs.pop(0), ignore_errors=True)
+        sizes.pop(0)
+
+
+WRITER = _Writer()
+
+
+class DebugCapture:
+    """Artefatos de depuração de uma execução de scraper (desligado por padrão).
+
+    Cada execução grava num diretório próprio (`data/debug/<fonte>/<id>/`), então
+    requisições simultâneas não sobrescrevem os arquivos umas das outras.
+    """
+
+    def __init__(self, source: str, enabled: Optional[bool] = None, root: str = DEBUG_DIR):
+        self.enabled = debug_enabled(enabled)
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.dir = os.path.join(root, source, run_id)
+
+    def save(self, name: str, data: Union[str, bytes]) -> None:
+        if self.enabled:
+            WRITER.submit(os.path.join(self.dir, name), data)
@@ -1,26 +1,95 @@
-import requests
-from typing import Iterable, List
-from .base import BaseScraper
-from .models import Job
-
-class GetOnBoardScraper(BaseScraper):
-    def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
-        url = f"https://www.getonbrd.com/api/v0/search/jobs?query={requests.utils.quote(query)}"
-        try:
-            r = requests.get(url, timeout=30, headers={"Accept": "application/json"})
-            r.raise_for_status()
-            data = r.json()
-        except Exception:
-            data = {"data": []}
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from src.metrics import count_error, scrape
+from .base import AsyncBaseScraper
+from .http import get_with_retry
+from .models import Job, iso_timestamp
+
+API_URL = "https://www.getonbrd.com/api/v0/search/jobs"
+PER_PAGE = 50
+HEADERS = {"Accept": "application/json"}
+
+
+def parse_item(item: Dict[str, Any]) -> Job:
+    attrs = item.get("attributes", {})
+    return Job(
+        title=attrs.get("title") or "N/A",
+        company=(attrs.get("company", {}) or {}).get("name") or "N/A",
+        location=attrs.get("remote_modality") or attrs.get("remote_zone") or "Remoto/LatAm",
+        desc=attrs.get("description") or "",
+        source="getonboard",
+        url=attrs.get("external_url") or attrs.get("permalink"),
+        posted_at=iso_timestamp(attrs.get("published_at")),
+    )
+
+
+class GetOnBoardScraper(AsyncBaseScraper):
+    timeout = 60
+
+    def __init__(self, concurrency: int = 4, per_page: int = PER_PAGE):
+        # Máximo de páginas em voo ao mesmo tempo
+        self.concurrency = concurrency
+        self.per_page = per_page
+
+    async def _fetch_page(self, query: str, page: int, sem: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """JSON da página (None se falhou mesmo após as novas tentativas)."""
+        async with sem:
+            try:
+                r = await get_with_retry(
+                    API_URL,
+                    params={"query": query, "page": page, "per_page": self.per_page},
+                    headers=HEADERS,
+                    source="getonboard",
+                )
+                r.raise_for_status()
+                return r.json()
+            except Exception as e:
+                count_error("getonboard", e)
+                return None
+
+    @scrape("getonboard")
+    async def asearch(self, query: str, location: str = "Brasil", limit: int = 50) -> List[Job]:
+        sem = asyncio.Semaphore(self.concurrency)
         results: List[Job] = []
-        for item in data.get("data", [])[:limit]:
-            attrs = item.get("attributes", {})
-            results.append(Job(
-                title=attrs.get("title") or "N/A",
-                company=(attrs.get("company", {}) or {}).get("name") or "N/A",
-                location=attrs.get("remote_modality") or attrs.get("remote_zone") or "Remoto/LatAm",
-                desc=attrs.get("description") or "",
-                source="getonboard",
-                url=attrs.get("external_url") or attrs.get("permalink")
-            ))
+        seen: Set[str] = set()
+        total_pages: Optional[int] = None
+        # Tamanho real da página: o servidor pode devolver menos que `per_page` pedido
+        page_size = self.per_page
+        page = 1
+        while len(results) < limit and (total_pages is None or page <= total_pages):
+            # Todas as páginas que faltam para `limit` saem juntas (limitadas por
+            # `concurrency`); enquanto o total de páginas é desconhecido, só uma leva
+            needed = -(-(limit - len(results)) // page_size)
+            if total_pages is None:
+                needed = min(needed, self.concurrency)
+            pages = list(range(page, page + needed))
+            if total_pages is not None:
+                pages = [p for p in pages if p <= total_pages]
+            payloads = await asyncio.gather(*(self._fetch_page(query, p, sem) for p in pages))
+            last = False
+            # Os itens de todas as páginas baixadas entram, na ordem das páginas
+            for p, data in zip(pages, payloads):
+                if data is None:
+                    continue
+                meta = data.get("meta") or {}
+                if meta.get("total_pages") is not None:
+                    total_pages = int(meta["total_pages"])
+                items = data.get("data") or []
+                if p == 1 and items:
+                    page_size = min(page_size, len(items))
+                # Sem `total_pages`, a página vazia ou menor que a primeira é a última
+                if not items or (total_pages is None and len(items) < page_size):
+                    last = True
+                for item in items:
+                    job = parse_item(item)
+                    uid = job.url or f"{job.title}-{job.company}"
+                    if uid in seen:
+                        continue
+                    seen.add(uid)
+                    results.append(job)
+                    if len(results) >= limit:
+                        return results
+            if last or all(d is None for d in payloads):
+                break
+            page = pages[-1] + 1
         return results
@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import weakref
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
+import httpx
+from src.metrics import DOWNLOAD_BYTES, timed
+
+# Um cliente (pool keep-alive) por event loop: o pool do httpx não pode ser
+# compartilhado entre loops, e o CLI cria um loop novo a cada `search`.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+TIMEOUT = httpx.Timeout(30, connect=10)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado pelos scrapers no event loop atual."""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=LIMITS, timeout=TIMEOUT, follow_redirects=True)
+        _CLIENTS[loop] = client
+    return client
+
+
+async def close_client() -> None:
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# -- cache HTTP em disco -------------------------------------------------------
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """`ttl`: segundos servindo do disco sem rede; `stale`: janela extra em que a
+    cópia velha é servida na hora enquanto revalida em segundo plano."""
+    ttl: float
+    stale: float = 0
+
+
+# Frescor por fonte (sobrescreva com HTTP_CACHE_TTL_<FONTE>, em segundos)
+POLICIES: Dict[str, CachePolicy] = {
+    "remotive": CachePolicy(ttl=1800, stale=6 * 3600),
+    "getonboard": CachePolicy(ttl=900, stale=3600),
+}
+DEFAULT_POLICY = CachePolicy(ttl=300, stale=0)
+
+
+def policy_for(source: Optional[str]) -> CachePolicy:
+    policy = POLICIES.get(source or "", DEFAULT_POLICY)
+    ttl = os.getenv(f"HTTP_CACHE_TTL_{(source or '').upper()}")
+    return CachePolicy(float(ttl), policy.stale) if ttl else policy
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+    # "fresh" (disco), "stale" (disco, revalidando), "revalidated" (304) ou "network"
+    origin: str = "network"
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(f"HTTP {self.status_code}", request=None, response=None)
+
+
+class HttpCache:
+    """Respostas 200 em disco (`<hash>.body` + `<hash>.json`), com validadores."""
+
+    def __init__(self, root: str = "data/http_cache"):
+        self.root = root
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return hashlib.sha1(json.dumps([url, items]).encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def load(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(meta["status"], body, meta.get("headers", {}), meta["stored_at"], "fresh")
+
+    def store(self, key: str, resp: CachedResponse) -> None:
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # Corpo antes dos metadados, ambos por rename atômico: leitores nunca
+        # veem metadados apontando para um corpo pela metade
+        for path, data, mode in (
+            (body_path, resp.content, "wb"),
+            (meta_path, json.dumps({"status": resp.status_code, "headers": resp.headers, "stored_at": resp.stored_at}), "w"),
+        ):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def touch(self, key: str, resp: CachedResponse) -> None:
+        """Revalidação com 304: só renova `stored_at` (e validadores novos)."""
+        meta_path, _ = self._paths(key)
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"status": resp.status_code, "headers": resp.headers, "stored_at": resp.stored_at}, f)
+        os.replace(tmp, meta_path)
+
+
+CACHE = HttpCache(os.getenv("HTTP_CACHE_DIR", "data/http_cache"))
+# Cabeçalhos guardados junto do corpo
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+# Revalidações em segundo plano em voo (evita duplicar e o GC das tasks)
+_REVALIDATING: Set[str] = set()
+_BACKGROUND: Set[asyncio.Task] = set()
+# Respostas transitórias: valem nova tentativa e, com cópia em disco, servir a cópia
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("HTTP_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+async def _fetch(
+    url: str, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, str]], source: Optional[str]
+) -> httpx.Response:
+    """GET pela rede, medido em `radar_stage_duration_seconds{stage="fetch"}` e `radar_download_bytes`."""
+    with timed("fetch", source or ""):
+        r = await get_client().get(url, params=params, headers=headers)
+    DOWNLOAD_BYTES.observe(len(r.content), source=source or "", origin="network")
+    return r
+
+
+async def _revalidate(
+    key: str, url: str, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, str]],
+    entry: Optional[CachedResponse], source: Optional[str] = None,
+) -> CachedResponse:
+    req_headers = dict(headers or {})
+    if entry is not None:
+        if entry.headers.get("etag"):
+            req_headers["If-None-Match"] = entry.headers["etag"]
+        if entry.headers.get("last-modified"):
+            req_headers["If-Modified-Since"] = entry.headers["last-modified"]
+    r = await _fetch(url, params, req_headers, source)
+    now = time.time()
+    if r.status_code == 304 and entry is not None:
+        kept = dict(entry.headers)
+        kept.update({h: r.headers[h] for h in _KEPT_HEADERS if h in r.headers})
+        fresh = CachedResponse(entry.status_code, entry.content, kept, now, "revalidated")
+        await asyncio.to_thread(CACHE.touch, key, fresh)
+        return fresh
+    resp = CachedResponse(
+        r.status_code, r.content, {h: r.headers[h] for h in _KEPT_HEADERS + ("retry-after",) if h in r.headers},
+        now, "network",
+    )
+    if r.status_code == 200:
+        if "last-modified" not in resp.headers and "etag" not in resp.headers:
+            # Sem validadores do servidor: usa a data da cópia para If-Modified-Since
+            resp.headers["last-modified"] = formatdate(now, usegmt=True)
+        await asyncio.to_thread(CACHE.store, key, resp)
+    return resp
+
+
+async def _background_revalidate(key, url, params, headers, entry, source) -> None:
+    try:
+        await _revalidate(key, url, params, headers, entry, source)
+    except Exception:
+        pass
+    finally:
+        _REVALIDATING.discard(key)
+
+
+async def cached_get(
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    source: Optional[str] = None,
+) -> CachedResponse:
+    """GET pelo cliente compartilhado com cache em disco e revalidação condicional.
+
+    Dentro do `ttl` da fonte não há rede; até `ttl + stale` a cópia é servida e
+    revalidada em segundo plano; depois disso a requisição é condicional
+    (ETag/Last-Modified), custando só um 304 se nada mudou. Se a rede falhar,
+    ou a origem responder um erro transitório (`RETRY_STATUSES`), e houver
+    cópia, ela é servida mesmo vencida.
+    """
+    if not _cache_enabled():
+        r = await _fetch(url, params, headers, source)
+        return CachedResponse(r.status_code, r.content, dict(r.headers), time.time(), "network")
+
+    policy = policy_for(source)
+    key = HttpCache.key(url, params)
+    entry = await asyncio.to_thread(CACHE.load, key)
+    if entry is not None:
+        age = time.time() - entry.stored_at
+        if age < policy.ttl:
+            return entry
+        if age < policy.ttl + policy.stale:
+            if key not in _REVALIDATING:
+                _REVALIDATING.add(key)
+                task = asyncio.create_task(_background_revalidate(key, url, params, headers, entry, source))
+                _BACKGROUND.add(task)
+                task.add_done_callback(_BACKGROUND.discard)
+            entry.origin = "stale"
+            return entry
+    try:
+        resp = await _revalidate(key, url, params, headers, entry, source)
+    except httpx.HTTPError:
+        if entry is None:
+            raise
+        entry.origin = "stale"
+        return entry
+    if entry is not None and resp.status_code in RETRY_STATUSES:
+        entry.origin = "stale"
+        return entry
+    return resp
+
+
+def _retry_after(resp: CachedResponse) -> Optional[float]:
+    value = resp.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def get_with_retry(
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    source: Optional[str] = None,
+    attempts: int = 4,
+    backoff: float = 0.5,
+) -> CachedResponse:
+    """`cached_get` com novas tentativas em 429/5xx e erros de rede.
+
+    Espera `backoff * 2^n` (com jitter) entre tentativas, ou o `Retry-After`
+    do servidor quando vier.
+    """
+    attempt = 0
+    while True:
+        try:
+            resp = await cached_get(url, params=params, headers=headers, source=source)
+            if resp.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                return resp
+            delay = _retry_after(resp)
+        except httpx.TransportError:
+            if attempt + 1 >= attempts:
+                raise
+            delay = None
+        await asyncio.sleep((delay or backoff * 2 ** attempt) * random.uniform(1.0, 1.25))
+        attempt += 1
@@ -1,93 +1,136 @@
-from playwright.sync_api import sync_playwright
+import asyncio
 from bs4 import BeautifulSoup
-from typing import Iterable, List
-from .base import BaseScraper
+from typing import Iterable, List, Optional
+from src.metrics import DOWNLOAD_BYTES, count_error, scrape, timed
+from .base import AsyncBaseScraper
+from .browser_pool import BrowserPool, ContextSpec, default_pool
+from .debug import DebugCapture
 from .models import Job
 
-class IndeedScraper(BaseScraper):
-    def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
-        q = query.replace(" ", "+")
-        base = f"https://br.indeed.com/jobs?q={q}&l={location}"
-        results: List[Job] = []
+PAGE_SIZE = 10
+# Páginas de resultado buscadas em paralelo por rodada
+PAGES_PER_ROUND = 3
 
-        def parse_cards(html: str) -> List[Job]:
-            out: List[Job] = []
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select("a.tapItem"):
-                title = card.select_one("h2.jobTitle")
-                company = card.select_one("span.companyName")
-                location_el = card.select_one("div.companyLocation")
-                desc = card.select_one("div.job-snippet")
-                href = card.get("href")
-                out.append(Job(
-                    title=title.get_text(strip=True) if title else "N/A",
-                    company=company.get_text(strip=True) if company else "N/A",
-                    location=location_el.get_text(strip=True) if location_el else "N/A",
-                    desc=desc.get_text(" ", strip=True) if desc else "",
-                    source="indeed",
-                    url=("https://br.indeed.com" + href) if href and href.startswith("/") else href
-                ))
-            return out
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/124.0.0.0 Safari/537.36"
-                ),
-                locale="pt-BR",
-                timezone_id="America/Sao_Paulo",
-            )
-            context.set_extra_http_headers({
-                "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
-                "DNT": "1",
-            })
-
-            def route_handler(route):
-                rt = route.request.resource_type
-                if rt in {"image", "font", "stylesheet"}:
-                    return route.abort()
-                return route.continue_()
-
-            context.route("**/*", route_handler)
-            page = context.new_page()
-
-            start = 0
-            while len(results) < limit:
-                url = base if start == 0 else f"{base}&start={start}"
-                page.goto(url, timeout=60000, wait_until="domcontentloaded")
+CONTEXT = ContextSpec(
+    user_agent=(
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    locale="pt-BR",
+    timezone_id="America/Sao_Paulo",
+    extra_headers=(
+        ("Accept-Language", "pt-BR,pt;q=0.9,en;q=0.8"),
+        ("DNT", "1"),
+    ),
+    blocked_resources=frozenset({"image", "font", "stylesheet"}),
+)
+
+
+def parse_cards(html: str) -> List[Job]:
+    out: List[Job] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for card in soup.select("a.tapItem"):
+        title = card.select_one("h2.jobTitle")
+        company = card.select_one("span.companyName")
+        location_el = card.select_one("div.companyLocation")
+        desc = card.select_one("div.job-snippet")
+        href = card.get("href")
+        out.append(Job(
+            title=title.get_text(strip=True) if title else "N/A",
+            company=company.get_text(strip=True) if company else "N/A",
+            location=location_el.get_text(strip=True) if location_el else "N/A",
+            desc=desc.get_text(" ", strip=True) if desc else "",
+            source="indeed",
+            url=("https://br.indeed.com" + href) if href and href.startswith("/") else href
+        ))
+    return out
+
+
+class IndeedScraper(AsyncBaseScraper):
+    supports_debug = True
+
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        self._pool = pool
+
+    @property
+    def pool(self) -> BrowserPool:
+        return self._pool or default_pool()
+
+    async def _fetch_page(self, url: str, start: int, capture: DebugCapture) -> List[Job]:
+        async with self.pool.page(CONTEXT) as page:
+            with timed("render", "indeed"):
+                await page.goto(url, timeout=60000, wait_until="domcontentloaded")
                 try:
-                    page.wait_for_load_state("networkidle", timeout=8000)
+                    await page.wait_for_load_state("networkidle", timeout=8000)
                 except Exception:
                     pass
 
                 try:
-                    page.locator("#onetrust-accept-btn-handler").click(timeout=2000)
+                    await page.locator("#onetrust-accept-btn-handler").click(timeout=2000)
                 except Exception:
                     pass
 
                 try:
-                    page.wait_for_selector("a.tapItem", timeout=8000)
+                    await page.wait_for_selector("a.tapItem", timeout=8000)
                 except Exception:
-                    page.wait_for_timeout(2000)
+                    await page.wait_for_timeout(2000)
 
-                html = page.content()
-                try:
-                    with open(f"data/debug_indeed_{start}.html", "w", encoding="utf-8") as f:
-                        f.write(html)
-                    page.screenshot(path=f"data/debug_indeed_{start}.png", full_page=True)
-                except Exception:
-                    pass
-                page_jobs = parse_cards(html)
-                if not page_jobs and start > 0:
+                html = await page.content()
+            DOWNLOAD_BYTES.observe(len(html.encode("utf-8")), source="indeed", origin="browser")
+            with timed("parse", "indeed"):
+                jobs = parse_cards(html)
+            if capture.enabled:
+                capture.save(f"page_{start}.html", html)
+                # Screenshot só quando o parse falhou (render de página inteira é caro)
+                if not jobs:
+                    try:
+                        capture.save(f"page_{start}.png", await page.screenshot(full_page=True))
+                    except Exception:
+                        pass
+        return jobs
+
+    async def _search(self, query: str, location: str, limit: int, debug: Optional[bool]) -> List[Job]:
+        capture = DebugCapture("indeed", debug)
+        q = query.replace(" ", "+")
+        base = f"https://br.indeed.com/jobs?q={q}&l={location}"
+        results: List[Job] = []
+
+        start = 0
+        while len(results) < limit:
+            # Busca as próximas páginas em paralelo, cada uma numa aba própria
+            missing = -(-(limit - len(results)) // PAGE_SIZE)
+            starts = [start + i * PAGE_SIZE for i in range(min(missing, PAGES_PER_ROUND))]
+            pages = await asyncio.gather(
+                *(self._fetch_page(base if s == 0 else f"{base}&start={s}", s, capture) for s in starts),
+                return_exceptions=True,
+            )
+            exhausted = False
+            for s, page_jobs in zip(starts, pages):
+                if isinstance(page_jobs, BaseException):
+                    count_error("indeed", page_jobs)
+                    page_jobs = []
+                if not page_jobs and s > 0:
+                    exhausted = True
                     break
                 for job in page_jobs:
                     results.append(job)
                     if len(results) >= limit:
                         break
+                if len(results) >= limit:
+                    break
+            if exhausted:
+                break
+            start = starts[-1] + PAGE_SIZE
+        return results
 
-                start += 10
+    @scrape("indeed")
+    async def asearch(
+        self, query: str, location: str = "Brasil", limit: int = 50, debug: Optional[bool] = None
+    ) -> List[Job]:
+        return await self.pool.arun(self._search(query, location, limit, debug))
 
-            browser.close()
-        return results
+    @scrape("indeed")
+    def search(
+        self, query: str, location: str = "Brasil", limit: int = 50, debug: Optional[bool] = None
+    ) -> Iterable[Job]:
+        return self.pool.run(self._search(query, location, limit, debug))
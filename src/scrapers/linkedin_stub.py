@@ -1,7 +1,9 @@
 from .base import BaseScraper
 from .models import Job
 from typing import Iterable
+from src.metrics import scrape
 
 class LinkedInScraper(BaseScraper):
+    @scrape("linkedin")
     def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
         return []
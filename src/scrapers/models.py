@@ -1,7 +1,12 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Union, overload
 
-@dataclass
+if TYPE_CHECKING:
+    import pandas as pd
+
+@dataclass(slots=True)
 class Job:
     title: str
     company: str
@@ -9,5 +14,127 @@ class Job:
     desc: str
     source: str
     url: Optional[str] = None
+    # Descrição em texto plano e hash do conteúdo (preenchidos na ingestão)
+    desc_text: str = ""
+    desc_hash: str = ""
+    # ISO 8601 em UTC: primeira coleta (carimbada no armazenamento) e publicação, se a fonte informar
+    collected_at: str = ""
+    posted_at: str = ""
 
 JobList = List[Job]
+
+FIELDS = tuple(f.name for f in fields(Job))
+# Colunas com poucos valores distintos: strings internadas, uma cópia por valor
+_INTERNED = ("source", "location")
+
+
+def iso_timestamp(value: Any) -> str:
+    """Normaliza data/hora da fonte (epoch, ISO 8601 ou `datetime`) para ISO em UTC; "" se inválida."""
+    if value is None or value == "":
+        return ""
+    try:
+        if isinstance(value, datetime):
+            dt = value
+        elif isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(value, tz=timezone.utc)
+        else:
+            dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def utc_now() -> str:
+    return iso_timestamp(datetime.now(timezone.utc))
+
+
+class JobBatch:
+    """Lote de vagas em colunas paralelas (uma lista por campo de `Job`).
+
+    Guarda `source`/`location` internados e evita um objeto por vaga enquanto o
+    lote só é repassado, convertido em DataFrame ou em linhas de resposta. Itera
+    como uma sequência de `Job`, então serve onde se espera `Iterable[Job]`.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None):
+        self.columns: Dict[str, List[Any]] = columns if columns is not None else {name: [] for name in FIELDS}
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job]) -> "JobBatch":
+        if isinstance(jobs, JobBatch):
+            return jobs
+        batch = cls()
+        batch.extend(jobs)
+        return batch
+
+    def append(self, job: Job) -> None:
+        cols = self.columns
+        for name in FIELDS:
+            value = getattr(job, name)
+            if name in _INTERNED and value:
+                value = sys.intern(value)
+            cols[name].append(value)
+
+    def extend(self, jobs: Iterable[Job]) -> None:
+        if isinstance(jobs, JobBatch):
+            for name, col in self.columns.items():
+                col.extend(jobs.columns[name])
+            return
+        for job in jobs:
+            self.append(job)
+
+    def __len__(self) -> int:
+        return len(self.columns["title"])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @overload
+    def __getitem__(self, i: int) -> Job: ...
+    @overload
+    def __getitem__(self, i: slice) -> "JobBatch": ...
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return JobBatch({name: col[i] for name, col in self.columns.items()})
+        return Job(*(self.columns[name][i] for name in FIELDS))
+
+    def __iter__(self) -> Iterator[Job]:
+        for values in zip(*(self.columns[name] for name in FIELDS)):
+            yield Job(*values)
+
+    def normalize(self) -> "JobBatch":
+        """Preenche `desc_text`/`desc_hash` nas colunas (como `normalize_job`, uma vez só)."""
+        from src.skills.text import normalize_desc
+        cols = self.columns
+        texts, hashes = cols["desc_text"], cols["desc_hash"]
+        for i, desc in enumerate(cols["desc"]):
+            texts[i], hashes[i] = normalize_desc(desc, texts[i], hashes[i])
+        return self
+
+    def texts(self) -> List[str]:
+        """Descrições em texto plano das vagas que têm descrição."""
+        self.normalize()
+        return [t for d, t in zip(self.columns["desc"], self.columns["desc_text"]) if d]
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> "pd.DataFrame":
+        """DataFrame direto das colunas (sem passar por um dict por vaga)."""
+        import pandas as pd
+        names = list(columns) if columns is not None else list(FIELDS)
+        return pd.DataFrame({name: self.columns[name] for name in names})
+
+    def rows(self, description_chars: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Vagas no formato de resposta da API; `description_chars` omite (0) ou trunca a descrição."""
+        cols = self.columns
+        desc = cols["desc"]
+        if description_chars is not None:
+            desc = [(d or "")[:description_chars] for d in desc]
+        keys = ["title", "company", "location", "description", "source", "url"]
+        values = [cols["title"], cols["company"], cols["location"], desc, cols["source"], cols["url"]]
+        if description_chars == 0:
+            del keys[3], values[3]
+        return [dict(zip(keys, row)) for row in zip(*values)]
@@ -0,0 +1,169 @@
+"""Registro de scrapers resolvidos sob demanda pelo nome.
+
+Só metadados estáticos (`ScraperInfo`) ficam em memória na subida: o módulo de
+cada fonte — e suas dependências pesadas, como Playwright e BeautifulSoup no
+Indeed — é importado e instanciado no primeiro acesso, e a instância é reusada.
+
+Plugins entram pelo grupo de entry points `radar_vagas.scrapers`, apontando
+para a classe (ou fábrica sem argumentos) do scraper:
+
+    [project.entry-points."radar_vagas.scrapers"]
+    catho = "radar_catho:CathoScraper"
+"""
+import importlib
+import threading
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterable, Iterator, MutableMapping, Optional
+from .base import BaseScraper
+
+ENTRY_POINT_GROUP = "radar_vagas.scrapers"
+
+
+@dataclass(frozen=True)
+class ScraperInfo:
+    name: str
+    # "pacote.modulo:Classe" (classe ou fábrica sem argumentos)
+    target: str
+    description: str = ""
+    # Usa navegador (Playwright): mais lento e sujeito a bloqueio
+    requires_browser: bool = False
+    # Vem de um entry point, não do projeto
+    plugin: bool = False
+
+
+BUILTINS = (
+    ScraperInfo("indeed", "src.scrapers.indeed:IndeedScraper", "Indeed.com - Portal de empregos", requires_browser=True),
+    ScraperInfo("linkedin", "src.scrapers.linkedin_stub:LinkedInScraper", "LinkedIn Jobs - Rede profissional"),
+    ScraperInfo("glassdoor", "src.scrapers.glassdoor_stub:GlassdoorScraper", "Glassdoor - Avaliações e vagas"),
+    ScraperInfo("remotive", "src.scrapers.remotive:RemotiveScraper", "Remotive.io - Vagas remotas"),
+    ScraperInfo("getonboard", "src.scrapers.getonboard:GetOnBoardScraper", "GetOnBoard - Vagas tech"),
+)
+
+
+class ScraperUnavailable(RuntimeError):
+    """A fonte existe no registro, mas o módulo (ou uma dependência dele) não carregou."""
+
+
+def _load_target(target: str) -> Callable[[], BaseScraper]:
+    module, _, attr = target.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _plugin_infos() -> Dict[str, ScraperInfo]:
+    infos = {}
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        summary = ""
+        dist = getattr(ep, "dist", None)
+        if dist is not None:
+            summary = dist.metadata.get("Summary") or dist.metadata.get("Name") or ""
+        infos[ep.name] = ScraperInfo(ep.name, ep.value, summary, plugin=True)
+    return infos
+
+
+class ScraperRegistry(MutableMapping[str, BaseScraper]):
+    """Mapa nome -> scraper que só importa/instancia a fonte quando ela é usada.
+
+    Listar nomes, testar `in` e ler `info()` não importa nenhum scraper.
+    Atribuir (`registry["x"] = scraper`) registra uma instância pronta.
+    """
+
+    def __init__(self, builtins: Iterable[ScraperInfo] = BUILTINS, plugins: bool = True):
+        self._infos: Dict[str, ScraperInfo] = {info.name: info for info in builtins}
+        self._instances: Dict[str, BaseScraper] = {}
+        self._lock = threading.RLock()
+        # Entry points são lidos na primeira consulta (varrer os metadados também custa)
+        self._discovered = not plugins
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            for name, info in _plugin_infos().items():
+                # Fontes do projeto têm precedência sobre plugins com o mesmo nome
+                self._infos.setdefault(name, info)
+            self._discovered = True
+
+    def register(self, info: ScraperInfo) -> None:
+        with self._lock:
+            self._infos[info.name] = info
+            self._instances.pop(info.name, None)
+
+    def info(self, name: str) -> ScraperInfo:
+        self._discover()
+        return self._infos[name]
+
+    def infos(self) -> Dict[str, ScraperInfo]:
+        self._discover()
+        return dict(self._infos)
+
+    def descriptions(self) -> Dict[str, str]:
+        return {name: info.description for name, info in self.infos().items()}
+
+    def loaded(self) -> Dict[str, BaseScraper]:
+        """Scrapers já instanciados (os demais nem foram importados)."""
+        return dict(self._instances)
+
+    def __getitem__(self, name: str) -> BaseScraper:
+        scraper = self._instances.get(name)
+        if scraper is not None:
+            return scraper
+        info = self.info(name)
+        with self._lock:
+            scraper = self._instances.get(name)
+            if scraper is None:
+                try:
+                    scraper = _load_target(info.target)()
+                except ImportError as e:
+                    raise ScraperUnavailable(f"Fonte '{name}' indisponível: {e}") from e
+                self._instances[name] = scraper
+        return scraper
+
+    def __setitem__(self, name: str, scraper: BaseScraper) -> None:
+        with self._lock:
+            if name not in self._infos:
+                self._infos[name] = ScraperInfo(name, f"{type(scraper).__module__}:{type(scraper).__qualname__}")
+            self._instances[name] = scraper
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._infos[name]
+            self._instances.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        self._discover()
+        return name in self._infos
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._infos))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._infos)
+
+    def subset(self, names: Iterable[str]) -> "ScraperRegistry":
+        """Só as fontes pedidas (sem repetir), compartilhando as instâncias deste registro."""
+        self._discover()
+        sub = ScraperRegistry(builtins=(), plugins=False)
+        sub._infos = {name: self._infos[name] for name in dict.fromkeys(names)}
+        sub._instances = self._instances
+        sub._lock = self._lock
+        return sub
+
+
+_DEFAULT: Optional[ScraperRegistry] = None
+
+
+def default_registry() -> ScraperRegistry:
+    """Registro do processo (fontes do projeto + plugins), criado no primeiro uso."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = ScraperRegistry()
+    return _DEFAULT
+
@@ -1,12 +1,24 @@
-import requests
-from typing import Iterable, List, Set
-from .base import BaseScraper
-from .models import Job
+import asyncio
+from typing import Any, Dict, List, Set
+from src.metrics import count_error, scrape
+from .base import AsyncBaseScraper
+from .http import cached_get
+from .models import Job, iso_timestamp
 
+API_URL = "https://remotive.com/api/remote-jobs"
 
-class RemotiveScraper(BaseScraper):
-    def search(self, query: str, location: str = "Brasil", limit: int = 50) -> Iterable[Job]:
-        synonyms = [
+
+class RemotiveScraper(AsyncBaseScraper):
+    timeout = 90
+
+    def __init__(self, concurrency: int = 4):
+        # Máximo de consultas de sinônimos em voo ao mesmo tempo
+        self.concurrency = concurrency
+
+    @staticmethod
+    def synonyms(query: str) -> List[str]:
+        query = " ".join(query.lower().split())
+        candidates = [
             query,
             query.replace("front end", "frontend"),
             query.replace("front-end", "frontend"),
@@ -14,31 +26,46 @@ class RemotiveScraper(BaseScraper):
             "react",
             "javascript",
         ]
-        seen: Set[str] = set()
-        jobs: List[Job] = []
-        for q in synonyms:
-            if len(jobs) >= limit:
-                break
-            url = f"https://remotive.com/api/remote-jobs?search={requests.utils.quote(q)}"
+        # Remove repetidos (ex.: query == "frontend") antes de qualquer requisição
+        return list(dict.fromkeys(q for q in candidates if q))
+
+    async def _fetch(self, q: str, sem: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        async with sem:
             try:
-                r = requests.get(url, timeout=30)
+                # Cache em disco: repetir a coleta dentro do TTL não usa a rede
+                r = await cached_get(API_URL, params={"search": q}, source="remotive")
                 r.raise_for_status()
-                data = r.json().get("jobs", [])
-            except Exception:
-                data = []
-            for j in data:
-                if len(jobs) >= limit:
-                    break
-                uid = j.get("url") or f"{j.get('title')}-{j.get('company_name')}"
-                if not uid or uid in seen:
-                    continue
-                seen.add(uid)
-                jobs.append(Job(
-                    title=j.get("title", "N/A"),
-                    company=j.get("company_name", "N/A"),
-                    location=j.get("candidate_required_location", "Remoto"),
-                    desc=j.get("description", ""),
-                    source="remotive",
-                    url=j.get("url")
-                ))
+                return r.json().get("jobs", [])
+            except Exception as e:
+                count_error("remotive", e)
+                return []
+
+    @scrape("remotive")
+    async def asearch(self, query: str, location: str = "Brasil", limit: int = 50) -> List[Job]:
+        sem = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.ensure_future(self._fetch(q, sem)) for q in self.synonyms(query)]
+        seen: Set[str] = set()
+        jobs: List[Job] = []
+        try:
+            # Mescla conforme as respostas chegam e para ao atingir `limit`
+            for fut in asyncio.as_completed(tasks):
+                for j in await fut:
+                    uid = j.get("url") or f"{j.get('title')}-{j.get('company_name')}"
+                    if not uid or uid in seen:
+                        continue
+                    seen.add(uid)
+                    jobs.append(Job(
+                        title=j.get("title", "N/A"),
+                        company=j.get("company_name", "N/A"),
+                        location=j.get("candidate_required_location", "Remoto"),
+                        desc=j.get("description", ""),
+                        source="remotive",
+                        url=j.get("url"),
+                        posted_at=iso_timestamp(j.get("publication_date")),
+                    ))
+                    if len(jobs) >= limit:
+                        return jobs
+        finally:
+            for t in tasks:
+                t.cancel()
         return jobs
@@ -0,0 +1,70 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Mapping, Optional, Tuple
+from src.metrics import count_error
+from .base import AsyncBaseScraper, BaseScraper
+from .models import JobBatch
+
+# Executor compartilhado e limitado para scrapers só síncronos (ex.: Indeed/Playwright)
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCRAPER_THREADS", "4")),
+    thread_name_prefix="scraper",
+)
+
+
+async def run_search(
+    scraper: BaseScraper, query: str, location: str, limit: int, debug: Optional[bool] = None
+) -> JobBatch:
+    """Executa a busca sem bloquear o event loop; as vagas voltam em colunas."""
+    kwargs = {"query": query, "location": location, "limit": limit}
+    if debug is not None and scraper.supports_debug:
+        kwargs["debug"] = debug
+    if isinstance(scraper, AsyncBaseScraper):
+        return JobBatch.from_jobs(await scraper.asearch(**kwargs))
+    loop = asyncio.get_running_loop()
+    return JobBatch.from_jobs(await loop.run_in_executor(EXECUTOR, partial(scraper.search, **kwargs)))
+
+
+async def search_with_timeout(
+    scraper: BaseScraper,
+    query: str,
+    location: str,
+    limit: int,
+    timeout: Optional[float] = None,
+    debug: Optional[bool] = None,
+) -> JobBatch:
+    return await asyncio.wait_for(
+        run_search(scraper, query, location, limit, debug),
+        timeout=scraper.timeout if timeout is None else timeout,
+    )
+
+
+async def iter_sources(
+    scrapers: Mapping[str, BaseScraper], query: str, location: str, limit: int
+) -> AsyncIterator[Tuple[str, JobBatch, Optional[BaseException]]]:
+    """Roda as fontes em paralelo e entrega (fonte, vagas, erro) na ordem em que terminam.
+
+    Cada scraper é obtido de `scrapers` dentro da própria tarefa: com um
+    `ScraperRegistry`, uma fonte que não carrega vira erro só dela.
+    """
+
+    async def one(name: str):
+        try:
+            scraper = scrapers[name]
+            return name, await search_with_timeout(scraper, query, location, limit), None
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"timeout após {scraper.timeout:.0f}s")
+            count_error(name, error)
+            return name, JobBatch(), error
+        except Exception as e:
+            return name, JobBatch(), e
+
+    tasks = [asyncio.ensure_future(one(name)) for name in scrapers]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for t in tasks:
+            t.cancel()
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from .matcher import SkillMatcher
+from .matrix import SkillMatrix, top_from_totals
+
+# Chave de faceta: () global, ("source", s), ("location", l), ("source_location", s, l)
+FacetKey = Tuple[str, ...]
+
+# Artefato gravado na coleta e lido pelo dashboard
+AGGREGATES_PATH = "data/aggregates.json"
+ARTIFACT_VERSION = 1
+
+
+def facet_keys(source: str, location: str) -> List[FacetKey]:
+    s, l = (source or "").lower(), (location or "").lower()
+    return [(), ("source", s), ("location", l), ("source_location", s, l)]
+
+
+class SkillAggregates:
+    """Contagens de skills agregadas por faceta, atualizadas por delta.
+
+    Cada faceta guarda um vetor de contagens indexado pelos ids do matcher, então
+    o top-n de qualquer faceta sai em O(skills), sem reler descrições.
+
+    `apply` altera os vetores no lugar sob `_lock`; as leituras tomam o mesmo
+    lock e devolvem cópias, então nunca veem um delta pela metade.
+    """
+
+    def __init__(self, matcher: SkillMatcher, revision: Hashable = None):
+        self.matcher = matcher
+        self.revision = revision
+        self._counts: Dict[FacetKey, np.ndarray] = {}
+        # Vagas por faceta (inclui as sem nenhuma skill)
+        self._jobs: Dict[FacetKey, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: SkillMatrix, sources: Sequence[str], locations: Sequence[str], revision: Hashable = None
+    ) -> "SkillAggregates":
+        agg = cls(matrix.matcher, revision)
+        agg._counts[()] = matrix.totals()
+        agg._jobs[()] = matrix.n_rows
+        rows = np.repeat(np.arange(matrix.n_rows), np.diff(matrix.indptr))
+        src_keys, src_codes = np.unique(np.asarray([s.lower() for s in sources], dtype=object), return_inverse=True)
+        loc_keys, loc_codes = np.unique(np.asarray([l.lower() for l in locations], dtype=object), return_inverse=True)
+        pair_codes = src_codes.astype(np.int64) * max(len(loc_keys), 1) + loc_codes
+        pair_keys, pair_codes = np.unique(pair_codes, return_inverse=True)
+        groupings = [
+            ([("source", s) for s in src_keys], src_codes),
+            ([("location", l) for l in loc_keys], loc_codes),
+            (
+                [("source_location", src_keys[p // max(len(loc_keys), 1)], loc_keys[p % max(len(loc_keys), 1)])
+                 for p in pair_keys],
+                pair_codes,
+            ),
+        ]
+        n_skills = matrix.n_skills
+        for keys, codes in groupings:
+            # Uma única bincount por agrupamento: (grupo, skill) achatado
+            flat = codes[rows] * n_skills + matrix.indices
+            totals = np.bincount(flat, weights=matrix.data, minlength=len(keys) * n_skills)
+            totals = totals.astype(np.int64).reshape(len(keys), n_skills)
+            for key, vec, n_jobs in zip(keys, totals, np.bincount(codes, minlength=len(keys))):
+                agg._counts[key] = vec
+                agg._jobs[key] = int(n_jobs)
+        return agg
+
+    def apply(self, counts: Mapping[int, int], source: str, location: str, sign: int = 1) -> None:
+        """Soma (sign=1) ou subtrai (sign=-1) as contagens de uma vaga."""
+        with self._lock:
+            self._apply(counts, source, location, sign)
+
+    def apply_changes(self, changes: Iterable[Tuple[Optional[tuple], Optional[tuple]]], revision: Hashable) -> None:
+        """Aplica os pares (antes, depois) de `UpsertResult.changes` e a nova revisão de uma vez só.
+
+        As skills são contadas fora do lock; leitores veem o lote inteiro ou nada dele.
+        """
+        deltas = []
+        for before, after in changes:
+            if before is not None:
+                deltas.append((self.matcher.count_ids(before[2]), before[0], before[1], -1))
+            if after is not None:
+                deltas.append((self.matcher.count_ids(after[2]), after[0], after[1], 1))
+        with self._lock:
+            for delta in deltas:
+                self._apply(*delta)
+            self.revision = revision
+
+    def _apply(self, counts: Mapping[int, int], source: str, location: str, sign: int) -> None:
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        vals = np.fromiter(counts.values(), dtype=np.int64, count=len(counts)) * sign
+        for key in facet_keys(source, location):
+            self._jobs[key] = self._jobs.get(key, 0) + sign
+            if not counts:
+                continue
+            vec = self._counts.get(key)
+            if vec is None:
+                vec = self._counts[key] = np.zeros(len(self.matcher.skills), dtype=np.int64)
+            np.add.at(vec, ids, vals)
+
+    @staticmethod
+    def _key(source: Optional[str], location: Optional[str]) -> FacetKey:
+        if source and location:
+            return ("source_location", source.lower(), location.lower())
+        if source:
+            return ("source", source.lower())
+        if location:
+            return ("location", location.lower())
+        return ()
+
+    def totals(self, source: Optional[str] = None, location: Optional[str] = None) -> np.ndarray:
+        with self._lock:
+            vec = self._counts.get(self._key(source, location))
+            return vec.copy() if vec is not None else np.zeros(len(self.matcher.skills), dtype=np.int64)
+
+    def jobs(self, source: Optional[str] = None, location: Optional[str] = None) -> int:
+        """Quantidade de vagas na faceta."""
+        with self._lock:
+            return self._jobs.get(self._key(source, location), 0)
+
+    def top(self, n: int = 10, source: Optional[str] = None, location: Optional[str] = None):
+        return top_from_totals(self.totals(source, location), self.matcher, n)
+
+    def counters(self, source: Optional[str] = None, location: Optional[str] = None) -> Dict[str, Counter]:
+        """Mesmo formato de `aggregate_descriptions` para a faceta pedida."""
+        out: Dict[str, Counter] = {cat: Counter() for cat in self.matcher.categories}
+        vec = self.totals(source, location)
+        for sid in np.flatnonzero(vec):
+            cat, name = self.matcher.skills[sid]
+            out[cat][name] = int(vec[sid])
+        return out
+
+    def facets(self, kind: str) -> List[FacetKey]:
+        with self._lock:
+            keys = [k for k in self._counts if k and k[0] == kind]
+        return sorted(keys)
+
+    def combine(self, keys: Iterable[FacetKey]) -> Tuple[np.ndarray, int]:
+        """Contagens e vagas somadas de várias facetas disjuntas (ex.: localizações que casam com um filtro)."""
+        totals = np.zeros(len(self.matcher.skills), dtype=np.int64)
+        jobs = 0
+        with self._lock:
+            for key in keys:
+                vec = self._counts.get(key)
+                if vec is not None:
+                    totals += vec
+                jobs += self._jobs.get(key, 0)
+        return totals, jobs
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma serializável (contagens esparsas por faceta)."""
+        with self._lock:
+            facets = []
+            for key, vec in self._counts.items():
+                ids = np.flatnonzero(vec)
+                facets.append({
+                    "key": list(key),
+                    "jobs": self._jobs.get(key, 0),
+                    "ids": ids.tolist(),
+                    "counts": vec[ids].tolist(),
+                })
+        return {
+            "version": ARTIFACT_VERSION,
+            "revision": self.revision,
+            "written_at": time.time(),
+            "skills": [list(s) for s in self.matcher.skills],
+            "facets": facets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], matcher: SkillMatcher) -> Optional["SkillAggregates"]:
+        """None se o artefato é de outro formato ou de outro léxico (ids não batem)."""
+        if data.get("version") != ARTIFACT_VERSION:
+            return None
+        if [tuple(s) for s in data.get("skills", [])] != list(matcher.skills):
+            return None
+        agg = cls(matcher, data.get("revision"))
+        n_skills = len(matcher.skills)
+        for facet in data["facets"]:
+            key = tuple(facet["key"])
+            vec = np.zeros(n_skills, dtype=np.int64)
+            vec[np.asarray(facet["ids"], dtype=np.int64)] = facet["counts"]
+            agg._counts[key] = vec
+            agg._jobs[key] = int(facet.get("jobs", 0))
+        return agg
+
+
+def save_aggregates(agg: SkillAggregates, path: str = AGGREGATES_PATH) -> None:
+    """Grava o artefato de forma atômica (leitores nunca veem um arquivo pela metade)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(agg.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_aggregates(path: str = AGGREGATES_PATH, matcher: Optional[SkillMatcher] = None) -> Optional[SkillAggregates]:
+    """Artefato gravado na coleta; None se não existe ou não serve para o léxico atual."""
+    from .matcher import default_matcher
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return SkillAggregates.from_dict(data, matcher or default_matcher())
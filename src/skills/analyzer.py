@@ -1,21 +1,23 @@
 import re
 from collections import Counter
-from typing import Dict, List, Tuple
-from .lexicon import DEV_STACK, CLOUD, SOFT_SKILLS, ALIASES
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple, Union
+import numpy as np
+from src.metrics import timed
+from .lexicon import ALIASES
+from .matcher import TOKENIZER, SkillMatcher, default_matcher
 
-TOKENIZER = re.compile(r"[\w+#.]+", re.UNICODE)
+if TYPE_CHECKING:
+    import pandas as pd
 
 def normalize_token(t: str) -> str:
     t = t.lower()
     return ALIASES.get(t, t)
 
 def classify_tokens(text: str) -> Dict[str, Counter]:
-    tokens = [normalize_token(t) for t in TOKENIZER.findall(text.lower())]
-    dev = Counter(t for t in tokens if t in DEV_STACK)
-    cloud = Counter(t for t in tokens if t in CLOUD)
-    soft = Counter(t for t in tokens if t in SOFT_SKILLS)
-    return {"dev": dev, "cloud": cloud, "soft": soft}
+    return default_matcher().classify(text)
 
+@timed("analyze")
 def aggregate_descriptions(descs: List[str]) -> Dict[str, Counter]:
     agg = {"dev": Counter(), "cloud": Counter(), "soft": Counter()}
     for d in descs:
@@ -24,5 +26,145 @@ def aggregate_descriptions(descs: List[str]) -> Dict[str, Counter]:
             agg[k].update(cls[k])
     return agg
 
+# Mesmos tokens de `matcher.tokenize`: o ponto final fica de fora já no regex
+BULK_TOKENIZER = re.compile(r"[\w+#.]*[\w+#]", re.UNICODE)
+# Separador equivalente para o RE2 do Arrow (\w do Python = letras, números e "_")
+ARROW_SEPARATOR = r"[^\pL\pN_+#.]+"
+
+
+@lru_cache(maxsize=8)
+def _phrase_table(matcher: SkillMatcher):
+    """Vocabulário das frases e, por tamanho, as chaves codificadas ordenadas."""
+    import pandas as pd
+    vocab = sorted({tok for phrase in matcher.phrases for tok in phrase})
+    code = {tok: i for i, tok in enumerate(vocab)}
+    base = len(vocab) + 1
+    by_len: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    for n in range(1, matcher.max_len + 1):
+        keys, idxs = [], []
+        for idx, phrase in enumerate(matcher.phrases):
+            if len(phrase) == n:
+                key = 0
+                for tok in phrase:
+                    key = key * base + code[tok]
+                keys.append(key)
+                idxs.append(idx)
+        order = np.argsort(keys)
+        by_len[n] = (np.asarray(keys, dtype=np.int64)[order], np.asarray(idxs, dtype=np.int64)[order])
+    # Frase -> ids de skill em CSR (um alias pode apontar para mais de uma categoria)
+    lengths = np.asarray([len(t) for t in matcher.targets], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    sids = np.asarray([sid for t in matcher.targets for sid in t], dtype=np.int64)
+    return pd.Index(vocab), base, by_len, offsets, sids
+
+
+def _resolve_overlaps(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Seleção gulosa mais à esquerda das candidatas, por ponto fixo vetorizado.
+
+    Em cada rodada, aceita as candidatas que nenhuma anterior ainda ativa cobre e
+    descarta as cobertas por uma aceita; repete até não sobrar indecisa.
+    """
+    n = len(starts)
+    active = np.ones(n, dtype=bool)
+    accepted = np.zeros(n, dtype=bool)
+    undecided = np.ones(n, dtype=bool)
+    while undecided.any():
+        reach = np.maximum.accumulate(np.where(active, ends, -1))
+        prev = np.concatenate(([-1], reach[:-1]))
+        accept = undecided & (prev <= starts)
+        accepted |= accept
+        undecided &= ~accept
+        reach = np.maximum.accumulate(np.where(accepted, ends, -1))
+        prev = np.concatenate(([-1], reach[:-1]))
+        reject = undecided & (prev > starts)
+        active &= ~reject
+        undecided &= ~reject
+    return accepted
+
+
+def _bulk_tokens(texts: List[str]) -> Tuple[np.ndarray, Sequence[str], np.ndarray]:
+    """Tokens de todos os textos como (código por token, tokens distintos, texto de origem).
+
+    Com `pyarrow` a quebra em tokens roda em C++ (`split_pattern_regex`); sem
+    ele, `str.findall` + `explode` do pandas. O `lower()` é sempre o do Python,
+    o mesmo de `matcher.tokenize`.
+    """
+    import pandas as pd
+    lowered = [t.lower() for t in texts]
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        tokens = pd.Series(lowered, dtype=object).str.findall(BULK_TOKENIZER).explode().dropna()
+        codes, uniq = pd.factorize(tokens)
+        return codes, uniq, tokens.index.to_numpy()
+    lists = pc.split_pattern_regex(pa.array(lowered, type=pa.large_string()), ARROW_SEPARATOR)
+    tokens = pc.utf8_rtrim(pc.list_flatten(lists), characters=".")
+    doc = pc.list_parent_indices(lists)
+    keep = pc.not_equal(tokens, "")
+    encoded = pc.filter(tokens, keep).dictionary_encode()
+    return (
+        encoded.indices.to_numpy(zero_copy_only=False),
+        encoded.dictionary.to_pylist(),
+        pc.filter(doc, keep).to_numpy(zero_copy_only=False),
+    )
+
+
+@timed("analyze")
+def aggregate_series(descs: Union["pd.Series", Iterable[str]], matcher: SkillMatcher = None) -> Dict[str, Counter]:
+    """Versão vetorizada de `aggregate_descriptions` para uma Series inteira.
+
+    Tokeniza o lote de uma vez, converte os tokens em códigos do vocabulário do
+    léxico, procura n-gramas codificados por tamanho e resolve sobreposições
+    como o matcher (mais à esquerda, mais longo). Mesmo resultado de
+    `aggregate_descriptions`.
+    """
+    # pandas só carrega aqui: quem importa o analisador (API, CLI) não paga por ele
+    import pandas as pd
+    matcher = matcher or default_matcher()
+    out: Dict[str, Counter] = {cat: Counter() for cat in matcher.categories}
+    series = descs if isinstance(descs, pd.Series) else pd.Series(list(descs), dtype=object)
+    uniq_codes, uniq, doc = _bulk_tokens(series.fillna("").astype(str).tolist())
+    if not len(uniq_codes) or not matcher.phrases:
+        return out
+
+    vocab, base, by_len, offsets, sids = _phrase_table(matcher)
+    # O vocabulário só é consultado uma vez por token distinto
+    codes = vocab.get_indexer(pd.Index(uniq, dtype=object)).astype(np.int64)[uniq_codes]
+    n_tok = len(codes)
+
+    # Frase mais longa que começa em cada posição (-1 = nenhuma)
+    best_len = np.zeros(n_tok, dtype=np.int64)
+    best_idx = np.full(n_tok, -1, dtype=np.int64)
+    key = np.zeros(n_tok, dtype=np.int64)
+    valid = np.ones(n_tok, dtype=bool)
+    for n in range(1, matcher.max_len + 1):
+        m = n_tok - n + 1
+        if m <= 0:
+            break
+        tail = codes[n - 1:]
+        key = key[:m] * base + tail
+        valid = valid[:m] & (tail >= 0) & (doc[:m] == doc[n - 1:])
+        keys, idxs = by_len[n]
+        if not len(keys):
+            continue
+        pos = np.searchsorted(keys, key)
+        pos[pos >= len(keys)] = 0
+        hit = valid & (keys[pos] == key)
+        best_len[:m][hit] = n
+        best_idx[:m][hit] = idxs[pos[hit]]
+
+    starts = np.flatnonzero(best_idx >= 0)
+    accepted = _resolve_overlaps(starts, starts + best_len[starts])
+    phrases = best_idx[starts[accepted]]
+    per_phrase = np.bincount(phrases, minlength=len(matcher.phrases))
+    counts = np.zeros(len(matcher.skills), dtype=np.int64)
+    for idx in np.flatnonzero(per_phrase):
+        counts[sids[offsets[idx]:offsets[idx + 1]]] += per_phrase[idx]
+    for sid in np.flatnonzero(counts):
+        cat, name = matcher.skills[sid]
+        out[cat][name] = int(counts[sid])
+    return out
+
 def top_n(agg: Dict[str, Counter], n: int = 10) -> Dict[str, List[Tuple[str, int]]]:
     return {k: cnt.most_common(n) for k, cnt in agg.items()}
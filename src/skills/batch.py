@@ -0,0 +1,111 @@
+import atexit
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from src.metrics import timed
+from .matcher import SkillMatcher, default_matcher
+
+# Abaixo disso a análise é serial: subir processos custa mais que tokenizar
+SERIAL_THRESHOLD = int(os.getenv("SKILL_SERIAL_THRESHOLD", "5000"))
+CHUNK_SIZE = 2000
+
+# Matcher do processo worker, compilado uma vez no initializer
+_WORKER_MATCHER: Optional[SkillMatcher] = None
+
+# Pools do léxico padrão por número de workers
+_EXECUTORS: Dict[int, ProcessPoolExecutor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _init_worker(matcher: Optional[SkillMatcher]) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = matcher or default_matcher()
+
+
+def count_array(descs: Sequence[str], matcher: SkillMatcher) -> np.ndarray:
+    """Total por id de skill (ordem de `matcher.skills`) de um lote de descrições."""
+    totals = np.zeros(len(matcher.skills), dtype=np.int64)
+    for d in descs:
+        if not d:
+            continue
+        for sid, c in matcher.count_ids(d).items():
+            totals[sid] += c
+    return totals
+
+
+def _count_chunk(descs: List[str]) -> np.ndarray:
+    return count_array(descs, _WORKER_MATCHER)
+
+
+def _default_workers() -> int:
+    return int(os.getenv("SKILL_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    """Pool de processos do léxico padrão para `workers`, criado no primeiro uso e reaproveitado.
+
+    Há um pool por número de workers: trocar o número não encerra um pool que
+    outra thread pode estar usando.
+    """
+    with _EXECUTOR_LOCK:
+        pool = _EXECUTORS.get(workers)
+        if pool is None:
+            pool = _EXECUTORS[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(None,),
+            )
+        return pool
+
+
+@atexit.register
+def _shutdown_executors() -> None:
+    with _EXECUTOR_LOCK:
+        for pool in _EXECUTORS.values():
+            pool.shutdown(cancel_futures=True)
+        _EXECUTORS.clear()
+
+
+@timed("analyze")
+def analyze_batch(
+    descs: Sequence[str],
+    matcher: Optional[SkillMatcher] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    threshold: Optional[int] = None,
+) -> np.ndarray:
+    """Conta skills de muitas descrições repartindo o trabalho entre processos.
+
+    Cada worker devolve o vetor de contagens do seu pedaço e o processo pai só
+    soma os vetores. Lotes menores que `threshold`, ou com um único worker
+    disponível, rodam em série.
+    """
+    matcher = matcher or default_matcher()
+    descs = list(descs)
+    threshold = SERIAL_THRESHOLD if threshold is None else threshold
+    workers = workers or _default_workers()
+    if len(descs) < threshold or workers <= 1:
+        return count_array(descs, matcher)
+
+    chunks = [descs[i:i + chunk_size] for i in range(0, len(descs), chunk_size)]
+    if matcher is default_matcher():
+        pool = _executor(workers)
+        parts = pool.map(_count_chunk, chunks)
+        return sum(parts, np.zeros(len(matcher.skills), dtype=np.int64))
+    # Léxico customizado: pool próprio, com o matcher enviado uma vez por worker
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,)) as pool:
+        return sum(pool.map(_count_chunk, chunks), np.zeros(len(matcher.skills), dtype=np.int64))
+
+
+def aggregate_batch(descs: Sequence[str], **kwargs) -> Dict[str, Counter]:
+    """Mesmo resultado de `analyzer.aggregate_descriptions`, via `analyze_batch`."""
+    matcher = kwargs.get("matcher") or default_matcher()
+    totals = analyze_batch(descs, **kwargs)
+    out: Dict[str, Counter] = {cat: Counter() for cat in matcher.categories}
+    for sid in np.flatnonzero(totals):
+        cat, name = matcher.skills[sid]
+        out[cat][name] = int(totals[sid])
+    return out
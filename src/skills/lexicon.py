@@ -100,3 +100,10 @@ ALIASES = {
     "agile": "agile methodologies",
     "ágil": "metodologias ágeis",
 }
+
+# Ordem das categorias define a tabela de ids de skills (ver matcher.py)
+CATEGORIES = {
+    "dev": DEV_STACK,
+    "cloud": CLOUD,
+    "soft": SOFT_SKILLS,
+}
@@ -0,0 +1,123 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+TOKENIZER = re.compile(r"[\w+#.]+", re.UNICODE)
+
+# Chave terminal dos nós da trie (tokens nunca são None)
+_END = None
+
+
+def tokenize(text: str) -> List[str]:
+    """Quebra o texto em tokens minúsculos, sem ponto final ("react." -> "react")."""
+    out: List[str] = []
+    for t in TOKENIZER.findall(text.lower()):
+        t = t.rstrip(".")
+        if t:
+            out.append(t)
+    return out
+
+
+class SkillMatcher:
+    """Trie compilada de frases do léxico (e aliases) sobre sequências de tokens.
+
+    Cada skill recebe um id estável (ordem de categoria e de aparição no léxico).
+    O casamento é guloso, mais à esquerda e mais longo, então "react native" conta
+    uma vez como "react native" e não também como "react".
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], aliases: Optional[Mapping[str, str]] = None):
+        self.categories: Tuple[str, ...] = tuple(categories)
+        skills: List[Tuple[str, str]] = []
+        ids: Dict[Tuple[str, str], int] = {}
+        by_name: Dict[str, List[int]] = {}
+        for cat, terms in categories.items():
+            for term in terms:
+                name = term.lower()
+                if (cat, name) in ids:
+                    continue
+                ids[(cat, name)] = len(skills)
+                skills.append((cat, name))
+                by_name.setdefault(name, []).append(ids[(cat, name)])
+        self.skills: Tuple[Tuple[str, str], ...] = tuple(skills)
+        self._ids = ids
+
+        phrases: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        for name, sids in by_name.items():
+            key = tuple(tokenize(name))
+            if key:
+                phrases[key] = tuple(sids)
+        # Aliases têm precedência sobre o termo literal (ex.: "agile" -> "agile methodologies")
+        for alias, target in (aliases or {}).items():
+            key = tuple(tokenize(alias))
+            sids = by_name.get(target.lower())
+            if key and sids:
+                phrases[key] = tuple(sids)
+
+        self.phrases: Tuple[Tuple[str, ...], ...] = tuple(phrases)
+        self.targets: Tuple[Tuple[int, ...], ...] = tuple(phrases.values())
+        self.max_len = max((len(p) for p in self.phrases), default=0)
+        self._phrase_ids = phrases
+        root: dict = {}
+        for idx, phrase in enumerate(self.phrases):
+            node = root
+            for tok in phrase:
+                node = node.setdefault(tok, {})
+            node[_END] = idx
+        self._root = root
+
+    def skill_id(self, category: str, skill: str) -> int:
+        return self._ids[(category, skill.lower())]
+
+    def resolve(self, term: str) -> Tuple[int, ...]:
+        """Ids designados por um nome de skill ou alias ("k8s" -> kubernetes); vazio se não houver."""
+        return self._phrase_ids.get(tuple(tokenize(term)), ())
+
+    def iter_matches(self, tokens: List[str]) -> Iterator[int]:
+        """Itera os índices de frase encontrados na sequência de tokens."""
+        root = self._root
+        i, n = 0, len(tokens)
+        while i < n:
+            node = root.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            found, end = node.get(_END), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    found, end = node[_END], j
+            if found is None:
+                i += 1
+                continue
+            yield found
+            i = end
+
+    def count_ids(self, text: str) -> Counter:
+        """Contagem por id de skill em uma única passada pelo texto."""
+        counts: Counter = Counter()
+        targets = self.targets
+        for idx in self.iter_matches(tokenize(text)):
+            for sid in targets[idx]:
+                counts[sid] += 1
+        return counts
+
+    def classify(self, text: str) -> Dict[str, Counter]:
+        out: Dict[str, Counter] = {cat: Counter() for cat in self.categories}
+        skills = self.skills
+        for sid, c in self.count_ids(text).items():
+            cat, name = skills[sid]
+            out[cat][name] += c
+        return out
+
+
+@lru_cache(maxsize=1)
+def default_matcher() -> SkillMatcher:
+    """Matcher compilado a partir de `lexicon.py` (construído uma vez por processo)."""
+    from .lexicon import CATEGORIES, ALIASES
+    return SkillMatcher(CATEGORIES, ALIASES)
@@ -0,0 +1,120 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .matcher import SkillMatcher, default_matcher
+
+
+class SkillMatrix:
+    """Contagens vaga × skill em formato CSR (indptr/indices/data).
+
+    As colunas são os ids de `SkillMatcher.skills`. Cada descrição é tokenizada
+    uma única vez em `build`; depois disso qualquer filtro vira uma soma de
+    colunas mascarada.
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        matcher: SkillMatcher,
+        hashes: Optional[Sequence[str]] = None,
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.matcher = matcher
+        # Hash do conteúdo de cada linha, para reaproveitar vetores entre recargas
+        self.hashes = list(hashes) if hashes is not None else None
+        # Linha de cada entrada não nula, para aplicar máscaras sem laço Python
+        self._rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+
+    @classmethod
+    def build(
+        cls,
+        descs: Iterable[str],
+        matcher: Optional[SkillMatcher] = None,
+        hashes: Optional[Sequence[str]] = None,
+        previous: Optional["SkillMatrix"] = None,
+    ) -> "SkillMatrix":
+        """Monta a matriz; com `hashes` e `previous`, só tokeniza conteúdo novo."""
+        matcher = matcher or default_matcher()
+        reuse = previous.row_map() if previous is not None and previous.matcher is matcher and hashes is not None else {}
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for i, d in enumerate(descs):
+            hit = reuse.get(hashes[i]) if reuse else None
+            if hit is not None:
+                indices.extend(hit[0])
+                data.extend(hit[1])
+            else:
+                counts = matcher.count_ids(d) if d else {}
+                for sid in sorted(counts):
+                    indices.append(sid)
+                    data.append(counts[sid])
+            indptr.append(len(indices))
+        return cls(
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(data, dtype=np.int32),
+            matcher,
+            hashes,
+        )
+
+    def row_map(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """hash do conteúdo -> (ids, contagens) da linha."""
+        if not self.hashes:
+            return {}
+        out: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for i, h in enumerate(self.hashes):
+            a, b = self.indptr[i], self.indptr[i + 1]
+            out[h] = (self.indices[a:b], self.data[a:b])
+        return out
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_skills(self) -> int:
+        return len(self.matcher.skills)
+
+    def totals(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Soma das colunas, opcionalmente só nas linhas com `mask` verdadeiro."""
+        indices, data = self.indices, self.data
+        if mask is not None:
+            sel = np.asarray(mask, dtype=bool)[self._rows]
+            indices, data = indices[sel], data[sel]
+        return np.bincount(indices, weights=data, minlength=self.n_skills).astype(np.int64)
+
+    def top(self, mask: Optional[np.ndarray] = None, n: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+        """Top-n por categoria, no mesmo formato de `analyzer.top_n`."""
+        return top_from_totals(self.totals(mask), self.matcher, n)
+
+
+@lru_cache(maxsize=8)
+def category_slices(matcher: SkillMatcher) -> Dict[str, slice]:
+    """Faixa de ids de cada categoria (ids são contíguos por categoria)."""
+    out: Dict[str, slice] = {}
+    for cat in matcher.categories:
+        ids = [i for i, (c, _) in enumerate(matcher.skills) if c == cat]
+        out[cat] = slice(ids[0], ids[-1] + 1) if ids else slice(0, 0)
+    return out
+
+
+def top_from_totals(totals: np.ndarray, matcher: SkillMatcher, n: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+    skills = matcher.skills
+    out: Dict[str, List[Tuple[str, int]]] = {}
+    for cat, sl in category_slices(matcher).items():
+        counts = totals[sl]
+        k = min(n, len(counts))
+        if k <= 0:
+            out[cat] = []
+            continue
+        idx = np.argpartition(-counts, k - 1)[:k] if k < len(counts) else np.arange(len(counts))
+        idx = idx[counts[idx] > 0]
+        # desempate estável pela ordem do léxico
+        idx = idx[np.lexsort((idx, -counts[idx]))]
+        out[cat] = [(skills[sl.start + i][1], int(counts[i])) for i in idx]
+    return out
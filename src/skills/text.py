@@ -0,0 +1,71 @@
+import hashlib
+import re
+from typing import Optional, Tuple
+from lxml import etree, html as lxml_html
+
+_WS = re.compile(r"\s+")
+_TAG = re.compile(r"<[^>]+>")
+# Conteúdo que nunca é texto da vaga
+_DROP = ("script", "style", "noscript", "template")
+# Só estes elementos separam palavras; tags inline (b, span, a...) juntam o texto direto
+_BLOCK = frozenset((
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+))
+_BLOCK_TAG = re.compile(r"</?(?:%s)\b[^>]*>" % "|".join(sorted(_BLOCK)), re.IGNORECASE)
+# Mudanças no resultado de `html_to_text` (2: tags inline sem espaço) recalculam `desc_text`
+TEXT_VERSION = 2
+
+
+def _block_text(el, parts: list) -> None:
+    # Comentários e instruções não são texto, só a cauda deles (que o elemento pai junta)
+    if not isinstance(el.tag, str):
+        return
+    block = el.tag.lower() in _BLOCK
+    if block:
+        parts.append(" ")
+    parts.append(el.text or "")
+    for child in el:
+        _block_text(child, parts)
+        parts.append(child.tail or "")
+    if block:
+        parts.append(" ")
+
+
+def html_to_text(raw: str) -> str:
+    """Converte a descrição (HTML ou texto) em texto plano com espaços normalizados."""
+    if not raw:
+        return ""
+    if "<" not in raw and "&" not in raw:
+        return _WS.sub(" ", raw).strip()
+    try:
+        root = lxml_html.fragment_fromstring(raw, create_parent="div")
+        etree.strip_elements(root, *_DROP, with_tail=False)
+        parts: list = []
+        _block_text(root, parts)
+        text = "".join(parts)
+    except (etree.ParserError, ValueError, RecursionError):
+        text = _TAG.sub("", _BLOCK_TAG.sub(" ", raw))
+    return _WS.sub(" ", text).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def normalize_desc(desc: Optional[str], desc_text: str = "", desc_hash: str = "") -> Tuple[str, str]:
+    """(`desc_text`, `desc_hash`) de uma descrição; valores já preenchidos (com hash) ficam como estão.
+
+    Regra única usada por `normalize_job`, `JobBatch.normalize` e a migração do SQLite.
+    """
+    if desc_hash:
+        return desc_text, desc_hash
+    text = html_to_text(desc or "")
+    return text, content_hash(text)
+
+
+def normalize_job(job):
+    """Preenche `desc_text`/`desc_hash` do Job uma única vez (idempotente)."""
+    job.desc_text, job.desc_hash = normalize_desc(job.desc, job.desc_text, job.desc_hash)
+    return job
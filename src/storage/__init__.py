@@ -0,0 +1,32 @@
+import os
+from .base import COLUMNS, GRANULARITIES, STORED_COLUMNS, JobStorage, TrendPoint, UpsertResult, job_key
+from .sqlite import SQLiteJobStorage
+from .store import JobStore, JobSnapshot
+
+DEFAULT_DB = "data/jobs.db"
+LEGACY_CSV = "data/jobs.csv"
+
+
+def open_storage(path: str = DEFAULT_DB, legacy_csv: str = LEGACY_CSV) -> JobStorage:
+    """Abre o SQLite padrão; na primeira criação importa o CSV legado, se existir."""
+    fresh = not os.path.exists(path)
+    storage = SQLiteJobStorage(path)
+    if fresh and legacy_csv and os.path.exists(legacy_csv):
+        from .importer import import_csv
+        import_csv(storage, legacy_csv)
+    return storage
+
+
+__all__ = [
+    "COLUMNS",
+    "GRANULARITIES",
+    "JobStorage",
+    "JobStore",
+    "JobSnapshot",
+    "SQLiteJobStorage",
+    "STORED_COLUMNS",
+    "TrendPoint",
+    "UpsertResult",
+    "job_key",
+    "open_storage",
+]
@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Hashable, Iterable, List, Optional, Tuple
+from src.scrapers.models import Job
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COLUMNS = ["title", "company", "location", "desc", "source", "url"]
+# Colunas derivadas gravadas junto do HTML bruto (ver skills/text.py) e datas da vaga
+STORED_COLUMNS = COLUMNS + ["desc_text", "desc_hash", "collected_at", "posted_at"]
+# Períodos aceitos por `skill_trend`
+GRANULARITIES = ("day", "week", "month")
+
+
+# (source, location, desc_text) de uma linha, o suficiente para deltas de agregados
+RowFacts = Tuple[str, str, str]
+
+
+@dataclass
+class TrendPoint:
+    # Primeiro dia do período (segunda-feira na semana, dia 1 no mês)
+    start: str
+    # Ocorrências da skill e vagas que a citam no período
+    mentions: int
+    jobs: int
+    # Vagas do período com ou sem a skill (denominador da participação)
+    total_jobs: int
+
+    @property
+    def share(self) -> float:
+        return self.jobs / self.total_jobs if self.total_jobs else 0.0
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    # Vagas descartadas como duplicatas de outra já gravada (ver src/dedup)
+    duplicates: int = 0
+    # (antes, depois) das linhas cujo conteúdo relevante mudou; None = não existia
+    changes: List[Tuple[Optional[RowFacts], Optional[RowFacts]]] = field(default_factory=list)
+    # Revisão do armazenamento imediatamente antes e depois desta escrita
+    revision_before: Hashable = None
+    revision: Hashable = None
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.removed
+
+
+def job_key(job: Job) -> str:
+    """Chave de deduplicação: URL; sem URL, (source, title, company, location)."""
+    if job.url:
+        return job.url
+    return "|".join([job.source or "", job.title or "", job.company or "", job.location or ""])
+
+
+def job_day(posted_at: str, collected_at: str) -> str:
+    """Dia (AAAA-MM-DD) em que a vaga conta nas séries: publicação, senão primeira coleta."""
+    return (posted_at or collected_at)[:10]
+
+
+class JobStorage(ABC):
+    """Camada de persistência de vagas: único ponto de escrita do projeto."""
+
+    @abstractmethod
+    def upsert(self, jobs: Iterable[Job]) -> UpsertResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_frame(self) -> "pd.DataFrame":
+        """Todas as vagas com as colunas de `STORED_COLUMNS`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def revision(self) -> Hashable:
+        """Valor barato que muda sempre que os dados mudam (usado pelo JobStore)."""
+        raise NotImplementedError
+
+    def delete(self, keys: Iterable[str]) -> UpsertResult:
+        """Remove vagas pela chave (`job_key`)."""
+        raise NotImplementedError(f"{type(self).__name__} não suporta remoção")
+
+    def skill_trend(
+        self,
+        skill_id: int,
+        granularity: str = "week",
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[TrendPoint]:
+        """Série de uma skill (id do `SkillMatcher`) por período, a partir das agregações diárias."""
+        raise NotImplementedError(f"{type(self).__name__} não mantém séries de skills")
+
+    def count(self) -> int:
+        return len(self.load_frame())
@@ -0,0 +1,40 @@
+import os
+from typing import Iterator
+import pandas as pd
+from src.scrapers.models import Job
+from .base import COLUMNS, JobStorage, UpsertResult
+
+
+def iter_csv_jobs(path: str) -> Iterator[Job]:
+    df = pd.read_csv(path).fillna("")
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    for r in df[COLUMNS].astype(str).itertuples(index=False):
+        yield Job(title=r.title, company=r.company, location=r.location, desc=r.desc, source=r.source, url=r.url or None)
+
+
+def import_csv(storage: JobStorage, path: str = "data/jobs.csv") -> UpsertResult:
+    """Importa um CSV no formato antigo (title,company,location,desc,source,url)."""
+    if not os.path.exists(path):
+        return UpsertResult()
+    return storage.upsert(iter_csv_jobs(path))
+
+
+if __name__ == "__main__":
+    import argparse
+    from .sqlite import SQLiteJobStorage
+
+    parser = argparse.ArgumentParser(description="Importa data/jobs.csv para o armazenamento")
+    parser.add_argument("csv", nargs="?", default="data/jobs.csv")
+    parser.add_argument("--db", default="data/jobs.db", help="Banco SQLite de destino")
+    parser.add_argument("--parquet", default=None, help="Também exporta para um dataset Parquet")
+    args = parser.parse_args()
+
+    storage = SQLiteJobStorage(args.db)
+    res = import_csv(storage, args.csv)
+    print(f"{res.inserted} vagas novas, {res.updated} atualizadas em {args.db}")
+    if args.parquet:
+        from .parquet import ParquetJobStorage
+        res = import_csv(ParquetJobStorage(args.parquet), args.csv)
+        print(f"{res.total} vagas exportadas para {args.parquet}")
@@ -0,0 +1,185 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.skills.matcher import tokenize
+
+_EMPTY = np.empty(0, dtype=np.int32)
+# Consultas parciais distintas guardadas por índice (LRU)
+PARTIAL_CACHE_SIZE = 256
+
+
+def _match_rows(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Linha antiga de cada linha nova com a mesma chave (-1 se não há).
+
+    Chaves repetidas casam na ordem: a 1ª nova com a 1ª antiga, e assim por diante.
+    """
+
+    def occurrence(keys: np.ndarray) -> np.ndarray:
+        order = np.argsort(keys, kind="stable")
+        ordered = keys[order]
+        first = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+        pos = np.arange(len(keys))
+        occ = np.empty(len(keys), dtype=np.uint64)
+        occ[order] = pos - np.maximum.accumulate(np.where(first, pos, 0))
+        # Chave composta (chave, ocorrência) em 64 bits, com estouro proposital
+        return keys.astype(np.uint64) + occ * np.uint64(0x9E3779B97F4A7C15)
+
+    old_k, new_k = occurrence(old), occurrence(new)
+    order = np.argsort(old_k)
+    pos = np.searchsorted(old_k[order], new_k)
+    pos[pos >= len(order)] = 0
+    found = old_k[order[pos]] == new_k if len(order) else np.zeros(len(new_k), dtype=bool)
+    out = np.full(len(new_k), -1, dtype=np.int64)
+    out[found] = order[pos[found]]
+    return out
+
+
+class TextIndex:
+    """Índice invertido token -> ids de linha, em CSR (`offsets`/`ids`).
+
+    `search` intersecta as listas dos tokens da consulta. Tokens que não existem
+    no vocabulário (ou todos, com `partial=True`) casam por substring com as
+    entradas do vocabulário, cobrindo palavras parciais como "reac" ou "paulo".
+
+    Com `keys` (impressão do texto de cada linha), a próxima versão pode ser
+    montada a partir desta (`build(..., previous=...)`): só as linhas novas ou
+    alteradas são tokenizadas, e as demais têm os ids remapeados.
+    """
+
+    def __init__(
+        self,
+        vocab: Dict[str, int],
+        offsets: np.ndarray,
+        ids: np.ndarray,
+        n_rows: int,
+        keys: Optional[np.ndarray] = None,
+    ):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.ids = ids
+        self.n_rows = n_rows
+        self.keys = keys
+        self._blob: Optional[Tuple[str, np.ndarray]] = None
+        self._partial_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _from_pairs(
+        cls, vocab: Dict[str, int], toks: np.ndarray, rows: np.ndarray, n_rows: int, keys: Optional[np.ndarray]
+    ) -> "TextIndex":
+        # Ordenação estável por token: os ids de cada token mantêm a ordem de entrada
+        order = np.argsort(toks, kind="stable")
+        counts = np.bincount(toks, minlength=len(vocab))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return cls(vocab, offsets, rows[order].astype(np.int32), n_rows, keys)
+
+    @staticmethod
+    def _tokenize_rows(
+        texts: Sequence[str], rows: Sequence[int], vocab: Dict[str, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(token, linha) de cada token distinto das linhas dadas; tokens novos entram em `vocab`."""
+        toks: List[int] = []
+        out: List[int] = []
+        for row in rows:
+            text = texts[row]
+            for tok in set(tokenize(text)) if text else ():
+                idx = vocab.get(tok)
+                if idx is None:
+                    idx = vocab[tok] = len(vocab)
+                toks.append(idx)
+                out.append(row)
+        return np.asarray(toks, dtype=np.int64), np.asarray(out, dtype=np.int64)
+
+    @classmethod
+    def build(
+        cls,
+        texts: Sequence[str],
+        keys: Optional[np.ndarray] = None,
+        previous: Optional["TextIndex"] = None,
+    ) -> "TextIndex":
+        """Monta o índice; com `keys` e `previous`, só tokeniza linhas que mudaram."""
+        n = len(texts)
+        if keys is not None and previous is not None and previous.keys is not None:
+            index = cls._update(previous, texts, keys)
+            # Tokens sem nenhuma linha se acumulam a cada remoção: se forem maioria, recomeça
+            if np.count_nonzero(np.diff(index.offsets)) * 2 >= len(index.vocab):
+                return index
+        vocab: Dict[str, int] = {}
+        toks, rows = cls._tokenize_rows(list(texts), range(n), vocab)
+        return cls._from_pairs(vocab, toks, rows, n, keys)
+
+    @classmethod
+    def _update(cls, previous: "TextIndex", texts: Sequence[str], keys: np.ndarray) -> "TextIndex":
+        old_of_new = _match_rows(previous.keys, keys)
+        reused = old_of_new >= 0
+        remap = np.full(previous.n_rows, -1, dtype=np.int64)
+        remap[old_of_new[reused]] = np.flatnonzero(reused)
+        # Postings antigos com a linha nova de cada id (linhas removidas/alteradas saem)
+        old_toks = np.repeat(np.arange(len(previous.offsets) - 1, dtype=np.int64), np.diff(previous.offsets))
+        moved = remap[previous.ids]
+        keep = moved >= 0
+        # O índice anterior continua em uso: o vocabulário é copiado antes de crescer
+        vocab = dict(previous.vocab)
+        toks, rows = cls._tokenize_rows(texts, np.flatnonzero(~reused).tolist(), vocab)
+        return cls._from_pairs(
+            vocab,
+            np.concatenate((old_toks[keep], toks)),
+            np.concatenate((moved[keep], rows)),
+            len(texts),
+            keys,
+        )
+
+    def _postings(self, idx: int) -> np.ndarray:
+        return self.ids[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def _partial(self, term: str) -> np.ndarray:
+        with self._lock:
+            hit = self._partial_cache.get(term)
+            if hit is not None:
+                self._partial_cache.move_to_end(term)
+                return hit
+        blob = self._blob
+        if blob is None:
+            # Vocabulário numa string só: a busca por substring roda no motor de regex, não em laço Python
+            tokens = list(self.vocab)
+            starts = np.cumsum([0] + [len(t) + 1 for t in tokens[:-1]]) if tokens else np.empty(0, dtype=np.int64)
+            blob = self._blob = ("\n".join(tokens), starts)
+        text, starts = blob
+        found = [m.start() for m in re.finditer(re.escape(term), text)]
+        lists = [self._postings(int(i)) for i in np.unique(np.searchsorted(starts, found, side="right") - 1)]
+        hit = np.unique(np.concatenate(lists)) if lists else _EMPTY
+        with self._lock:
+            self._partial_cache[term] = hit
+            if len(self._partial_cache) > PARTIAL_CACHE_SIZE:
+                self._partial_cache.popitem(last=False)
+        return hit
+
+    def lookup(self, term: str, partial: bool = False) -> np.ndarray:
+        if not partial:
+            idx = self.vocab.get(term)
+            if idx is not None and self.offsets[idx + 1] > self.offsets[idx]:
+                return self._postings(idx)
+        return self._partial(term)
+
+    def search(self, query: str, partial: bool = False) -> Optional[np.ndarray]:
+        """Ids das linhas que contêm todos os termos; None se a consulta não tem tokens."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        lists = sorted((self.lookup(t, partial) for t in set(terms)), key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            if not len(ids):
+                break
+            ids = np.intersect1d(ids, other, assume_unique=True)
+        return ids
+
+    def mask(self, query: str, partial: bool = False) -> np.ndarray:
+        ids = self.search(query, partial)
+        if ids is None:
+            return np.ones(self.n_rows, dtype=bool)
+        m = np.zeros(self.n_rows, dtype=bool)
+        m[ids] = True
+        return m
@@ -0,0 +1,163 @@
+import glob
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Iterable, List, Optional, Set, Tuple
+import pandas as pd
+from src.metrics import timed
+from src.scrapers.models import Job, utc_now
+from src.skills.matcher import SkillMatcher, default_matcher
+from src.skills.text import normalize_job
+from . import rollups
+from .base import STORED_COLUMNS, JobStorage, TrendPoint, UpsertResult, job_day, job_key
+
+# Partes só com chaves removidas (lápides); a ordem pelo nome vale para as duas
+_TOMBSTONE = ".del.parquet"
+
+
+class ParquetJobStorage(JobStorage):
+    """Dataset Parquet só de acréscimo, voltado a leituras analíticas.
+
+    Cada `upsert` grava um novo arquivo `part-*.parquet` e cada `delete` uma
+    lápide `part-*.del.parquet`; a leitura concatena as partes e mantém a última
+    versão de cada chave. Requer `pyarrow`.
+
+    O conjunto de chaves gravadas fica em memória e só lê a coluna `key` das
+    partes que ainda não viu (escritas de outro processo). As séries de
+    `skill_trend` são recalculadas a partir das vagas uma vez por revisão.
+    """
+
+    def __init__(self, path: str = "data/jobs.parquet", matcher: Optional[SkillMatcher] = None):
+        self.path = path
+        self.matcher = matcher or default_matcher()
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._keys: Set[str] = set()
+        self._seen: List[str] = []
+        self._rollups: Optional[Tuple[Tuple[str, ...], sqlite3.Connection]] = None
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def _write(self, df: pd.DataFrame, tombstone: bool = False) -> None:
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{_TOMBSTONE if tombstone else '.parquet'}"
+        tmp = os.path.join(self.path, f".{name}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(self.path, name))
+        self._seen.append(os.path.join(self.path, name))
+
+    def _live_keys(self) -> Set[str]:
+        """Chaves gravadas, atualizadas só com as partes novas (todas de novo após `compact`)."""
+        parts = self._parts()
+        if self._seen != parts[:len(self._seen)]:
+            self._keys, self._seen = set(), []
+        for p in parts[len(self._seen):]:
+            keys = pd.read_parquet(p, columns=["key"])["key"]
+            if p.endswith(_TOMBSTONE):
+                self._keys.difference_update(keys)
+            else:
+                self._keys.update(keys)
+            self._seen.append(p)
+        return self._keys
+
+    @timed("persist")
+    def upsert(self, jobs: Iterable[Job]) -> UpsertResult:
+        now = utc_now()
+        rows = [
+            {
+                "key": job_key(j),
+                "title": j.title or "",
+                "company": j.company or "",
+                "location": j.location or "",
+                "desc": j.desc or "",
+                "source": j.source or "",
+                "url": j.url or "",
+                "desc_text": j.desc_text,
+                "desc_hash": j.desc_hash,
+                "collected_at": j.collected_at or now,
+                "posted_at": j.posted_at,
+            }
+            for j in map(normalize_job, jobs)
+        ]
+        if not rows:
+            return UpsertResult()
+        with self._lock:
+            existing = self._live_keys()
+            keys = {r["key"] for r in rows}
+            inserted = len(keys - existing)
+            self._write(pd.DataFrame(rows))
+            existing |= keys
+        # Sem `changes`/`revision_before`: o JobStore recalcula agregados a partir do snapshot
+        return UpsertResult(inserted=inserted, updated=len(rows) - inserted, revision=self.revision())
+
+    @timed("persist")
+    def delete(self, keys: Iterable[str]) -> UpsertResult:
+        with self._lock:
+            existing = self._live_keys()
+            gone = sorted(set(keys) & existing)
+            if not gone:
+                return UpsertResult(revision=self.revision())
+            self._write(pd.DataFrame({"key": gone}), tombstone=True)
+            existing.difference_update(gone)
+        return UpsertResult(removed=len(gone), revision=self.revision())
+
+    def _read(self) -> pd.DataFrame:
+        parts = self._parts()
+        if not parts:
+            return pd.DataFrame(columns=["key"] + STORED_COLUMNS)
+        frames = []
+        for p in parts:
+            df = pd.read_parquet(p)
+            df["deleted"] = p.endswith(_TOMBSTONE)
+            frames.append(df)
+        df = pd.concat(frames, ignore_index=True)
+        df = df.reindex(columns=["key"] + STORED_COLUMNS + ["deleted"])
+        # A primeira coleta de cada chave vale para todas as versões (partes antigas não têm a coluna)
+        df["collected_at"] = df["collected_at"].replace("", None).groupby(df["key"]).transform("min")
+        df = df.drop_duplicates(subset=["key"], keep="last")
+        return df[~df["deleted"].astype(bool)].drop(columns="deleted")
+
+    def load_frame(self) -> pd.DataFrame:
+        return self._read()[STORED_COLUMNS].fillna("").reset_index(drop=True)
+
+    def revision(self) -> Tuple[str, ...]:
+        return tuple(os.path.basename(p) for p in self._parts())
+
+    def skill_trend(
+        self,
+        skill_id: int,
+        granularity: str = "week",
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[TrendPoint]:
+        """Mesma série do SQLite, com as agregações diárias montadas em memória (uma vez por revisão)."""
+        with self._lock:
+            revision = self.revision()
+            if self._rollups is None or self._rollups[0] != revision:
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+                conn.executescript(rollups.SCHEMA)
+                delta = rollups.RollupDelta(self.matcher)
+                df = self.load_frame()
+                for source_, text, collected_at, posted_at in zip(
+                    df["source"], df["desc_text"], df["collected_at"], df["posted_at"]
+                ):
+                    delta.add(job_day(posted_at, collected_at), source_, text)
+                delta.apply(conn)
+                self._rollups = (revision, conn)
+            return rollups.trend(self._rollups[1], skill_id, granularity, source, since, until)
+
+    def compact(self) -> None:
+        """Reescreve o dataset em uma única parte (sem versões antigas nem lápides)."""
+        with self._lock:
+            parts = self._parts()
+            if len(parts) < 2:
+                return
+            df = self._read()
+            self._seen = []
+            self._write(df)
+            for p in parts:
+                os.remove(p)
+            self._keys, self._seen = set(df["key"]), self._parts()
@@ -0,0 +1,159 @@
+"""Séries diárias de skills materializadas no SQLite, atualizadas por delta na ingestão.
+
+`skill_daily` guarda, por (skill, dia, fonte), as ocorrências da skill e quantas
+vagas a citam; `job_daily`, o total de vagas por (dia, fonte). O upsert e a
+remoção aplicam só a diferença das linhas alteradas, na mesma transação, então
+uma série lê as linhas da skill no intervalo em vez de reprocessar descrições.
+
+O dia de uma vaga é o da publicação, quando a fonte informa, senão o da
+primeira coleta (`job_day`); a fonte é gravada em minúsculas, como nas facetas
+de `SkillAggregates`. As skills são os ids do `SkillMatcher`: quando o léxico
+(ou `VERSION`, ou o `TEXT_VERSION` do texto limpo) muda, as tabelas são
+recalculadas a partir das vagas na abertura do banco.
+"""
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+from src.skills.matcher import SkillMatcher
+from src.skills.text import TEXT_VERSION
+from .base import GRANULARITIES, TrendPoint, job_day
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skill_daily (
+    skill_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    mentions INTEGER NOT NULL,
+    jobs INTEGER NOT NULL,
+    PRIMARY KEY (skill_id, day, source)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_daily (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    jobs INTEGER NOT NULL,
+    PRIMARY KEY (day, source)
+) WITHOUT ROWID;
+"""
+
+# Início do período a partir da coluna `day` (semanas começam na segunda-feira)
+BUCKETS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",
+    "month": "strftime('%Y-%m-01', day)",
+}
+
+_LEXICON_META = "rollup_lexicon"
+# Mudanças no formato das linhas (2: fonte em minúsculas) forçam o recálculo
+VERSION = 2
+
+
+def lexicon_hash(matcher: SkillMatcher) -> int:
+    """Impressão digital do formato, do texto limpo e dos ids/frases do matcher (inteiro de 64 bits, cabe em `meta`)."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr((VERSION, TEXT_VERSION, matcher.skills, matcher.phrases, matcher.targets)).encode())
+    return int.from_bytes(h.digest(), "big", signed=True)
+
+
+class RollupDelta:
+    """Diferenças de um lote por (skill, dia, fonte) e (dia, fonte), gravadas de uma vez."""
+
+    def __init__(self, matcher: SkillMatcher):
+        self.matcher = matcher
+        # (skill_id, dia, fonte) -> [ocorrências, vagas]
+        self.skills: Dict[Tuple[int, str, str], List[int]] = {}
+        self.jobs: Dict[Tuple[str, str], int] = {}
+
+    def add(self, day: str, source: str, text: str, sign: int = 1) -> None:
+        """Conta (sign=1) ou desconta (sign=-1) uma vaga."""
+        source = (source or "").lower()
+        key = (day, source)
+        self.jobs[key] = self.jobs.get(key, 0) + sign
+        for sid, count in self.matcher.count_ids(text).items():
+            entry = self.skills.setdefault((sid, day, source), [0, 0])
+            entry[0] += sign * count
+            entry[1] += sign
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        skills = [(sid, day, src, m, j) for (sid, day, src), (m, j) in self.skills.items() if m or j]
+        jobs = [(day, src, n) for (day, src), n in self.jobs.items() if n]
+        conn.executemany(
+            "INSERT INTO skill_daily(skill_id, day, source, mentions, jobs) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(skill_id, day, source) DO UPDATE SET "
+            "mentions = mentions + excluded.mentions, jobs = jobs + excluded.jobs",
+            skills,
+        )
+        conn.executemany(
+            "INSERT INTO job_daily(day, source, jobs) VALUES (?, ?, ?) "
+            "ON CONFLICT(day, source) DO UPDATE SET jobs = jobs + excluded.jobs",
+            jobs,
+        )
+        # Só as chaves que perderam vagas podem ter zerado
+        conn.executemany(
+            "DELETE FROM skill_daily WHERE skill_id = ? AND day = ? AND source = ? AND jobs <= 0",
+            [row[:3] for row in skills if row[4] < 0],
+        )
+        conn.executemany(
+            "DELETE FROM job_daily WHERE day = ? AND source = ? AND jobs <= 0",
+            [row[:2] for row in jobs if row[2] < 0],
+        )
+        self.skills.clear()
+        self.jobs.clear()
+
+
+def ensure(conn: sqlite3.Connection, matcher: SkillMatcher) -> bool:
+    """Cria as tabelas e recalcula tudo se o léxico mudou desde a última gravação."""
+    conn.executescript(SCHEMA)
+    current = lexicon_hash(matcher)
+    row = conn.execute("SELECT value FROM meta WHERE name = ?", (_LEXICON_META,)).fetchone()
+    if row is not None and row[0] == current:
+        return False
+    rebuild(conn, matcher)
+    conn.execute("INSERT OR REPLACE INTO meta(name, value) VALUES (?, ?)", (_LEXICON_META, current))
+    return True
+
+
+def rebuild(conn: sqlite3.Connection, matcher: SkillMatcher) -> None:
+    conn.execute("DELETE FROM skill_daily")
+    conn.execute("DELETE FROM job_daily")
+    delta = RollupDelta(matcher)
+    for source, text, collected_at, posted_at in conn.execute(
+        "SELECT source, desc_text, collected_at, posted_at FROM jobs"
+    ):
+        delta.add(job_day(posted_at, collected_at), source, text)
+    delta.apply(conn)
+
+
+def trend(
+    conn: sqlite3.Connection,
+    skill_id: int,
+    granularity: str = "week",
+    source: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> List[TrendPoint]:
+    """Série por período (dias AAAA-MM-DD inclusivos); períodos sem a skill saem com zero."""
+    bucket = BUCKETS.get(granularity)
+    if bucket is None:
+        raise ValueError(f"granularidade inválida: {granularity!r} (use {', '.join(GRANULARITIES)})")
+    if since:
+        # Alinha ao início do período, para o primeiro não sair parcial
+        since = conn.execute(f"SELECT {bucket} FROM (SELECT ? AS day)", (since,)).fetchone()[0]
+    where, params = [], []
+    for cond, value in (("source = ?", (source or "").lower()), ("day >= ?", since), ("day <= ?", until)):
+        if value:
+            where.append(cond)
+            params.append(value)
+    totals = conn.execute(
+        f"SELECT {bucket} AS start, SUM(jobs) FROM job_daily "
+        f"{'WHERE ' + ' AND '.join(where) if where else ''} GROUP BY start ORDER BY start",
+        params,
+    ).fetchall()
+    counts = {
+        start: (mentions, jobs)
+        for start, mentions, jobs in conn.execute(
+            f"SELECT {bucket} AS start, SUM(mentions), SUM(jobs) FROM skill_daily "
+            f"WHERE {' AND '.join(['skill_id = ?'] + where)} GROUP BY start",
+            [skill_id] + params,
+        )
+    }
+    return [TrendPoint(start, *counts.get(start, (0, 0)), total) for start, total in totals]
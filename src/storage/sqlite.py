@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Iterable, List, Optional
+from src.metrics import timed
+from src.scrapers.models import Job, utc_now
+from src.skills.matcher import SkillMatcher, default_matcher
+from src.skills.text import TEXT_VERSION, normalize_desc, normalize_job
+from . import rollups
+from .base import STORED_COLUMNS, JobStorage, TrendPoint, UpsertResult, job_day, job_key
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    "desc" TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    url TEXT,
+    desc_text TEXT NOT NULL DEFAULT '',
+    desc_hash TEXT NOT NULL DEFAULT '',
+    collected_at TEXT NOT NULL DEFAULT '',
+    posted_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta(name, value) VALUES ('revision', 0);
+"""
+
+_SELECT = (
+    'SELECT title, company, location, "desc", source, url, desc_text, desc_hash, collected_at, posted_at '
+    'FROM jobs ORDER BY id'
+)
+
+
+class SQLiteJobStorage(JobStorage):
+    """Vagas em SQLite (WAL), com chave única por URL e upsert transacional.
+
+    Cada escrita incrementa `meta.revision` na mesma transação, o que permite a
+    outros processos detectarem mudanças com uma consulta trivial. Na mesma
+    transação também atualiza as séries diárias de skills (ver `rollups.py`).
+    """
+
+    def __init__(self, path: str = "data/jobs.db", matcher: Optional[SkillMatcher] = None):
+        self.path = path
+        self.matcher = matcher or default_matcher()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            rollups.ensure(conn, self.matcher)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bancos antigos: adiciona colunas de texto limpo e de datas e preenche (ou refaz) as linhas."""
+        cols = {r[1] for r in conn.execute("PRAGMA table_info(jobs)")}
+        for col in ("desc_text", "desc_hash", "collected_at", "posted_at"):
+            if col not in cols:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} TEXT NOT NULL DEFAULT ''")
+        # Vagas gravadas antes das datas: contam como coletadas agora
+        if conn.execute("UPDATE jobs SET collected_at = ? WHERE collected_at = ''", (utc_now(),)).rowcount:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'revision'")
+        # Texto limpo de outra versão de `html_to_text`: recalcula todas as linhas
+        row = conn.execute("SELECT value FROM meta WHERE name = 'text_version'").fetchone()
+        where = "desc_hash = ''" if row is not None and row[0] == TEXT_VERSION else "1"
+        rows = []
+        for job_id, desc, old_hash in conn.execute(f'SELECT id, "desc", desc_hash FROM jobs WHERE {where}'):
+            text, new_hash = normalize_desc(desc)
+            if new_hash != old_hash:
+                rows.append((text, new_hash, job_id))
+        if rows:
+            conn.executemany("UPDATE jobs SET desc_text = ?, desc_hash = ? WHERE id = ?", rows)
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'revision'")
+        conn.execute("INSERT OR REPLACE INTO meta(name, value) VALUES ('text_version', ?)", (TEXT_VERSION,))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _begin(self, conn: sqlite3.Connection, result: UpsertResult) -> None:
+        # IMMEDIATE: a revisão lida aqui é garantidamente a anterior a esta escrita
+        conn.execute("BEGIN IMMEDIATE")
+        result.revision_before = self._revision(conn)
+        result.revision = result.revision_before
+
+    def _finish(self, conn: sqlite3.Connection, result: UpsertResult) -> None:
+        if result.total:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'revision'")
+            result.revision = self._revision(conn)
+
+    @timed("persist")
+    def upsert(self, jobs: Iterable[Job]) -> UpsertResult:
+        result = UpsertResult()
+        delta = rollups.RollupDelta(self.matcher)
+        now = utc_now()
+        conn = self._connect()
+        with conn:
+            self._begin(conn, result)
+            for job in jobs:
+                key = job_key(job)
+                normalize_job(job)
+                row = (
+                    job.title or "", job.company or "", job.location or "", job.desc or "",
+                    job.source or "", job.url, job.desc_text, job.desc_hash,
+                )
+                after = (job.source or "", job.location or "", job.desc_text)
+                prev = conn.execute(
+                    "SELECT id, source, location, desc_text, desc_hash, collected_at, posted_at FROM jobs WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if prev is not None:
+                    # A primeira coleta fica; a publicação só muda se a fonte informar outra
+                    collected, posted = prev[5] or job.collected_at or now, job.posted_at or prev[6]
+                    conn.execute(
+                        'UPDATE jobs SET title=?, company=?, location=?, "desc"=?, source=?, url=?, '
+                        'desc_text=?, desc_hash=?, collected_at=?, posted_at=? WHERE id=?',
+                        row + (collected, posted, prev[0]),
+                    )
+                    result.updated += 1
+                    if (prev[1], prev[2], prev[4]) != (after[0], after[1], job.desc_hash):
+                        result.changes.append(((prev[1], prev[2], prev[3]), after))
+                    day_before, day = job_day(prev[6], prev[5]), job_day(posted, collected)
+                    if (prev[1], day_before, prev[4]) != (after[0], day, job.desc_hash):
+                        delta.add(day_before, prev[1], prev[3], -1)
+                        delta.add(day, after[0], job.desc_text)
+                    continue
+                collected = job.collected_at or now
+                conn.execute(
+                    'INSERT INTO jobs(key, title, company, location, "desc", source, url, desc_text, desc_hash, '
+                    'collected_at, posted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key,) + row + (collected, job.posted_at),
+                )
+                result.inserted += 1
+                result.changes.append((None, after))
+                delta.add(job_day(job.posted_at, collected), after[0], job.desc_text)
+            delta.apply(conn)
+            self._finish(conn, result)
+        return result
+
+    @timed("persist")
+    def delete(self, keys: Iterable[str]) -> UpsertResult:
+        result = UpsertResult()
+        conn = self._connect()
+        with conn:
+            self._begin(conn, result)
+            delta = rollups.RollupDelta(self.matcher)
+            for key in keys:
+                prev = conn.execute(
+                    "SELECT id, source, location, desc_text, collected_at, posted_at FROM jobs WHERE key = ?", (key,)
+                ).fetchone()
+                if prev is None:
+                    continue
+                conn.execute("DELETE FROM jobs WHERE id = ?", (prev[0],))
+                result.removed += 1
+                result.changes.append(((prev[1], prev[2], prev[3]), None))
+                delta.add(job_day(prev[5], prev[4]), prev[1], prev[3], -1)
+            delta.apply(conn)
+            self._finish(conn, result)
+        return result
+
+    def load_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+        df = pd.read_sql_query(_SELECT, self._connect())
+        return df[STORED_COLUMNS].fillna("")
+
+    def skill_trend(
+        self,
+        skill_id: int,
+        granularity: str = "week",
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[TrendPoint]:
+        return rollups.trend(self._connect(), skill_id, granularity, source, since, until)
+
+    def rebuild_rollups(self) -> None:
+        """Recalcula as séries a partir das vagas gravadas (o upsert já as mantém)."""
+        conn = self._connect()
+        with conn:
+            rollups.rebuild(conn, self.matcher)
+
+    @staticmethod
+    def _revision(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'revision'").fetchone()
+        return row[0] if row else 0
+
+    def revision(self) -> int:
+        return self._revision(self._connect())
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
@@ -0,0 +1,209 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable, Iterable, List, Optional
+import numpy as np
+from src.metrics import timed
+from src.scrapers.models import Job
+from src.skills.aggregates import SkillAggregates, save_aggregates
+from src.skills.matrix import SkillMatrix
+from .base import COLUMNS, STORED_COLUMNS, JobStorage, UpsertResult, job_key
+from .index import TextIndex
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.dedup import Deduplicator
+
+log = logging.getLogger(__name__)
+
+# Colunas em minúsculas pré-computadas para os filtros (descrição já sem HTML)
+LOWER_COLUMNS = {"title": "title_l", "desc_text": "desc_l", "location": "location_l", "source": "source_l"}
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    """Visão imutável das vagas carregadas; nunca é alterada depois de publicada."""
+    df: "pd.DataFrame"
+    skills: SkillMatrix
+    text_index: TextIndex
+    location_index: TextIndex
+    version: int
+    signature: Hashable
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    def jobs(self) -> "pd.DataFrame":
+        """Somente as colunas canônicas (sem as auxiliares em minúsculas)."""
+        return self.df[COLUMNS]
+
+
+def _prepare(df: "pd.DataFrame") -> "pd.DataFrame":
+    for col in STORED_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[STORED_COLUMNS].fillna("").astype(str)
+    for col, lower in LOWER_COLUMNS.items():
+        df[lower] = df[col].str.lower()
+    return df.reset_index(drop=True)
+
+
+def _row_keys(df: "pd.DataFrame", columns: List[str]) -> np.ndarray:
+    """Impressão de 64 bits do conteúdo indexado de cada linha (vetorizada)."""
+    import pandas as pd
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+class JobStore:
+    """Cache de vagas por processo com recarga a quente.
+
+    O armazenamento só é relido quando `storage.revision()` muda (escritas deste
+    ou de outro processo) ou após `invalidate()`. Cada recarga publica um novo
+    `JobSnapshot` por troca de referência, então quem já pegou um snapshot
+    continua vendo um frame completo e consistente.
+
+    Também mantém `SkillAggregates` (global e por fonte/localização). Escritas
+    feitas por este store aplicam só o delta das linhas alteradas; o recálculo
+    completo só acontece quando outro processo escreveu.
+
+    Com `dedup`, cada `upsert` descarta duplicatas (exatas ou quase) de vagas já
+    gravadas, e uma versão melhor substitui a canônica antiga.
+
+    Com `artifact`, os agregados são regravados nesse JSON a cada escrita (é o
+    que o dashboard lê, sem reanalisar o histórico).
+    """
+
+    def __init__(
+        self, storage: JobStorage, dedup: Optional["Deduplicator"] = None, artifact: Optional[str] = None
+    ):
+        self.storage = storage
+        self.dedup = dedup
+        self.artifact = artifact
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[JobSnapshot] = None
+        self._stale = False
+        self._aggregates: Optional[SkillAggregates] = None
+
+    def _signature(self) -> Hashable:
+        return self.storage.revision()
+
+    def _load(self) -> "pd.DataFrame":
+        return _prepare(self.storage.load_frame())
+
+    def snapshot(self) -> JobSnapshot:
+        snap = self._snapshot
+        sig = self._signature()
+        if snap is not None and snap.signature == sig and not self._stale:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            sig = self._signature()
+            if snap is not None and snap.signature == sig and not self._stale:
+                return snap
+            with timed("snapshot"):
+                df = self._load()
+                # Vetores de descrições já vistas (mesmo hash) são reaproveitados
+                skills = SkillMatrix.build(
+                    df["desc_text"].tolist(), hashes=df["desc_hash"].tolist(),
+                    previous=snap.skills if snap is not None else None,
+                )
+                # Índices: só linhas novas ou alteradas são tokenizadas de novo
+                text_index = TextIndex.build(
+                    df["title_l"] + " " + df["desc_l"], keys=_row_keys(df, ["title_l", "desc_hash"]),
+                    previous=snap.text_index if snap is not None else None,
+                )
+                location_index = TextIndex.build(
+                    df["location_l"], keys=_row_keys(df, ["location_l"]),
+                    previous=snap.location_index if snap is not None else None,
+                )
+            self._version += 1
+            snap = JobSnapshot(
+                df=df,
+                skills=skills,
+                text_index=text_index,
+                location_index=location_index,
+                version=self._version,
+                signature=sig,
+            )
+            self._snapshot = snap
+            self._stale = False
+        return snap
+
+    def invalidate(self) -> None:
+        """Força recarga na próxima leitura."""
+        with self._lock:
+            self._stale = True
+
+    def aggregates(self) -> SkillAggregates:
+        """Agregados em dia com o armazenamento (recalcula só se outro processo escreveu)."""
+        agg = self._aggregates
+        sig = self._signature()
+        if agg is not None and agg.revision == sig:
+            return agg
+        snap = self.snapshot()
+        with self._lock:
+            agg = self._aggregates
+            if agg is None or agg.revision != snap.signature:
+                agg = SkillAggregates.from_matrix(
+                    snap.skills, snap.df["source"].tolist(), snap.df["location"].tolist(), snap.signature
+                )
+                self._aggregates = agg
+        return agg
+
+    def _apply_delta(self, result: UpsertResult) -> None:
+        with self._lock:
+            agg = self._aggregates
+            if agg is None:
+                return
+            if result.revision_before is None or agg.revision != result.revision_before:
+                # Perdemos alguma escrita no meio: próximo `aggregates()` recalcula
+                return
+            agg.apply_changes(result.changes, result.revision)
+
+    def upsert(self, jobs: Iterable[Job]) -> UpsertResult:
+        """Grava vagas pelo armazenamento, aplica o delta nos agregados e invalida o cache."""
+        dd = None
+        if self.dedup is not None:
+            # Só decide: o índice de dedup muda depois que as vagas forem gravadas
+            dd = self.dedup.resolve(jobs, stage=True)
+            jobs = dd.unique
+        result = self.storage.upsert(jobs)
+        if result.total:
+            self._apply_delta(result)
+        if dd is not None:
+            result.duplicates = len(dd.duplicates)
+            written = {job_key(j) for j in dd.unique}
+            replaced = [k for k in dd.replaced if k not in written]
+            if replaced:
+                # Canônicas antigas saem depois que as substitutas já estão gravadas
+                removed = self.storage.delete(replaced)
+                self._apply_delta(removed)
+                result.removed = removed.removed
+            self.dedup.commit(dd)
+        if result.total:
+            self.invalidate()
+            self.publish()
+        return result
+
+    def remove(self, keys: Iterable[str], forget: bool = True) -> UpsertResult:
+        """Remove vagas pela chave (`job_key`) com o mesmo tratamento de `upsert`."""
+        keys = list(keys)
+        if forget and self.dedup is not None:
+            self.dedup.forget(keys)
+        result = self.storage.delete(keys)
+        if result.total:
+            self._apply_delta(result)
+            self.invalidate()
+            self.publish()
+        return result
+
+    def publish(self) -> None:
+        """Regrava o artefato de agregados (se configurado); falhas não derrubam a escrita."""
+        if not self.artifact:
+            return
+        try:
+            save_aggregates(self.aggregates(), self.artifact)
+        except OSError as e:
+            log.warning("Não foi possível gravar %s: %s", self.artifact, e)
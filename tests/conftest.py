@@ -0,0 +1,56 @@
+from typing import Iterable, List, Optional
+import pytest
+from src.scrapers.base import BaseScraper
+from src.scrapers.models import Job
+from src.scrapers.registry import ScraperRegistry
+
+
+class FakeScraper(BaseScraper):
+    """Fonte em memória: devolve as vagas dadas ou levanta `error`."""
+
+    timeout = 5
+
+    def __init__(self, jobs: Iterable[Job] = (), error: Optional[Exception] = None):
+        self.jobs = list(jobs)
+        self.error = error
+
+    def search(self, query: str, location: str = "Brasil", limit: int = 50) -> List[Job]:
+        if self.error is not None:
+            raise self.error
+        return self.jobs[:limit]
+
+
+@pytest.fixture
+def scrapers() -> ScraperRegistry:
+    return ScraperRegistry(builtins=(), plugins=False)
+
+
+@pytest.fixture
+def mock_http(tmp_path, monkeypatch):
+    """Troca a rede dos scrapers por `httpx.MockTransport(handler)`, com cache HTTP no diretório temporário."""
+    import httpx
+    from src.scrapers import http
+
+    monkeypatch.setattr(http, "CACHE", http.HttpCache(str(tmp_path / "http_cache")))
+
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(http, "get_client", lambda: client)
+        return client
+
+    return install
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, scrapers):
+    """API com bancos em um diretório temporário e o registro de fontes do teste."""
+    from fastapi.testclient import TestClient
+    import api
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(api, "SCRAPERS", scrapers)
+    for name in ("STORAGE", "STORE", "SCHEDULER"):
+        monkeypatch.setattr(api, name, None)
+    api.SKILLS_CACHE.clear()
+    with TestClient(api.app) as c:
+        yield c
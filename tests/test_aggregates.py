@@ -0,0 +1,99 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.scrapers.models import Job
+from src.skills.aggregates import SkillAggregates
+from src.storage.sqlite import SQLiteJobStorage
+from src.storage.store import JobStore
+
+WORDS = ["Python", "React", "Java", "Docker", "AWS", "Kubernetes", "liderança", "SQL", "vaga", "time"]
+SOURCES = ["LinkedIn", "linkedin", "Indeed", "remotive"]
+LOCATIONS = ["Remoto", "São Paulo", "são paulo", "Recife"]
+
+
+def random_job(rng: random.Random, n: int) -> Job:
+    return Job(
+        title=f"Dev {n}", company="Acme", location=rng.choice(LOCATIONS),
+        desc=" ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+        source=rng.choice(SOURCES), url=f"https://example.com/{n}",
+    )
+
+
+def facets(agg: SkillAggregates):
+    """Facetas não vazias: chave -> (vagas, contagens não nulas)."""
+    out = {}
+    for key in set(agg._counts) | set(agg._jobs):
+        vec = agg._counts.get(key, np.zeros(0, dtype=np.int64))
+        ids = np.flatnonzero(vec)
+        jobs = agg._jobs.get(key, 0)
+        if jobs or len(ids):
+            out[key] = (jobs, dict(zip(ids.tolist(), vec[ids].tolist())))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_deltas_match_full_recompute(tmp_path, seed):
+    rng = random.Random(seed)
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    store = JobStore(storage)
+    agg = store.aggregates()
+    for _ in range(20):
+        store.upsert([random_job(rng, rng.randrange(40)) for _ in range(rng.randint(1, 10))])
+        if rng.random() < 0.3:
+            store.remove([f"https://example.com/{rng.randrange(40)}" for _ in range(3)])
+        # O mesmo objeto: as escritas aplicaram o delta em vez de recalcular
+        assert store.aggregates() is agg
+        assert agg.revision == storage.revision()
+        assert facets(agg) == facets(JobStore(storage).aggregates())
+
+
+def test_write_from_other_process_recomputes(tmp_path):
+    rng = random.Random(7)
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    store = JobStore(storage)
+    store.upsert([random_job(rng, n) for n in range(10)])
+    agg = store.aggregates()
+    SQLiteJobStorage(storage.path).upsert([random_job(rng, n) for n in range(5, 15)])
+    store.upsert([random_job(rng, 20)])
+    fresh = store.aggregates()
+    assert fresh is not agg
+    assert facets(fresh) == facets(JobStore(storage).aggregates())
+
+
+def test_readers_never_see_half_a_batch(tmp_path):
+    import threading
+
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    store = JobStore(storage)
+    agg = store.aggregates()
+    rng = random.Random(3)
+    done = threading.Event()
+    errors = []
+
+    def read():
+        while not done.is_set():
+            try:
+                # Cada lote tem 10 vagas novas: o total global anda de 10 em 10
+                assert agg.jobs() % 10 == 0
+                agg.facets("source_location")
+                agg.combine(agg.facets("location"))
+            except Exception as e:  # noqa: BLE001 - repassado ao teste
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for batch in range(30):
+        jobs = [random_job(rng, n) for n in range(batch * 10, batch * 10 + 10)]
+        for i, j in enumerate(jobs):
+            # Locais novos a cada vaga: facetas surgem durante a leitura
+            j.location = f"Cidade {batch}-{i}"
+        store.upsert(jobs)
+    done.set()
+    for t in readers:
+        t.join()
+    assert errors == []
+    assert agg.jobs() == 300
@@ -0,0 +1,71 @@
+"""`aggregate_series` (vetorizado) tem de bater com `aggregate_descriptions` (por descrição)."""
+import os
+import random
+import sys
+from collections import Counter
+from typing import Dict, List
+import pandas as pd
+import pytest
+from benchmarks.corpus import generate
+from src.skills.analyzer import aggregate_descriptions, aggregate_series
+from src.skills.matcher import SkillMatcher
+from src.skills.text import html_to_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_CSV = os.path.join(ROOT, "data", "jobs.csv")
+
+
+def per_description(texts: List[str], matcher: SkillMatcher) -> Dict[str, Counter]:
+    out = {cat: Counter() for cat in matcher.categories}
+    for text in texts:
+        for cat, counts in matcher.classify(text).items():
+            out[cat].update(counts)
+    return out
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def tokenizer(request, monkeypatch):
+    """Roda cada teste com e sem pyarrow (fallback `str.findall` + `explode`)."""
+    if request.param == "pandas":
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        monkeypatch.setitem(sys.modules, "pyarrow.compute", None)
+    else:
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+def test_jobs_csv(tokenizer):
+    descs = pd.read_csv(JOBS_CSV)["desc"].fillna("").astype(str)
+    texts = [html_to_text(d) for d in descs]
+    assert aggregate_series(pd.Series(texts)) == aggregate_descriptions(texts)
+
+
+def test_synthetic_corpus(tokenizer):
+    texts = generate(2_000, seed=7).texts()
+    assert aggregate_series(texts) == aggregate_descriptions(texts)
+
+
+def test_raw_html(tokenizer):
+    descs = generate(500, seed=3).columns["desc"]
+    descs += ["<p>React.</p><ul><li>Node.js</li><li>k8s</li></ul>", "<b>C#</b> e <i>.NET</i>", "", "react."]
+    assert aggregate_series(descs) == aggregate_descriptions(descs)
+
+
+def test_missing_values(tokenizer):
+    series = pd.Series(["python e docker", None, float("nan"), "Docker"], dtype=object)
+    texts = ["python e docker", "", "", "Docker"]
+    assert aggregate_series(series) == aggregate_descriptions(texts)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_lexicon(tokenizer, seed):
+    # Léxico com frases sobrepostas ("a b", "a b c", "b c"), termo em duas categorias e aliases
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(12)] + ["c++", "c#", "node.js", "x_y"]
+    phrases = {" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(25)}
+    cats = {"a": sorted(phrases)[::2], "b": sorted(phrases)[1::2] + [sorted(phrases)[0]]}
+    aliases = {f"alias{i}": rng.choice(sorted(phrases)) for i in range(4)}
+    matcher = SkillMatcher(cats, aliases)
+    vocab = words + list(aliases) + ["ruído", "Outro.", "W1", "..."]
+    texts = [" ".join(rng.choice(vocab) for _ in range(rng.randint(0, 40))) for _ in range(300)]
+    assert aggregate_series(texts, matcher) == per_description(texts, matcher)
@@ -0,0 +1,45 @@
+from src.scrapers.models import Job
+
+
+def job(n, desc, source="remotive"):
+    return Job(f"Dev {n}", "Acme", "Remoto", desc, source, f"https://example.com/{n}")
+
+
+def test_etag_revalidation_and_invalidation(client):
+    import api
+
+    api.STORE.upsert([job(1, "Python e Django"), job(2, "React")])
+    first = client.get("/skills")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    cached = client.get("/skills", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    # Outra consulta, outro ETag
+    assert client.get("/skills", params={"q": "react"}).headers["ETag"] != etag
+    # Lista de validadores (vários caches na frente) também casa
+    assert client.get("/skills", headers={"If-None-Match": f'W/"x", {etag}'}).status_code == 304
+
+    version = client.get("/skills/cache").json()["data_version"]
+    api.STORE.upsert([job(3, "Kubernetes e Go")])
+    after = client.get("/skills", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert after.json() != first.json()
+    assert client.get("/skills/cache").json()["data_version"] > version
+    assert client.get("/skills", headers={"If-None-Match": after.headers["ETag"]}).status_code == 304
+
+
+def test_write_from_other_process_changes_etag(client):
+    import api
+    from src.storage.sqlite import SQLiteJobStorage
+
+    api.STORE.upsert([job(1, "Python")])
+    etag = client.get("/skills").headers["ETag"]
+    # Outra instância do armazenamento (como outro worker) grava no mesmo banco
+    SQLiteJobStorage(api.STORAGE.path).upsert([job(2, "Rust")])
+    resp = client.get("/skills", headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and resp.headers["ETag"] != etag
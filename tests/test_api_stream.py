@@ -0,0 +1,86 @@
+"""`POST /scrape/multiple?stream=true`: NDJSON por fonte, erros como registros e "summary" sempre no fim."""
+import json
+from typing import Any, Dict, List
+import api
+from src.scrapers.models import Job
+from .conftest import FakeScraper
+
+DESC = "Procuramos pessoa desenvolvedora com React, TypeScript e Docker para o time de produto. " * 3
+
+
+def _records(resp) -> List[Dict[str, Any]]:
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+
+def _post(client, *sources: str, save: bool = True):
+    params = [("query", "react"), ("stream", "true"), ("save_to_csv", str(save).lower())]
+    params += [("sources", s) for s in sources]
+    return client.post("/scrape/multiple", params=params)
+
+
+def test_stream_dedups_across_sources_and_ends_with_summary(client, scrapers):
+    scrapers["a"] = FakeScraper([Job("Frontend Dev", "Acme", "SP", DESC, "a", "https://a/1"),
+                                 Job("Backend Dev", "Acme", "SP", "Python e Django", "a", "https://a/2")])
+    scrapers["b"] = FakeScraper([Job("Frontend Dev", "Acme", "SP", DESC, "b", "https://b/1")])
+    records = _records(_post(client, "a", "b"))
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert [r["type"] for r in records].count("summary") == 1
+    assert summary["total_jobs_found"] == 2
+    assert len([r for r in records if r["type"] == "job"]) == 2
+    assert summary["saved_to_csv"] is True
+    # A duplicata de "b" não conta: 3 menções de uma vaga só
+    assert dict(summary["skills"]["dev"])["react"] == 3
+    assert api.STORAGE.count() == 2
+
+
+def test_scraper_failure_is_reported_per_source(client, scrapers):
+    scrapers["ok"] = FakeScraper([Job("Frontend Dev", "Acme", "SP", DESC, "ok", "https://ok/1")])
+    scrapers["bad"] = FakeScraper(error=RuntimeError("fora do ar"))
+    records = _records(_post(client, "ok", "bad", save=False))
+    by_source = {r["source"]: r for r in records if r["type"] == "source"}
+    assert by_source["bad"]["success"] is False and "fora do ar" in by_source["bad"]["error"]
+    assert by_source["ok"]["success"] is True
+    assert records[-1]["type"] == "summary" and records[-1]["total_jobs_found"] == 1
+
+
+def test_processing_and_save_errors_emit_error_records(client, scrapers, monkeypatch):
+    scrapers["a"] = FakeScraper([Job("Frontend Dev", "Acme", "SP", DESC, "a", "https://a/1")])
+    scrapers["b"] = FakeScraper([Job("Backend Dev", "Beta", "RJ", "Python e Django", "b", "https://b/1")])
+
+    def broken_upsert(jobs):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(api.STORE, "upsert", broken_upsert)
+    real = api.aggregate_descriptions
+
+    def aggregate(texts):
+        if any("Django" in t for t in texts):
+            raise ValueError("descrição inválida")
+        return real(texts)
+
+    monkeypatch.setattr(api, "aggregate_descriptions", aggregate)
+    records = _records(_post(client, "a", "b"))
+    errors = {r["source"]: r["detail"] for r in records if r["type"] == "error"}
+    assert "disco cheio" in errors["a"]
+    assert "descrição inválida" in errors["b"]
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert summary["results_by_source"]["b"]["success"] is False
+    assert summary["total_jobs_found"] == 1
+    assert summary["saved_to_csv"] is False
+
+
+def test_failure_outside_sources_still_sends_summary(client, scrapers, monkeypatch):
+    scrapers["a"] = FakeScraper([])
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("agendamento falhou")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(api, "iter_sources", broken)
+    records = _records(_post(client, "a"))
+    assert records[0] == {"type": "error", "source": None, "detail": "RuntimeError: agendamento falhou"}
+    assert records[-1]["type"] == "summary" and records[-1]["total_jobs_found"] == 0
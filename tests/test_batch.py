@@ -0,0 +1,19 @@
+from src.skills import batch
+from src.skills.analyzer import aggregate_descriptions
+
+DESCS = ["Python e React", "Java, Spring e Docker", "", "python com Kubernetes e AWS"] * 10
+
+
+def test_pool_per_worker_count():
+    expected = aggregate_descriptions(DESCS)
+    for workers in (2, 3, 2):
+        assert batch.aggregate_batch(DESCS, workers=workers, chunk_size=7, threshold=0) == expected
+    assert {2, 3} <= set(batch._EXECUTORS)
+
+
+def test_pool_stays_usable_after_other_count():
+    # Uma thread que já pegou o pool de 2 continua podendo usá-lo
+    first = batch._executor(2)
+    batch._executor(3)
+    assert list(first.map(len, ["ab", "c"])) == [2, 1]
+    assert batch._executor(2) is first
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.scrapers.browser_pool import BrowserPool
+
+
+def pool_threads():
+    return [t for t in threading.enumerate() if t.name == "browser-pool"]
+
+
+def test_shutdown_stops_loop_and_thread():
+    before = len(pool_threads())
+    pool = BrowserPool()
+    for _ in range(3):
+        # Reinício no mesmo processo: cada ciclo sobe e encerra um loop próprio
+        assert pool.run(asyncio.sleep(0, "ok"), timeout=5) == "ok"
+        loop, thread = pool._loop, pool._thread
+        assert thread.is_alive()
+        pool.shutdown()
+        assert not thread.is_alive()
+        assert loop.is_closed()
+        assert pool._loop is None and pool._thread is None
+    assert len(pool_threads()) == before
+    pool.shutdown()  # sem loop: nada a fazer
+
+
+def test_arun_after_restart():
+    pool = BrowserPool()
+
+    async def main():
+        return await pool.arun(asyncio.sleep(0, 42))
+
+    assert asyncio.run(main()) == 42
+    pool.shutdown()
+    assert asyncio.run(main()) == 42
+    pool.shutdown()
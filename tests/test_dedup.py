@@ -0,0 +1,129 @@
+import pytest
+
+from src.dedup import Deduplicator, MergePolicy, SQLiteDedupIndex
+from src.scrapers.models import Job
+from src.skills.text import normalize_job
+from src.storage.base import job_key
+from src.storage.sqlite import SQLiteJobStorage
+from src.storage.store import JobStore
+
+DESC = (
+    "Buscamos pessoa desenvolvedora backend para atuar com Python, Django e PostgreSQL "
+    "em um time de produto, com deploy em AWS, Docker e Kubernetes e revisão de código diária."
+)
+
+
+def job(source, url=None, desc=DESC, title="Desenvolvedor Backend Python", company="Acme", location="Remoto"):
+    return normalize_job(Job(title=title, company=company, location=location, desc=desc, source=source, url=url))
+
+
+@pytest.mark.parametrize("first, second", [
+    (job("indeed", "https://indeed.com/1"), job("LinkedIn", "https://linkedin.com/1")),
+    (job("LinkedIn", "https://linkedin.com/1"), job("indeed", "https://indeed.com/1")),
+])
+def test_source_priority_is_case_insensitive(first, second):
+    res = Deduplicator().resolve([first, second])
+    assert [j.source for j in res.unique] == ["LinkedIn"]
+    assert [d.kind for d in res.duplicates] == ["exact"]
+    assert res.replaced == []
+
+
+def test_url_beats_source():
+    dedup = Deduplicator()
+    assert dedup.resolve([job("getonboard")]).unique[0].source == "getonboard"
+    res = dedup.resolve([job("remotive", "https://remotive.com/1")])
+    assert res.replaced == [job_key(job("getonboard"))]
+    # Empate (URL, texto e fonte iguais) mantém a já gravada
+    res = dedup.resolve([job("Remotive", "https://remotive.com/2")])
+    assert res.unique == [] and res.duplicates[0].canonical == "https://remotive.com/1"
+
+
+def test_merge_policy_order():
+    policy = MergePolicy()
+    existing = Deduplicator.entry(job("getonboard", "https://getonboard.com/1"))
+    # Descrição mais longa pesa mais que a fonte; mais curta perde mesmo com fonte melhor
+    assert policy.prefer_new(existing, job("remotive", "https://remotive.com/1", DESC + " Inglês."))
+    assert not policy.prefer_new(
+        Deduplicator.entry(job("remotive", "https://remotive.com/1", DESC + " Inglês.")),
+        job("GetOnBoard", "https://getonboard.com/1"),
+    )
+    assert policy.prefer_new(Deduplicator.entry(job("Glassdoor", "https://glassdoor.com/1")), job("LINKEDIN", "u"))
+    assert not policy.prefer_new(existing, job("linkedin", "https://linkedin.com/1"))
+    # Fonte desconhecida fica atrás de todas as conhecidas
+    assert not policy.prefer_new(Deduplicator.entry(job("remotive", "u")), job("outra", "v"))
+
+
+def test_keep_first():
+    dedup = Deduplicator(policy=MergePolicy(keep_first=True))
+    res = dedup.resolve([job("remotive", "https://remotive.com/1"), job("linkedin", "https://linkedin.com/1")])
+    assert [j.source for j in res.unique] == ["remotive"]
+
+
+def test_store_replaces_canonical_and_commits_after_write(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    index = SQLiteDedupIndex(str(tmp_path / "dedup.db"))
+    store = JobStore(storage, dedup=Deduplicator(index))
+    store.upsert([job("indeed", "https://indeed.com/1")])
+
+    res = store.upsert([job("LinkedIn", "https://linkedin.com/1"), job("glassdoor", "https://glassdoor.com/1")])
+    assert (res.inserted, res.removed, res.duplicates) == (1, 1, 1)
+    assert storage.load_frame()["source"].tolist() == ["LinkedIn"]
+    assert index.count() == 1
+
+    # Falha na gravação: o índice continua como estava
+    def fail(jobs):
+        raise RuntimeError("disco cheio")
+
+    storage.upsert = fail
+    with pytest.raises(RuntimeError):
+        store.upsert([job("getonboard", "https://getonboard.com/1")])
+    assert [e.source for e in index.by_fingerprint(Deduplicator.entry(job("x")).fingerprint)] == ["LinkedIn"]
+
+
+def test_other_location_or_company_is_not_a_duplicate(tmp_path):
+    jobs = [
+        job("linkedin", "https://linkedin.com/1", location="São Paulo, SP"),
+        job("linkedin", "https://linkedin.com/2", location="Recife, PE"),
+        job("linkedin", "https://linkedin.com/3", company="Outra SA", location="Curitiba"),
+        job("indeed", "https://indeed.com/4", company="Outra SA", location="Curitiba"),
+        # Mesmo texto quase igual (SimHash próximo) em outro local
+        job("remotive", "https://remotive.com/5", DESC + " Vaga híbrida.", location="Florida, Estados Unidos"),
+        job("remotive", "https://remotive.com/6", DESC + " Vaga híbrida!", location="San Francisco, Califórnia, Estados Unidos"),
+    ]
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    store = JobStore(storage, dedup=Deduplicator(SQLiteDedupIndex(str(tmp_path / "dedup.db"))))
+    res = store.upsert(jobs)
+    assert (res.inserted, res.removed, res.duplicates) == (5, 0, 1)
+    assert sorted(storage.load_frame()["url"]) == [
+        "https://linkedin.com/1", "https://linkedin.com/2", "https://linkedin.com/3",
+        "https://remotive.com/5", "https://remotive.com/6",
+    ]
+
+
+@pytest.mark.parametrize("company, other, url, merged", [
+    ("Acme Inc.", "ACME", None, True),
+    ("Acme Ltda", "acme tecnologia", None, True),
+    ("Acme", "Outra SA", None, False),
+    # Sem empresa de um lado: vale o domínio da URL
+    ("", "Acme", "https://jobs.acme.com/1", True),
+    ("", "Acme", "https://linkedin.com/1", False),
+    ("", "", None, True),
+])
+def test_company_match_is_loose(company, other, url, merged):
+    res = Deduplicator().resolve([job("indeed", url, company=company), job("indeed", "https://x.com/2", company=other)])
+    assert len(res.unique) == (1 if merged else 2)
+
+
+def test_old_index_format_is_rebuilt(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "dedup.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)")
+    conn.execute("INSERT INTO entries VALUES ('k', 'fp')")
+    conn.commit()
+    conn.close()
+    index = SQLiteDedupIndex(path)
+    assert index.count() == 0
+    index.add(Deduplicator.entry(job("indeed", "https://indeed.com/1")))
+    assert SQLiteDedupIndex(path).count() == 1
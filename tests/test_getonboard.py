@@ -0,0 +1,67 @@
+import httpx
+import pytest
+
+from src.scrapers.getonboard import GetOnBoardScraper
+
+
+def item(n):
+    return {"attributes": {"title": f"Vaga {n}", "company": {"name": "Acme"}, "permalink": f"https://gob.com/{n}"}}
+
+
+def server(total, cap, total_pages=True, fail=None):
+    """API falsa com `total` vagas e no máximo `cap` por página; `fail` dá quantos 503 cada página devolve antes."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        per_page = min(int(request.url.params["per_page"]), cap)
+        calls.append(page)
+        if fail and calls.count(page) <= fail.get(page, 0):
+            return httpx.Response(503, headers={"Retry-After": "0.01"})
+        start = (page - 1) * per_page
+        body = {"data": [item(n) for n in range(start, min(start + per_page, total))]}
+        if total_pages:
+            body["meta"] = {"total_pages": -(-total // per_page)}
+        return httpx.Response(200, json=body)
+
+    return handler, calls
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setenv("HTTP_CACHE", "0")
+
+
+@pytest.mark.parametrize("total_pages", [True, False])
+def test_server_page_cap_keeps_every_page(mock_http, total_pages):
+    handler, calls = server(total=130, cap=20, total_pages=total_pages)
+    mock_http(handler)
+    jobs = GetOnBoardScraper(per_page=50).search("python", limit=100)
+    assert [j.title for j in jobs] == [f"Vaga {n}" for n in range(100)]
+    assert sorted(set(calls)) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("total_pages", [True, False])
+def test_stops_at_the_last_page(mock_http, total_pages):
+    handler, calls = server(total=45, cap=20, total_pages=total_pages)
+    mock_http(handler)
+    # Sem `total_pages` as levas são às cegas (até `concurrency` páginas) e param na página curta
+    jobs = GetOnBoardScraper(concurrency=2, per_page=20).search("python", limit=100)
+    assert len(jobs) == 45
+    assert sorted(calls) == ([1, 2, 3] if total_pages else [1, 2, 3, 4])
+
+
+def test_retries_transient_errors(mock_http):
+    handler, calls = server(total=40, cap=20, fail={2: 2})
+    mock_http(handler)
+    jobs = GetOnBoardScraper(per_page=20).search("python", limit=40)
+    assert len(jobs) == 40
+    assert calls.count(2) == 3
+
+
+def test_failed_page_is_skipped(mock_http):
+    # Página 2 falha em todas as tentativas: as outras continuam valendo
+    handler, calls = server(total=60, cap=20, fail={2: 10})
+    mock_http(handler)
+    jobs = GetOnBoardScraper(per_page=20).search("python", limit=60)
+    assert [j.title for j in jobs] == [f"Vaga {n}" for n in list(range(20)) + list(range(40, 60))]
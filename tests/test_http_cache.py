@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.scrapers import http
+
+URL = "https://api.example.com/jobs"
+PARAMS = {"q": "python"}
+
+
+@pytest.fixture
+def origin(mock_http, monkeypatch):
+    """Servidor falso: devolve `state["status"]` e o corpo atual; guarda as requisições recebidas."""
+    monkeypatch.setenv("HTTP_CACHE", "1")
+    monkeypatch.setitem(http.POLICIES, "teste", http.CachePolicy(ttl=60, stale=60))
+    state = {"status": 200, "body": b'{"v": 1}', "requests": [], "error": None}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        if state["error"] is not None:
+            raise state["error"]
+        if state["status"] == 200 and request.headers.get("if-none-match") == '"v1"' and state["body"] == b'{"v": 1}':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(state["status"], content=state["body"], headers={"ETag": '"v1"'})
+
+    mock_http(handler)
+    return state
+
+
+def get():
+    return asyncio.run(http.cached_get(URL, params=PARAMS, source="teste"))
+
+
+def age(seconds: float) -> None:
+    """Envelhece a cópia em disco."""
+    key = http.HttpCache.key(URL, PARAMS)
+    entry = http.CACHE.load(key)
+    entry.stored_at = time.time() - seconds
+    http.CACHE.touch(key, entry)
+
+
+def test_fresh_copy_skips_network(origin):
+    first = get()
+    assert (first.origin, first.json()) == ("network", {"v": 1})
+    second = get()
+    assert (second.origin, second.json()) == ("fresh", {"v": 1})
+    assert len(origin["requests"]) == 1
+
+
+def test_stale_while_revalidate(origin):
+    get()
+    age(90)
+    origin["body"] = b'{"v": 2}'
+
+    async def stale_then_wait():
+        resp = await http.cached_get(URL, params=PARAMS, source="teste")
+        await asyncio.gather(*http._BACKGROUND)
+        return resp
+
+    resp = asyncio.run(stale_then_wait())
+    # Servida na hora a cópia velha; a revalidação em segundo plano grava a nova
+    assert (resp.origin, resp.json()) == ("stale", {"v": 1})
+    assert len(origin["requests"]) == 2
+    assert (get().origin, get().json()) == ("fresh", {"v": 2})
+
+
+def test_expired_copy_is_revalidated_with_304(origin):
+    get()
+    age(200)
+    resp = get()
+    assert (resp.origin, resp.json()) == ("revalidated", {"v": 1})
+    assert origin["requests"][-1].headers["if-none-match"] == '"v1"'
+    # 304 renova a cópia: a próxima leitura sai do disco
+    assert get().origin == "fresh"
+    assert len(origin["requests"]) == 2
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_origin_error_serves_expired_copy(origin, status):
+    get()
+    age(200)
+    origin["status"] = status
+    resp = get()
+    assert (resp.status_code, resp.origin, resp.json()) == (200, "stale", {"v": 1})
+
+
+def test_network_error_serves_expired_copy(origin):
+    get()
+    age(200)
+    origin["error"] = httpx.ConnectError("sem rede")
+    assert get().origin == "stale"
+
+
+def test_without_copy_errors_pass_through(origin):
+    origin["status"] = 503
+    assert get().status_code == 503
+    origin["error"] = httpx.ConnectError("sem rede")
+    with pytest.raises(httpx.ConnectError):
+        get()
@@ -0,0 +1,45 @@
+"""`TextIndex`: montagem incremental igual à completa e cache de buscas parciais limitado."""
+import random
+import numpy as np
+import pandas as pd
+from src.storage import index as index_module
+from src.storage.index import TextIndex
+
+WORDS = ["react", "reactjs", "python", "django", "docker", "kubernetes", "aws", "são", "paulo", "remote", "node.js", "c#"]
+
+
+def _keys(texts):
+    return pd.util.hash_pandas_object(pd.Series(texts, dtype=object), index=False).to_numpy()
+
+
+def _same(a: TextIndex, b: TextIndex, queries) -> None:
+    assert a.n_rows == b.n_rows
+    for q in queries:
+        for partial in (False, True):
+            assert np.array_equal(a.mask(q, partial), b.mask(q, partial)), (q, partial)
+
+
+def test_incremental_matches_full_build():
+    rng = random.Random(0)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(0, 6))) for _ in range(300)]
+    queries = WORDS + ["reac", "paul", "react docker", "ubern", "inexistente", "c"]
+    idx = TextIndex.build(texts, keys=_keys(texts))
+    for step in range(30):
+        # Inclusões no fim, remoções e alterações no meio, e textos repetidos
+        texts = list(texts)
+        for _ in range(rng.randint(0, 10)):
+            texts.pop(rng.randrange(len(texts)))
+        for _ in range(rng.randint(0, 10)):
+            texts[rng.randrange(len(texts))] = " ".join(rng.choices(WORDS + [f"novo{step}"], k=3))
+        texts += [rng.choice(texts) for _ in range(rng.randint(0, 10))]
+        idx = TextIndex.build(pd.Series(texts, dtype=object), keys=_keys(texts), previous=idx)
+        _same(idx, TextIndex.build(texts), queries + [f"novo{step}"])
+
+
+def test_partial_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(index_module, "PARTIAL_CACHE_SIZE", 8)
+    idx = TextIndex.build([f"token{i} react" for i in range(50)])
+    for i in range(50):
+        assert idx.search(f"oken{i}x") is not None
+    assert len(idx._partial_cache) == 8
+    assert list(idx.search("reac", partial=True)) == list(range(50))
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.scrapers.models import Job
+from src.skills.matcher import default_matcher
+from src.storage.base import job_key
+from src.storage.parquet import ParquetJobStorage
+from src.storage.sqlite import SQLiteJobStorage
+
+
+def job(n, desc, source="LinkedIn", posted_at=""):
+    return Job(
+        title=f"Dev {n}", company="Acme", location="Remoto", desc=desc,
+        source=source, url=f"https://example.com/{n}", posted_at=posted_at,
+    )
+
+
+BATCHES = [
+    [job(1, "Python e React", posted_at="2026-01-05"), job(2, "Java", "indeed", "2026-01-06")],
+    [job(1, "Python, Python e Docker", posted_at="2026-01-05"), job(3, "React", "Indeed", "2026-01-14")],
+]
+
+
+@pytest.fixture
+def stores(tmp_path):
+    return ParquetJobStorage(str(tmp_path / "jobs.parquet")), SQLiteJobStorage(str(tmp_path / "jobs.db"))
+
+
+def test_upsert_counts_and_delete(stores):
+    parquet, _ = stores
+    first = parquet.upsert(BATCHES[0])
+    second = parquet.upsert(BATCHES[1])
+    assert (first.inserted, first.updated) == (2, 0)
+    assert (second.inserted, second.updated) == (1, 1)
+
+    removed = parquet.delete([job_key(BATCHES[0][1]), "inexistente"])
+    assert removed.removed == 1
+    assert parquet.delete([job_key(BATCHES[0][1])]).removed == 0
+    assert sorted(parquet.load_frame()["url"]) == ["https://example.com/1", "https://example.com/3"]
+
+    # Reinserir após a remoção conta como nova, também numa instância que não viu as escritas
+    assert ParquetJobStorage(parquet.path).upsert([BATCHES[0][1]]).inserted == 1
+    assert parquet.upsert([BATCHES[0][1]]).updated == 1
+
+
+def test_compact_keeps_live_rows(stores):
+    parquet, _ = stores
+    for batch in BATCHES:
+        parquet.upsert(batch)
+    parquet.delete([job_key(BATCHES[1][1])])
+    before = parquet.load_frame().sort_values("url").reset_index(drop=True)
+    parquet.compact()
+    assert len(parquet.revision()) == 1
+    assert parquet.load_frame().sort_values("url").reset_index(drop=True).equals(before)
+    assert parquet.upsert([BATCHES[1][1]]).inserted == 1
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month"])
+def test_skill_trend_matches_sqlite(stores, granularity):
+    for storage in stores:
+        for batch in BATCHES:
+            storage.upsert(batch)
+        storage.delete([job_key(BATCHES[0][1])])
+    matcher = default_matcher()
+    for skill in ("python", "react", "java"):
+        (sid,) = matcher.resolve(skill)
+        for source in (None, "indeed", "LINKEDIN"):
+            parquet, sqlite = (s.skill_trend(sid, granularity, source) for s in stores)
+            assert parquet == sqlite
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from src.scrapers.models import Job
+from src.skills.matcher import default_matcher
+from src.storage.sqlite import SQLiteJobStorage
+
+WORDS = ["Python", "React", "Java", "Docker", "AWS", "Kubernetes", "comunicação", "SQL", "vaga", "remoto"]
+SOURCES = ["LinkedIn", "linkedin", "Indeed", "remotive"]
+
+
+def random_job(rng: random.Random, n: int) -> Job:
+    return Job(
+        title=f"Dev {n}", company="Acme", location="Remoto",
+        desc=" ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+        source=rng.choice(SOURCES), url=f"https://example.com/{n}",
+        collected_at=f"2026-03-{rng.randint(1, 28):02d}T12:00:00+00:00",
+        posted_at=rng.choice(["", f"2026-{rng.randint(1, 2):02d}-{rng.randint(1, 28):02d}"]),
+    )
+
+
+def tables(storage: SQLiteJobStorage):
+    conn = storage._connect()
+    return (
+        conn.execute("SELECT * FROM skill_daily ORDER BY skill_id, day, source").fetchall(),
+        conn.execute("SELECT * FROM job_daily ORDER BY day, source").fetchall(),
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rollups_match_rebuild(tmp_path, seed):
+    rng = random.Random(seed)
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    for _ in range(20):
+        storage.upsert([random_job(rng, rng.randrange(40)) for _ in range(rng.randint(1, 10))])
+        if rng.random() < 0.3:
+            storage.delete([f"https://example.com/{rng.randrange(40)}" for _ in range(3)])
+        incremental = tables(storage)
+        storage.rebuild_rollups()
+        assert tables(storage) == incremental
+    # Fontes com grafias diferentes caem na mesma linha
+    assert {source for _, source, _ in incremental[1]} <= {"linkedin", "indeed", "remotive"}
+
+
+def test_trend_counts_and_zero_periods(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    storage.upsert([
+        Job("a", "", "", "Python e Python", "LinkedIn", "u1", posted_at="2026-01-05"),
+        Job("b", "", "", "Java", "indeed", "u2", posted_at="2026-01-07"),
+        Job("c", "", "", "Python", "Indeed", "u3", posted_at="2026-01-20"),
+    ])
+    (sid,) = default_matcher().resolve("python")
+    points = storage.skill_trend(sid, "week")
+    assert [(p.start, p.mentions, p.jobs, p.total_jobs) for p in points] == [
+        ("2026-01-05", 2, 1, 2),
+        ("2026-01-19", 1, 1, 1),
+    ]
+    assert [p.jobs for p in storage.skill_trend(sid, "week", source="INDEED")] == [0, 1]
+    # `since` é alinhado ao início da semana
+    assert [p.start for p in storage.skill_trend(sid, "week", since="2026-01-21")] == ["2026-01-19"]
+    with pytest.raises(ValueError):
+        storage.skill_trend(sid, "year")
+
+
+def test_trends_endpoint(client):
+    import api
+
+    api.STORE.upsert([
+        Job("a", "", "", "React e Kubernetes", "LinkedIn", "u1", posted_at="2026-02-03"),
+        Job("b", "", "", "React", "remotive", "u2", posted_at="2026-02-20"),
+        Job("c", "", "", "Vue", "remotive", "u3", posted_at="2026-03-02"),
+    ])
+    body = client.get("/skills/trends", params={"skill": "k8s", "granularity": "month"}).json()
+    assert (body["skill"], body["category"]) == ("kubernetes", "cloud")
+    assert [(p["start"], p["jobs"], p["total_jobs"]) for p in body["points"]] == [
+        ("2026-02-01", 1, 2),
+        ("2026-03-01", 0, 1),
+    ]
+    body = client.get("/skills/trends", params={"skill": "react", "granularity": "day", "source": "LINKEDIN"}).json()
+    assert body["points"] == [{"start": "2026-02-03", "mentions": 1, "jobs": 1, "total_jobs": 1, "share": 1.0}]
+    assert client.get("/skills/trends", params={"skill": "cobol"}).status_code == 404
+    assert client.get("/skills/trends", params={"skill": "react", "granularity": "year"}).status_code == 422
@@ -0,0 +1,101 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from src.scheduler import CronSchedule, ScrapeQueue
+from src.scheduler.queue import DONE, FAILED, QUEUED, RUNNING
+
+
+@pytest.mark.parametrize("expr, when, expected", [
+    ("0 9 * * *", datetime(2026, 10, 19, 9, 0), True),
+    ("0 9 * * *", datetime(2026, 10, 19, 9, 1), False),
+    ("*/15 8-18 * * 1-5", datetime(2026, 10, 20, 18, 45), True),
+    ("*/15 8-18 * * 1-5", datetime(2026, 10, 18, 9, 0), False),  # domingo
+    ("0 0 * * 7", datetime(2026, 10, 18, 0, 0), True),  # 7 também é domingo
+    ("0 0 1,15 * *", datetime(2026, 10, 15, 0, 0), True),
+    ("0 0 1 1 *", datetime(2026, 2, 1, 0, 0), False),
+    # Dia do mês e da semana restritos: basta um casar
+    ("0 9 1 * 1", datetime(2026, 10, 19, 9, 0), True),  # segunda-feira
+    ("0 9 1 * 1", datetime(2026, 10, 1, 9, 0), True),  # dia 1 (quinta)
+    ("0 9 1 * 1", datetime(2026, 10, 20, 9, 0), False),
+    # Com um dos dois em `*` (mesmo com passo), os dois precisam casar
+    ("0 9 */2 * 1", datetime(2026, 10, 19, 9, 0), True),
+    ("0 9 */2 * 1", datetime(2026, 10, 26, 9, 0), False),
+    ("0 9 1 * *", datetime(2026, 10, 19, 9, 0), False),
+])
+def test_cron_matches(expr, when, expected):
+    assert CronSchedule.parse(expr).matches(when) is expected
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "60 * * * *", "0 24 * * *", "0 0 0 * *", "0 0 * 13 *", "5-1 * * * *", "*/0 * * * *", "a * * * *"])
+def test_cron_rejects_invalid(expr):
+    with pytest.raises(ValueError):
+        CronSchedule.parse(expr)
+
+
+def test_cron_parse_fields():
+    cron = CronSchedule.parse("0,30 9-11 * * 1-5/2")
+    assert cron.minutes == {0, 30}
+    assert cron.hours == {9, 10, 11}
+    assert cron.weekdays == {1, 3, 5}
+    assert (cron.any_day, cron.any_weekday) == (True, False)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return ScrapeQueue(str(tmp_path / "scheduler.db"))
+
+
+def test_claim_and_finish(queue):
+    job_id = queue.enqueue("python", "Brasil", 20, ["remotive", "indeed", "remotive"])
+    assert sorted(queue.pending_sources()) == ["indeed", "remotive"]
+    assert queue.status(job_id)["status"] == QUEUED
+
+    task = queue.claim("remotive")
+    assert (task.source, task.query, task.limit, task.attempts) == ("remotive", "python", 20, 1)
+    assert queue.claim("remotive") is None
+    assert queue.status(job_id)["sources"]["remotive"]["status"] == RUNNING
+
+    queue.finish(task.id, jobs_found=3, inserted=2, updated=1)
+    status = queue.status(job_id)
+    assert status["status"] == RUNNING and status["progress"] == {"done": 1, "total": 2}
+
+    queue.finish(queue.claim("indeed").id, error="bloqueado")
+    status = queue.status(job_id)
+    assert status["status"] == DONE
+    assert status["sources"]["indeed"] == {
+        "status": FAILED, "jobs_found": 0, "inserted": 0, "updated": 0, "error": "bloqueado", "attempts": 1,
+    }
+    assert status["finished_at"] is not None
+    assert queue.status("inexistente") is None
+
+
+def test_recover_requeues_stale_running_tasks(queue, monkeypatch):
+    job_id = queue.enqueue("python", "Brasil", 20, ["remotive", "indeed", "getonboard"])
+    mine = queue.claim("remotive")
+    dead = queue.claim("indeed")
+    alive = queue.claim("getonboard")
+    conn = queue._connect()
+    # Dono morto e dono vivo (outro processo); a do próprio processo também volta
+    conn.execute("UPDATE scrape_tasks SET owner = ? WHERE id = ?", (2 ** 22 + 12345, dead.id))
+    conn.execute("UPDATE scrape_tasks SET owner = ? WHERE id = ?", (os.getppid(), alive.id))
+
+    assert queue.recover() == 2
+    sources = queue.status(job_id)["sources"]
+    assert (sources["remotive"]["status"], sources["indeed"]["status"]) == (QUEUED, QUEUED)
+    assert sources["getonboard"]["status"] == RUNNING
+
+    # Reclamada de novo, a tentativa conta; no limite ela falha em vez de voltar
+    again = queue.claim("remotive")
+    assert again.id == mine.id and again.attempts == 2
+    assert queue.recover(max_attempts=2) == 0
+    assert queue.status(job_id)["sources"]["remotive"]["status"] == FAILED
+    assert queue.status(job_id)["sources"]["remotive"]["error"] == "interrompida"
+
+
+def test_mark_schedule_fires_once_per_slot(queue):
+    assert queue.mark_schedule("diario", 1000.0)
+    assert not queue.mark_schedule("diario", 1000.0)
+    assert queue.mark_schedule("outro", 1000.0)
+    assert queue.mark_schedule("diario", 1060.0)
@@ -0,0 +1,9 @@
+"""Subida preguiçosa da API e do CLI (mesma verificação de `python -m benchmarks.importtime`)."""
+import pytest
+from benchmarks.importtime import TARGETS, profile_import
+
+
+@pytest.mark.parametrize("module", TARGETS)
+def test_import_is_lazy(module):
+    prof = profile_import(module)
+    assert prof.problems() == []
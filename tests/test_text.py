@@ -0,0 +1,61 @@
+import copy
+import sqlite3
+
+import pytest
+
+from src.skills.analyzer import aggregate_descriptions
+from src.skills.text import content_hash, html_to_text
+from src.storage.sqlite import SQLiteJobStorage
+
+
+@pytest.mark.parametrize("raw, text", [
+    ("Java<b>Script</b> e Type<i>Script</i>", "JavaScript e TypeScript"),
+    ("<p>Python</p><p>Django</p>", "Python Django"),
+    ("SQL<br>Docker<br/>AWS", "SQL Docker AWS"),
+    ("<ul><li>Go</li><li>Rust</li></ul>", "Go Rust"),
+    ("<h2>Requisitos</h2>React<span> </span>Node", "Requisitos React Node"),
+    ("<div>Vue<script>track()</script> Nuxt</div>", "Vue Nuxt"),
+    ("Kot<!-- x -->lin &amp; Swift", "Kotlin & Swift"),
+    ("texto   sem\n html", "texto sem html"),
+])
+def test_html_to_text(raw, text):
+    assert html_to_text(raw) == text
+
+
+def test_inline_tags_keep_skills():
+    agg = aggregate_descriptions([html_to_text("Java<b>Script</b> e <em>Type</em>Script")])
+    found = {name for counts in agg.values() for name in counts}
+    assert {"javascript", "typescript"} <= found
+
+
+def test_old_text_is_recomputed_on_open(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    SQLiteJobStorage(path)
+    # Linha gravada pela versão anterior, que separava as tags inline com espaço
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            'INSERT INTO jobs(key, "desc", source, desc_text, desc_hash, collected_at) VALUES (?, ?, ?, ?, ?, ?)',
+            ("k", "Java<b>Script</b>", "indeed", "Java Script", content_hash("Java Script"), "2026-01-05"),
+        )
+        conn.execute("DELETE FROM meta WHERE name = 'text_version'")
+    conn.close()
+    storage = SQLiteJobStorage(path)
+    df = storage.load_frame()
+    assert df["desc_text"].tolist() == ["JavaScript"]
+    assert df["desc_hash"].tolist() == [content_hash("JavaScript")]
+
+
+def test_batch_and_job_normalize_alike():
+    from src.scrapers.models import Job, JobBatch
+    from src.skills.text import normalize_job
+
+    jobs = [
+        Job("a", "", "", "<p>Java<b>Script</b></p>", "x"),
+        Job("b", "", "", "", "x"),
+        Job("c", "", "", "<p>ignorado</p>", "x", desc_text="já limpo", desc_hash="h"),
+    ]
+    batch = JobBatch.from_jobs(jobs).normalize()
+    expected = [normalize_job(copy.copy(j)) for j in jobs]
+    assert [(j.desc_text, j.desc_hash) for j in batch] == [(j.desc_text, j.desc_hash) for j in expected]
+    assert batch[2].desc_text == "já limpo"